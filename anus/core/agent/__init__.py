@@ -6,11 +6,15 @@ This module contains various agent implementations:
 - ReactAgent: Agent with reasoning capabilities
 - ToolAgent: Agent with tool execution capabilities
 - HybridAgent: Agent that can switch between single and multi-agent modes
+- IntentRouter: Compiled router mapping tasks to tool actions
+- ComplexityScorer: Memoized scorer deciding between single and multi-agent modes
 """
 
 from anus.core.agent.base_agent import BaseAgent
 from anus.core.agent.react_agent import ReactAgent
 from anus.core.agent.tool_agent import ToolAgent
 from anus.core.agent.hybrid_agent import HybridAgent
+from anus.core.agent.intent_router import IntentRouter
+from anus.core.agent.complexity import ComplexityScorer
 
-__all__ = ["BaseAgent", "ReactAgent", "ToolAgent", "HybridAgent"] 
\ No newline at end of file
+__all__ = ["BaseAgent", "ReactAgent", "ToolAgent", "HybridAgent", "IntentRouter", "ComplexityScorer"] 
\ No newline at end of file
@@ -7,6 +7,8 @@ from typing import Dict, List, Any, Optional
 import uuid
 import time
 
+from anus.core.memory.history import HistoryBuffer
+
 class BaseAgent(ABC):
     """
     Abstract base class for all agents in the ANUS framework.
@@ -20,13 +22,14 @@ class BaseAgent(ABC):
         
         Args:
             name: Optional name for the agent. If not provided, a UUID will be generated.
-            **kwargs: Additional configuration options for the agent.
+            **kwargs: Additional configuration options for the agent. ``history_capacity``
+                bounds the number of logged actions kept in memory (default 1000).
         """
         self.id = str(uuid.uuid4())
         self.name = name or f"agent-{self.id[:8]}"
         self.created_at = time.time()
         self.state: Dict[str, Any] = {"status": "initialized"}
-        self.history: List[Dict[str, Any]] = []
+        self.history = HistoryBuffer(capacity=kwargs.get("history_capacity", 1000))
         self.config = kwargs
     
     @abstractmethod
@@ -0,0 +1,192 @@
+"""
+Complexity scoring module for deciding between single and multi-agent modes.
+
+Tells a quick poke from a deep dive before ANUS commits to either.
+"""
+
+from typing import Dict, List, Tuple, Iterable, FrozenSet
+from functools import lru_cache
+import re
+
+# Keyword weights. A keyword that belongs to several categories (e.g.
+# "evaluate" is both a calculation and an analysis) carries the sum.
+_KEYWORD_WEIGHTS: List[Tuple[Iterable[str], float]] = [
+    (["calculate", "compute", "evaluate"], 1.0),  # Basic calculations
+    (["search", "find", "look up"], 1.0),  # Search operations
+    (["count text", "process text", "analyze text", "transform text"], 1.0),  # Text operations
+    (["run code", "execute"], 1.5),  # Code execution
+    (["compare", "contrast", "evaluate"], 2.0),  # Analysis operations
+    (["optimize", "optimise", "improve", "enhance"], 2.5),  # Optimization tasks
+    (["and", "then", "after", "before"], 1.0),  # Task chaining
+    (["if", "when", "unless", "otherwise"], 1.5),  # Conditional operations
+    (["all", "every", "each"], 1.0),  # Comprehensive operations
+    (["most", "best", "optimal"], 1.5)  # Decision making
+]
+
+# Keywords hinting that a tool will be needed
+_TOOL_KEYWORDS: Dict[str, FrozenSet[str]] = {
+    "calculator": frozenset(["calculate", "compute", "evaluate", "math"]),
+    "search": frozenset(["search", "find", "look up", "query"]),
+    "text": frozenset(["text", "string", "characters", "words"]),
+    "code": frozenset(["code", "execute", "run", "python"])
+}
+
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+# Characters that are neither alphanumeric nor whitespace
+_SPECIAL_PATTERN = re.compile(r"[^\w\s]|_")
+
+# Inflectional suffixes stripped by _stem, longest first
+_SUFFIXES = (("ies", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("e", ""), ("s", ""))
+
+_VOWEL_PATTERN = re.compile(r"[aeiouy]")
+
+@lru_cache(maxsize=65536)
+def _stem(word: str) -> str:
+    """
+    Reduce a word to a crude stem, so inflected forms match their keyword.
+    
+    One inflectional suffix is stripped ("calculated", "calculates" and
+    "calculate" all become "calculat"), as long as three letters remain, and
+    a doubled final consonant is undone ("running" becomes "run"). "-ing"
+    and "-ed" are only stripped from a stem with a vowel, so "string" stays
+    whole, and "-ings" is a plural of "-ing" ("strings" stems like "string").
+    Keywords and task words are stemmed alike, so the stems only need to agree.
+    
+    Args:
+        word: A lowercase word.
+        
+    Returns:
+        The stem.
+    """
+    if word.endswith("ings"):
+        word = word[:-1]
+    
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                break
+            stem = word[:len(word) - len(suffix)] + replacement
+            if suffix in ("ing", "ed"):
+                if not _VOWEL_PATTERN.search(stem):
+                    break
+                if len(stem) > 3 and stem[-1] == stem[-2] and stem[-1] not in "lsz":
+                    stem = stem[:-1]
+            return stem
+    return word
+
+def _stem_phrase(phrase: str) -> str:
+    """
+    Stem every word of a keyword phrase.
+    
+    Args:
+        phrase: A lowercase keyword or two-word phrase.
+        
+    Returns:
+        The phrase with each word stemmed.
+    """
+    return " ".join(_stem(word) for word in phrase.split())
+
+class ComplexityScorer:
+    """
+    Scores how complex a task is on a scale from 0 to 10.
+    
+    The task is tokenized once into whole words, so keywords only count as
+    words in their own right ("and" doesn't match inside "command"). Words
+    are stemmed, so inflected forms still count ("comparing" matches
+    "compare"). Scores are memoized per task text, since the same tasks tend
+    to come back.
+    """
+    
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize a ComplexityScorer instance.
+        
+        Args:
+            cache_size: Maximum number of memoized task scores.
+        """
+        self.keyword_weights: Dict[str, float] = {}
+        for keywords, weight in _KEYWORD_WEIGHTS:
+            for keyword in keywords:
+                keyword = _stem_phrase(keyword)
+                self.keyword_weights[keyword] = self.keyword_weights.get(keyword, 0.0) + weight
+        
+        self.tool_keywords = {
+            tool: frozenset(_stem_phrase(keyword) for keyword in keywords)
+            for tool, keywords in _TOOL_KEYWORDS.items()
+        }
+        self._cached_score = lru_cache(maxsize=cache_size)(self._score)
+    
+    def score(self, task: str) -> float:
+        """
+        Score the complexity of a task, reusing the memoized score if there is one.
+        
+        Args:
+            task: The task description.
+            
+        Returns:
+            A complexity score between 0 and 10.
+        """
+        return self._cached_score(task)
+    
+    def score_many(self, tasks: Iterable[str]) -> List[float]:
+        """
+        Score the complexity of many tasks.
+        
+        Args:
+            tasks: The task descriptions.
+            
+        Returns:
+            The complexity scores, in task order.
+        """
+        score = self._cached_score
+        return [score(task) for task in tasks]
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get statistics about the score cache.
+        
+        Returns:
+            A dictionary containing cache statistics.
+        """
+        info = self._cached_score.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    
+    def _score(self, task: str) -> float:
+        """
+        Compute the complexity score of a task.
+        
+        Args:
+            task: The task description.
+            
+        Returns:
+            A complexity score between 0 and 10.
+        """
+        words = [_stem(word) for word in _WORD_PATTERN.findall(task.lower())]
+        
+        # Single words and two-word phrases such as "look up" or "run code"
+        terms = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+        
+        complexity = 0.0
+        keyword_weights = self.keyword_weights
+        for term in terms:
+            weight = keyword_weights.get(term)
+            if weight:
+                complexity += weight
+        
+        # Add complexity for length of task description
+        complexity += len(task.split()) * 0.1  # 0.1 points per word
+        
+        # Add complexity for special characters (potential complex expressions)
+        complexity += len(_SPECIAL_PATTERN.findall(task)) * 0.2
+        
+        # Add complexity for multiple tools needed
+        term_set = set(terms)
+        tools_needed = sum(1 for keywords in self.tool_keywords.values() if not keywords.isdisjoint(term_set))
+        complexity += tools_needed * 1.5
+        
+        # Cap the complexity at 10
+        return min(10.0, complexity)
+
+# Shared scorer, so the memoized scores are reused by every agent
+default_complexity_scorer = ComplexityScorer()
@@ -4,24 +4,48 @@ Hybrid Agent module that combines single and multi-agent capabilities.
 This agent can dynamically switch between single and multi-agent modes based on task complexity.
 """
 
+import asyncio
 import logging
 import re
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Iterator
 
 from anus.core.agent.tool_agent import ToolAgent
+from anus.core.agent.complexity import ComplexityScorer, default_complexity_scorer
+from anus.models.tokenizer import default_tokenizer
 
 class HybridAgent(ToolAgent):
     """
     A hybrid agent that can switch between single and multi-agent modes.
     
     This agent assesses task complexity and chooses the appropriate mode.
+    
+    In multi-agent mode the researcher, planner, executor and critic either run
+    one after another ("sequential" pipeline) or as asyncio tasks ("async"
+    pipeline), where stages without a data dependency overlap.
     """
     
+    # Maximum tokens of a previous stage's answer quoted in the next prompt
+    _REFERENCE_TOKENS = 128
+    
+    # Explicit separators of independent research sub-questions: semicolons
+    # and enumerated items ("1.", "2)", "(3)" or bullets). Words like "and"
+    # or "then" join nouns or order steps, so they never split a task.
+    _SUBQUESTION_PATTERN = re.compile(r'\s*;\s*')
+    _LIST_ITEM_PATTERN = re.compile(r'(?:^|\s)(?:\(\d+\)|\d+[.)])\s+|^\s*[-*\u2022]\s+', re.MULTILINE)
+    
+    # A part starting like this depends on the one before it
+    _DEPENDENT_PATTERN = re.compile(r'^(?:and\s+)?(?:then|after\s+that|afterwards|next)\b', re.IGNORECASE)
+    
+    # Scorer deciding between single and multi-agent mode, shared so its memoized scores are too
+    complexity_scorer: ComplexityScorer = default_complexity_scorer
+    
     def __init__(
         self,
         name: Optional[str] = None,
         max_iterations: int = 10,
         tools: Optional[List[str]] = None,
+        pipeline: str = "sequential",
+        max_research_fanout: int = 4,
         **kwargs
     ):
         """
@@ -31,10 +55,15 @@ class HybridAgent(ToolAgent):
             name: Optional name for the agent.
             max_iterations: Maximum number of thought-action cycles to perform.
             tools: Optional list of tool names to load.
+            pipeline: How multi-agent stages are run ("sequential" or "async").
+            max_research_fanout: Maximum number of concurrent researchers in the async pipeline.
             **kwargs: Additional configuration options for the agent.
         """
         super().__init__(name=name, max_iterations=max_iterations, tools=tools, **kwargs)
         self.mode = "auto"
+        self.tool_names = tools
+        self.pipeline = pipeline
+        self.max_research_fanout = max_research_fanout
         
         # Specialized agents for multi-agent mode
         self.specialized_agents = {
@@ -54,53 +83,19 @@ class HybridAgent(ToolAgent):
         Returns:
             A complexity score between 0 and 10.
         """
-        complexity = 0.0
-        
-        # Check for multiple operations
-        operations = [
-            (r'(calculate|compute|evaluate)', 1.0),  # Basic calculations
-            (r'(search|find|look up)', 1.0),  # Search operations
-            (r'(count|process|analyze|transform)\s+text', 1.0),  # Text operations
-            (r'run\s+code|execute', 1.5),  # Code execution
-            (r'compare|contrast|evaluate', 2.0),  # Analysis operations
-            (r'optimize|improve|enhance', 2.5),  # Optimization tasks
-            (r'and|then|after|before', 1.0),  # Task chaining
-            (r'if|when|unless|otherwise', 1.5),  # Conditional operations
-            (r'all|every|each', 1.0),  # Comprehensive operations
-            (r'most|best|optimal', 1.5)  # Decision making
-        ]
-        
-        # Add complexity for each operation found
-        for pattern, score in operations:
-            matches = re.findall(pattern, task.lower())
-            complexity += score * len(matches)
-        
-        # Add complexity for length of task description
-        words = task.split()
-        complexity += len(words) * 0.1  # 0.1 points per word
-        
-        # Add complexity for special characters (potential complex expressions)
-        special_chars = sum(1 for c in task if not c.isalnum() and not c.isspace())
-        complexity += special_chars * 0.2
-        
-        # Add complexity for multiple tools needed
-        tool_keywords = {
-            'calculator': ['calculate', 'compute', 'evaluate', 'math'],
-            'search': ['search', 'find', 'look up', 'query'],
-            'text': ['text', 'string', 'characters', 'words'],
-            'code': ['code', 'execute', 'run', 'python']
-        }
+        return self.complexity_scorer.score(task)
+    
+    def assess_many(self, tasks: List[str]) -> List[float]:
+        """
+        Assess the complexity of many tasks at once.
         
-        tools_needed = 0
-        task_lower = task.lower()
-        for tool_name, keywords in tool_keywords.items():
-            if any(kw in task_lower for kw in keywords):
-                tools_needed += 1
+        Args:
+            tasks: The task descriptions.
             
-        complexity += tools_needed * 1.5
-        
-        # Cap the complexity at 10
-        return min(10.0, complexity)
+        Returns:
+            The complexity scores between 0 and 10, in task order.
+        """
+        return self.complexity_scorer.score_many(tasks)
     
     def execute(self, task: str, **kwargs) -> Dict[str, Any]:
         """
@@ -113,17 +108,80 @@ class HybridAgent(ToolAgent):
         Returns:
             A dictionary containing the execution result and metadata.
         """
+        # Decide on mode based on complexity
+        if not self._use_multi_agent(task):
+            return super().execute(task, **kwargs)
+        else:
+            return self._execute_multi_agent(task, **kwargs)
+    
+    def execute_stream(self, task: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a task using the appropriate mode, yielding events as execution progresses.
+        
+        In multi-agent mode, the events of each specialized agent are passed
+        through with a "stage" key naming the agent's role, and the agent's own
+        result is reported as a "stage_result" event.
+        
+        Args:
+            task: The task description to execute.
+            **kwargs: Additional parameters for task execution.
+            
+        Returns:
+            An iterator of execution events, ending with the "result" event.
+        """
+        if not self._use_multi_agent(task):
+            yield from super().execute_stream(task, **kwargs)
+            return
+        
+        direct_result = self._try_direct_execution(task)
+        if direct_result is None and self.pipeline != "async":
+            yield from self._multi_agent_events(task, **kwargs)
+            return
+        
+        # Direct results and the async pipeline finish in one go
+        result = direct_result or self._execute_multi_agent(task, **kwargs)
+        yield self._event("token", content=result.get("answer", ""))
+        yield self._event("result", result=result)
+    
+    async def execute_async(self, task: str, **kwargs) -> Dict[str, Any]:
+        """
+        Execute a task from a running event loop, using the async multi-agent pipeline.
+        
+        Args:
+            task: The task description to execute.
+            **kwargs: Additional parameters for task execution.
+            
+        Returns:
+            A dictionary containing the execution result and metadata.
+        """
+        if not self._use_multi_agent(task):
+            return await asyncio.to_thread(super().execute, task, **kwargs)
+        
+        direct_result = self._try_direct_execution(task)
+        if direct_result is not None:
+            return direct_result
+        return await self._execute_multi_agent_async(task, **kwargs)
+    
+    def _use_multi_agent(self, task: str) -> bool:
+        """
+        Decide whether a task needs the multi-agent mode.
+        
+        Args:
+            task: The task description.
+            
+        Returns:
+            True if the task is complex enough for multiple agents.
+        """
         complexity = self._assess_complexity(task)
         
-        # Decide on mode based on complexity
         if complexity < 3.0:
             logging.info(f"Task complexity ({complexity:.1f}) below threshold (3.0). ANUS staying tight in single-agent mode.")
             logging.info("This task is so simple even a constipated ANUS could handle it.")
-            return super().execute(task, **kwargs)
-        else:
-            logging.info(f"Task complexity ({complexity:.1f}) above threshold (3.0). ANUS expanding to multi-agent mode.")
-            logging.info("ANUS is expanding to accommodate multiple agents for this complex task.")
-            return self._execute_multi_agent(task, **kwargs)
+            return False
+        
+        logging.info(f"Task complexity ({complexity:.1f}) above threshold (3.0). ANUS expanding to multi-agent mode.")
+        logging.info("ANUS is expanding to accommodate multiple agents for this complex task.")
+        return True
     
     def _execute_multi_agent(self, task: str, **kwargs) -> Dict[str, Any]:
         """
@@ -140,50 +198,271 @@ class HybridAgent(ToolAgent):
         logging.info("Task decomposed into subtasks for optimal ANUS performance")
         
         # For simple calculator tasks, use direct execution
-        if task.lower().startswith("calculate"):
-            # Use the ToolAgent's _decide_action method to determine the action
-            action_name, action_input = self._decide_action({"task": task})
-            
-            # If it's a calculator action, execute it directly
-            if action_name == "calculator" and "expression" in action_input:
-                result = self._execute_action(action_name, action_input)
-                if result.get("status") == "success" and "result" in result:
-                    return {
-                        "task": task,
-                        "answer": f"The result of {action_input['expression']} is {result['result']}",
-                        "direct_result": result,
-                        "mode": "direct"
-                    }
+        direct_result = self._try_direct_execution(task)
+        if direct_result is not None:
+            return direct_result
+        
+        if self.pipeline == "async":
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self._execute_multi_agent_async(task, **kwargs))
+            logging.warning("ANUS can't nest event loops; use execute_async() from async code. Running stages sequentially.")
         
+        return self._collect_result(self._multi_agent_events(task, **kwargs))
+    
+    def _multi_agent_events(self, task: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Run the sequential multi-agent pipeline as a generator of execution events.
+        
+        Args:
+            task: The task description to execute.
+            **kwargs: Additional parameters for task execution.
+            
+        Returns:
+            An iterator of execution events, ending with the "result" event.
+        """
         # For complex tasks, use multi-agent approach
         results = {}
         final_result = None
         
         # Researcher analyzes the task and gathers information
-        researcher_result = self.specialized_agents["researcher"].execute(
+        researcher_result = yield from self._stage_events(
+            "researcher",
             f"Analyze and gather information for: {task}"
         )
         results["researcher"] = researcher_result
         
         # Planner creates a strategy based on research
-        planner_result = self.specialized_agents["planner"].execute(
-            f"Plan execution strategy for: {task}\nBased on research: {researcher_result}"
+        planner_result = yield from self._stage_events(
+            "planner",
+            f"Plan execution strategy for: {task}\nBased on research: {self._reference('researcher', researcher_result)}"
         )
         results["planner"] = planner_result
         
         # Executor carries out the plan
-        executor_result = self.specialized_agents["executor"].execute(
-            f"Execute plan for: {task}\nFollowing strategy: {planner_result}"
+        executor_result = yield from self._stage_events(
+            "executor",
+            f"Execute plan for: {task}\nFollowing strategy: {self._reference('planner', planner_result)}"
         )
         results["executor"] = executor_result
         final_result = executor_result  # Use executor's result as the primary result
         
         # Critic evaluates the results
-        critic_result = self.specialized_agents["critic"].execute(
-            f"Evaluate results for: {task}\nAnalyzing output: {executor_result}"
+        critic_result = yield from self._stage_events(
+            "critic",
+            f"Evaluate results for: {task}\nAnalyzing output: {self._reference('executor', executor_result)}"
         )
         results["critic"] = critic_result
         
+        result = self._aggregate_results(task, results, final_result)
+        yield self._event("token", content=result["answer"])
+        yield self._event("result", result=result)
+    
+    def _stage_events(self, stage: str, prompt: str) -> Iterator[Dict[str, Any]]:
+        """
+        Run one specialized agent, passing its events through tagged with its stage.
+        
+        Args:
+            stage: The name of the specialized agent.
+            prompt: The task for the agent.
+            
+        Returns:
+            An iterator of the agent's events. The generator's return value is
+            the agent's result.
+        """
+        result: Dict[str, Any] = {}
+        
+        for event in self.specialized_agents[stage].execute_stream(prompt):
+            if event["type"] == "result":
+                result = event["result"]
+                event = {**event, "type": "stage_result"}
+            yield {**event, "stage": stage}
+        
+        return result
+    
+    async def _execute_multi_agent_async(self, task: str, **kwargs) -> Dict[str, Any]:
+        """
+        Execute a task using multiple specialized agents as concurrent asyncio tasks.
+        
+        Independent sub-questions are researched concurrently, each by its own
+        researcher instance. The critic reviews the plan while the executor
+        carries it out, instead of waiting for the execution to finish.
+        
+        Args:
+            task: The task description to execute.
+            **kwargs: Additional parameters for task execution.
+            
+        Returns:
+            A dictionary containing the aggregated results.
+        """
+        results = {}
+        
+        # Researchers fan out across independent sub-questions
+        subquestions = self._split_subquestions(task)
+        if len(subquestions) > 1:
+            logging.info(f"ANUS is researching {len(subquestions)} sub-questions at once")
+            researchers = [
+                ToolAgent(name=f"researcher-{i + 1}", tools=self.tool_names)
+                for i in range(len(subquestions))
+            ]
+            research = await asyncio.gather(*[
+                asyncio.to_thread(researcher.execute, f"Analyze and gather information for: {subquestion}")
+                for researcher, subquestion in zip(researchers, subquestions)
+            ])
+            researcher_result = {
+                "task": f"Analyze and gather information for: {task}",
+                "answer": "\n".join(r.get("answer", "") for r in research),
+                "sub_results": list(research)
+            }
+        else:
+            researcher_result = await asyncio.to_thread(
+                self.specialized_agents["researcher"].execute,
+                f"Analyze and gather information for: {task}"
+            )
+        results["researcher"] = researcher_result
+        
+        # Planner needs the research
+        planner_result = await asyncio.to_thread(
+            self.specialized_agents["planner"].execute,
+            f"Plan execution strategy for: {task}\nBased on research: {self._reference('researcher', researcher_result)}"
+        )
+        results["planner"] = planner_result
+        
+        # Executor and critic both only need the plan
+        plan_reference = self._reference("planner", planner_result)
+        executor_result, critic_result = await asyncio.gather(
+            asyncio.to_thread(
+                self.specialized_agents["executor"].execute,
+                f"Execute plan for: {task}\nFollowing strategy: {plan_reference}"
+            ),
+            asyncio.to_thread(
+                self.specialized_agents["critic"].execute,
+                f"Evaluate plan for: {task}\nAnalyzing strategy: {plan_reference}"
+            )
+        )
+        results["executor"] = executor_result
+        results["critic"] = critic_result
+        
+        return self._aggregate_results(task, results, executor_result)
+    
+    def _try_direct_execution(self, task: str) -> Optional[Dict[str, Any]]:
+        """
+        Execute simple calculator tasks directly, skipping the multi-agent pipeline.
+        
+        Args:
+            task: The task description to execute.
+            
+        Returns:
+            The direct result, or None if the task needs the full pipeline.
+        """
+        if not task.lower().startswith("calculate"):
+            return None
+        
+        # Use the ToolAgent's _decide_action method to determine the action
+        action_name, action_input = self._decide_action({"task": task})
+        
+        # If it's a calculator action, execute it directly
+        if action_name == "calculator" and "expression" in action_input:
+            result = self._execute_action(action_name, action_input)
+            if result.get("status") == "success" and "result" in result:
+                return {
+                    "task": task,
+                    "answer": f"The result of {action_input['expression']} is {result['result']}",
+                    "direct_result": result,
+                    "mode": "direct"
+                }
+        
+        return None
+    
+    def _split_subquestions(self, task: str) -> List[str]:
+        """
+        Split a task into independent sub-questions for parallel research.
+        
+        Only explicit separators split a task: semicolons and enumerated
+        items. Text before an enumeration (e.g. "Find the population of:") is
+        kept with each item. A part starting with "then" or the like depends
+        on what came before it, so it stays together with all earlier parts.
+        
+        Args:
+            task: The task description.
+            
+        Returns:
+            The sub-questions, or the whole task if it can't be split.
+        """
+        items = self._LIST_ITEM_PATTERN.split(task)
+        preamble = items[0].strip()
+        items = [item.strip() for item in items[1:] if item.strip()]
+        if len(items) >= 2:
+            # Split on semicolons within each item too
+            candidates = [
+                f"{preamble} {part}" if preamble else part
+                for item in items for part in self._split_on_separators(item)
+            ]
+        else:
+            candidates = self._split_on_separators(task)
+        
+        parts = []
+        for part in candidates:
+            if parts and self._DEPENDENT_PATTERN.match(part):
+                parts = ["; ".join(parts + [part])]
+            else:
+                parts.append(part)
+        
+        if len(parts) < 2:
+            return [task]
+        
+        # Merge the tail so no more than max_research_fanout researchers run
+        if len(parts) > self.max_research_fanout:
+            keep = max(1, self.max_research_fanout - 1)
+            parts = parts[:keep] + ["; ".join(parts[keep:])]
+        return parts
+    
+    def _split_on_separators(self, text: str) -> List[str]:
+        """
+        Split text at semicolons.
+        
+        Args:
+            text: The text to split.
+            
+        Returns:
+            The non-empty parts.
+        """
+        return [part.strip() for part in self._SUBQUESTION_PATTERN.split(text) if part.strip()]
+    
+    def _reference(self, stage: str, result: Dict[str, Any]) -> str:
+        """
+        Build a compact reference to a previous stage's result for use in a prompt.
+        
+        The full result stays in ``agent_results``; the prompt only carries the
+        stage name and a bounded excerpt of its answer, so prompts don't grow
+        with every hop.
+        
+        Args:
+            stage: The name of the stage that produced the result.
+            result: The result of that stage.
+            
+        Returns:
+            The reference string.
+        """
+        answer = str(result.get("answer", ""))
+        excerpt = default_tokenizer.truncate(answer, self._REFERENCE_TOKENS)
+        if len(excerpt) < len(answer):
+            excerpt = excerpt.rstrip() + "..."
+        return f"[{stage}] {excerpt}"
+    
+    def _aggregate_results(self, task: str, results: Dict[str, Any], final_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Combine the specialized agents' results into the multi-agent result.
+        
+        Args:
+            task: The task description.
+            results: The results of each stage, by stage name.
+            final_result: The result used as the primary answer.
+            
+        Returns:
+            A dictionary containing the aggregated results.
+        """
         logging.info("All agents have finished their tasks. ANUS is aggregating results...")
         logging.info("ANUS has successfully completed multi-agent processing")
         
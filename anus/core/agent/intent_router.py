@@ -0,0 +1,179 @@
+"""
+Intent Router module that maps task text to tool actions.
+
+Patterns are compiled once, and a single scan for trigger keywords decides
+which of them are worth trying, so routing cost doesn't grow with every
+tool that gets registered.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterable
+import re
+import threading
+
+class Intent:
+    """
+    A pattern that turns matching task text into a tool action.
+    """
+    
+    def __init__(
+        self,
+        tool: str,
+        pattern: str,
+        build_input: Callable[["re.Match"], Dict[str, Any]],
+        triggers: Iterable[str],
+        priority: int = 100,
+        flags: int = re.IGNORECASE
+    ):
+        """
+        Initialize an Intent instance.
+        
+        Args:
+            tool: The name of the tool the intent routes to.
+            pattern: The regular expression matched against the task.
+            build_input: Function building the tool input from the match.
+            triggers: Literal keywords, one of which occurs in every task the
+                pattern can match.
+            priority: Intents with a lower priority are tried first.
+            flags: Regular expression flags for the pattern.
+        """
+        self.tool = tool
+        self.pattern = re.compile(pattern, flags)
+        self.build_input = build_input
+        self.triggers = tuple(trigger.lower() for trigger in triggers)
+        self.priority = priority
+
+class IntentRouter:
+    """
+    Routes a task to the first matching intent whose tool is available.
+    
+    Every intent declares the trigger keywords its pattern needs. A single
+    compiled alternation of all triggers finds the ones present in the task in
+    one pass, and only the intents behind those triggers are matched, in
+    priority order. Intents can be registered at any time, e.g. by tools as
+    they are loaded. Agents route with their own copy of a router, so the
+    intents of their tools don't affect other agents.
+    """
+    
+    def __init__(self):
+        """
+        Initialize an IntentRouter instance.
+        """
+        self._intents: List[Intent] = []
+        self._lock = threading.Lock()
+        
+        # (trigger regex, intents, trigger -> intent indexes), replaced as a whole
+        # so concurrent routing always sees a consistent snapshot
+        self._compiled: Tuple[Optional["re.Pattern"], List[Intent], Dict[str, List[int]]] = (None, [], {})
+    
+    def register(
+        self,
+        tool: str,
+        pattern: str,
+        build_input: Callable[["re.Match"], Dict[str, Any]],
+        triggers: Iterable[str],
+        priority: int = 100,
+        flags: int = re.IGNORECASE
+    ) -> None:
+        """
+        Register an intent. Registering the same tool and pattern again
+        replaces the earlier intent.
+        
+        Args:
+            tool: The name of the tool the intent routes to.
+            pattern: The regular expression matched against the task.
+            build_input: Function building the tool input from the match.
+            triggers: Literal keywords, one of which occurs in every task the
+                pattern can match.
+            priority: Intents with a lower priority are tried first.
+            flags: Regular expression flags for the pattern.
+        """
+        with self._lock:
+            intents = [intent for intent in self._intents if (intent.tool, intent.pattern.pattern) != (tool, pattern)]
+            
+            # Stable sort keeps registration order within a priority
+            self._intents = sorted(
+                intents + [Intent(tool, pattern, build_input, triggers, priority, flags)],
+                key=lambda intent: intent.priority
+            )
+            self._compile()
+    
+    def copy(self) -> "IntentRouter":
+        """
+        Create a router with the same intents, which can be extended separately.
+        
+        Returns:
+            A new IntentRouter instance.
+        """
+        router = IntentRouter()
+        with self._lock:
+            # Intents and the compiled snapshot are never modified in place
+            router._intents = self._intents
+            router._compiled = self._compiled
+        return router
+    
+    def register_tool(self, tool_name: str, tool: Any) -> None:
+        """
+        Register the intents a tool declares in its ``intent_patterns`` attribute.
+        
+        Each entry is a dictionary with "pattern", "triggers" and "input" (a
+        function building the tool input from the match), and optionally
+        "priority" and "flags".
+        
+        Args:
+            tool_name: The name the tool is loaded under.
+            tool: The tool instance or class.
+        """
+        for spec in getattr(tool, "intent_patterns", None) or []:
+            self.register(
+                tool_name,
+                spec["pattern"],
+                spec["input"],
+                spec["triggers"],
+                spec.get("priority", 100),
+                spec.get("flags", re.IGNORECASE)
+            )
+    
+    def route(self, task: str, available_tools: Iterable[str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Find the action for a task.
+        
+        Args:
+            task: The task description.
+            available_tools: Names of the tools that can be used.
+            
+        Returns:
+            A tuple of (tool_name, tool_input), or None if no intent matches.
+        """
+        trigger_regex, intents, intents_by_trigger = self._compiled
+        if trigger_regex is None:
+            return None
+        
+        candidates = set()
+        for trigger in trigger_regex.findall(task.lower()):
+            candidates.update(intents_by_trigger[trigger])
+        
+        for index in sorted(candidates):
+            intent = intents[index]
+            if intent.tool not in available_tools:
+                continue
+            
+            match = intent.pattern.search(task)
+            if match:
+                return intent.tool, intent.build_input(match)
+        
+        return None
+    
+    def _compile(self) -> None:
+        """
+        Rebuild the trigger alternation and the trigger-to-intent map.
+        """
+        intents_by_trigger: Dict[str, List[int]] = {}
+        for index, intent in enumerate(self._intents):
+            for trigger in intent.triggers:
+                intents_by_trigger.setdefault(trigger, []).append(index)
+        
+        # A lookahead finds every trigger occurrence, even overlapping ones
+        alternation = "|".join(re.escape(trigger) for trigger in sorted(intents_by_trigger, key=len, reverse=True))
+        
+        trigger_regex = re.compile(f"(?=({alternation}))") if alternation else None
+        self._compiled = (trigger_regex, self._intents, intents_by_trigger)
@@ -2,7 +2,7 @@
 React Agent module that extends the base agent with reasoning capabilities.
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator
 import json
 import logging
 
@@ -13,6 +13,9 @@ class ReactAgent(BaseAgent):
     A reasoning agent that follows the React paradigm (Reasoning and Acting).
     
     This agent implements a thought-action-observation loop for complex reasoning.
+    
+    The loop can also be consumed incrementally through execute_stream(), which
+    yields an event as soon as each thought, action and observation is ready.
     """
     
     def __init__(self, name: Optional[str] = None, max_iterations: int = 10, **kwargs):
@@ -39,6 +42,37 @@ class ReactAgent(BaseAgent):
         Returns:
             A dictionary containing the execution result and metadata.
         """
+        return self._collect_result(self._react_events(task, **kwargs))
+    
+    def execute_stream(self, task: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a task, yielding events as execution progresses.
+        
+        Events are dictionaries with a "type" of "thought", "action",
+        "observation", "token" (a chunk of the final answer) or "result". The
+        last event is always the "result" event, carrying the same dictionary
+        execute() returns.
+        
+        Args:
+            task: The task description to execute.
+            **kwargs: Additional parameters for task execution.
+            
+        Returns:
+            An iterator of execution events.
+        """
+        return self._react_events(task, **kwargs)
+    
+    def _react_events(self, task: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Run the React loop as a generator of execution events.
+        
+        Args:
+            task: The task description to execute.
+            **kwargs: Additional parameters for task execution.
+            
+        Returns:
+            An iterator of execution events, ending with the "result" event.
+        """
         self.update_state(status="executing", task=task)
         self.current_iteration = 0
         
@@ -55,15 +89,18 @@ class ReactAgent(BaseAgent):
             # Generate thought
             thought = self._generate_thought(context)
             context["thoughts"].append(thought)
+            yield self._event("thought", content=thought)
             
             # Decide on action
             action_name, action_input = self._decide_action(context)
             action = {"name": action_name, "input": action_input}
             context["actions"].append(action)
+            yield self._event("action", name=action_name, input=action_input)
             
             # Execute action and get observation
             observation = self._execute_action(action_name, action_input)
             context["observations"].append(observation)
+            yield self._event("observation", content=observation)
             
             # Log the iteration
             self.log_action("iteration", {
@@ -79,8 +116,12 @@ class ReactAgent(BaseAgent):
                 
             self.current_iteration += 1
         
-        # Generate final answer
-        final_answer = self._generate_final_answer(context)
+        # Generate final answer, streaming it as it is produced
+        chunks = []
+        for chunk in self._stream_final_answer(context):
+            chunks.append(chunk)
+            yield self._event("token", content=chunk)
+        final_answer = "".join(chunks)
         
         result = {
             "task": task,
@@ -90,8 +131,53 @@ class ReactAgent(BaseAgent):
         }
         
         self.update_state(status="completed")
+        yield self._event("result", result=result)
+    
+    def _event(self, event_type: str, **data) -> Dict[str, Any]:
+        """
+        Build an execution event.
+        
+        Args:
+            event_type: The event type.
+            **data: The event payload.
+            
+        Returns:
+            The event dictionary.
+        """
+        return {"type": event_type, "agent": self.name, "iteration": self.current_iteration, **data}
+    
+    def _collect_result(self, events: Iterator[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run an event stream to the end and return its result.
+        
+        Args:
+            events: An iterator of execution events.
+            
+        Returns:
+            The payload of the "result" event.
+        """
+        result: Dict[str, Any] = {}
+        for event in events:
+            if event["type"] == "result":
+                result = event["result"]
         return result
     
+    def _stream_final_answer(self, context: Dict[str, Any]) -> Iterator[str]:
+        """
+        Generate the final answer in chunks.
+        
+        The default yields the whole answer from _generate_final_answer() at
+        once; agents that generate the answer with a model can override this
+        to yield its tokens as they arrive.
+        
+        Args:
+            context: The current execution context.
+            
+        Returns:
+            An iterator of answer chunks.
+        """
+        yield self._generate_final_answer(context)
+    
     def _generate_thought(self, context: Dict[str, Any]) -> str:
         """
         Generate a thought based on the current context.
@@ -8,14 +8,70 @@ import logging
 import re
 
 from anus.core.agent.react_agent import ReactAgent
+from anus.core.agent.intent_router import IntentRouter
+
+# Router with the built-in intents, copied by every agent before its tools add their own
+default_intent_router = IntentRouter()
+
+# Calculator tasks
+default_intent_router.register(
+    "calculator", r'calculate\s+(.+)$',
+    lambda m: {"expression": m.group(1).strip()},
+    triggers=["calculate"], priority=10
+)
+
+# Search tasks
+for _pattern in [
+    r'search(?:\s+for)?\s+(.+)',
+    r'find(?:\s+information(?:\s+about)?)?\s+(.+)',
+    r'look\s+up\s+(.+)'
+]:
+    default_intent_router.register(
+        "search", _pattern,
+        lambda m: {"query": m.group(1)},
+        triggers=["search", "find", "look"], priority=20
+    )
+
+# Text processing tasks
+for _pattern, _operation, _trigger in [
+    (r'count\s+characters\s+in\s+[\'"](.+)[\'"]', "count", "count"),
+    (r'count\s+words\s+in\s+[\'"](.+)[\'"]', "wordcount", "count"),
+    (r'reverse\s+[\'"](.+)[\'"]', "reverse", "reverse"),
+    (r'uppercase\s+[\'"](.+)[\'"]', "uppercase", "uppercase"),
+    (r'lowercase\s+[\'"](.+)[\'"]', "lowercase", "lowercase"),
+    (r'capitalize\s+[\'"](.+)[\'"]', "capitalize", "capitalize")
+]:
+    default_intent_router.register(
+        "text", _pattern,
+        lambda m, operation=_operation: {"text": m.group(1), "operation": operation},
+        triggers=[_trigger], priority=30
+    )
+
+# Code execution tasks
+for _pattern, _trigger in [
+    (r'run\s+code\s+```(?:python)?\s*(.+?)```', "run"),
+    (r'execute\s+```(?:python)?\s*(.+?)```', "execute"),
+    (r'evaluate\s+```(?:python)?\s*(.+?)```', "evaluate")
+]:
+    default_intent_router.register(
+        "code", _pattern,
+        lambda m: {"code": m.group(1).strip()},
+        triggers=[_trigger], priority=40, flags=re.IGNORECASE | re.DOTALL
+    )
 
 class ToolAgent(ReactAgent):
     """
     An agent that can use tools to interact with its environment.
     
     Extends the ReactAgent with the ability to discover, load, and execute tools.
+    
+    Tasks are mapped to tool actions by an IntentRouter. Tools can contribute
+    their own intents through an ``intent_patterns`` class attribute; they
+    are registered with the agent's own copy of the router.
     """
     
+    intent_router = default_intent_router
+    
     def __init__(
         self, 
         name: Optional[str] = None, 
@@ -34,6 +90,7 @@ class ToolAgent(ReactAgent):
         """
         super().__init__(name=name, max_iterations=max_iterations, **kwargs)
         self.tools: Dict[str, Any] = {}
+        self.intent_router = self.intent_router.copy()
         
         # Load specified tools or default tools
         if tools:
@@ -62,12 +119,13 @@ class ToolAgent(ReactAgent):
             # Instantiate the tool
             tool_instance = tool_class()
             
-            # Register the tool
+            # Register the tool and any intents it declares
             self.tools[tool_name] = tool_instance
+            self.intent_router.register_tool(tool_name, tool_instance)
             
             self.log_action("load_tool", {"tool_name": tool_name, "status": "success"})
             return True
-            
+        
         except (ImportError, AttributeError, Exception) as e:
             self.log_action("load_tool", {"tool_name": tool_name, "status": "error", "error": str(e)})
             logging.error(f"Failed to load tool {tool_name}: {e}")
@@ -85,57 +143,12 @@ class ToolAgent(ReactAgent):
         """
         task = context['task'].lower()
         
-        # Check for calculator tasks
-        calc_pattern = r'calculate\s+(.+)$'
-        calc_match = re.search(calc_pattern, task, re.IGNORECASE)
+        action = self.intent_router.route(task, self.tools)
+        if action is not None:
+            if action[0] == "calculator":
+                logging.info(f"Matched calculator expression: '{action[1].get('expression')}'")
+            return action
         
-        if calc_match and 'calculator' in self.tools:
-            expression = calc_match.group(1).strip()
-            logging.info(f"Matched calculator expression: '{expression}'")
-            return "calculator", {"expression": expression}
-            
-        # Check for search tasks
-        search_patterns = [
-            r'search(?:\s+for)?\s+(.+)',
-            r'find(?:\s+information(?:\s+about)?)?\s+(.+)',
-            r'look\s+up\s+(.+)'
-        ]
-        
-        for pattern in search_patterns:
-            search_match = re.search(pattern, task, re.IGNORECASE)
-            if search_match and 'search' in self.tools:
-                query = search_match.group(1)
-                return "search", {"query": query}
-                
-        # Check for text processing tasks
-        text_patterns = {
-            r'count\s+characters\s+in\s+[\'"](.+)[\'"]': ("count", lambda m: m.group(1)),
-            r'count\s+words\s+in\s+[\'"](.+)[\'"]': ("wordcount", lambda m: m.group(1)),
-            r'reverse\s+[\'"](.+)[\'"]': ("reverse", lambda m: m.group(1)),
-            r'uppercase\s+[\'"](.+)[\'"]': ("uppercase", lambda m: m.group(1)),
-            r'lowercase\s+[\'"](.+)[\'"]': ("lowercase", lambda m: m.group(1)),
-            r'capitalize\s+[\'"](.+)[\'"]': ("capitalize", lambda m: m.group(1))
-        }
-        
-        for pattern, (operation, extractor) in text_patterns.items():
-            text_match = re.search(pattern, task, re.IGNORECASE)
-            if text_match and 'text' in self.tools:
-                text = extractor(text_match)
-                return "text", {"text": text, "operation": operation}
-                
-        # Check for code execution tasks
-        code_patterns = [
-            r'run\s+code\s+```(?:python)?\s*(.+?)```',
-            r'execute\s+```(?:python)?\s*(.+?)```',
-            r'evaluate\s+```(?:python)?\s*(.+?)```'
-        ]
-        
-        for pattern in code_patterns:
-            code_match = re.search(pattern, task, re.IGNORECASE | re.DOTALL)
-            if code_match and 'code' in self.tools:
-                code = code_match.group(1).strip()
-                return "code", {"code": code}
-                
         # Default to dummy action for other tasks
         return "dummy_action", {"query": f"Placeholder action for {task}"}
     
@@ -162,10 +175,10 @@ class ToolAgent(ReactAgent):
                 # If result is already a dict with status, return it directly
                 if isinstance(result, dict) and "status" in result:
                     return result
-                    
+                
                 # Otherwise, wrap it in a success response
                 return {"status": "success", "result": result}
-                
+            
             except Exception as e:
                 error_message = f"Error executing tool {action_name}: {str(e)}"
                 logging.error(error_message)
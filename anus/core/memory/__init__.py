@@ -5,10 +5,14 @@ This module contains various memory implementations:
 - BaseMemory: Abstract base class for all memory systems
 - ShortTermMemory: Volatile in-memory storage with LRU eviction
 - LongTermMemory: Persistent storage backed by a file system
+- VectorIndex: Persistent cosine-similarity index for semantic recall
+- HistoryBuffer: Bounded record history with an optional JSONL spill file
 """
 
 from anus.core.memory.base_memory import BaseMemory
 from anus.core.memory.short_term import ShortTermMemory
 from anus.core.memory.long_term import LongTermMemory
+from anus.core.memory.vector_index import VectorIndex
+from anus.core.memory.history import HistoryBuffer
 
-__all__ = ["BaseMemory", "ShortTermMemory", "LongTermMemory"] 
\ No newline at end of file
+__all__ = ["BaseMemory", "ShortTermMemory", "LongTermMemory", "VectorIndex", "HistoryBuffer"] 
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+History buffer module for the ANUS framework.
+
+Keeps a fixed number of recent records in memory, so a long-running ANUS
+doesn't slowly fill up with its own past.
+"""
+
+from typing import Dict, List, Any, Optional, Iterator
+from collections import deque
+import json
+import os
+import logging
+import threading
+
+class HistoryBuffer:
+    """
+    Bounded, append-only record history.
+    
+    The newest ``capacity`` records are kept in a ring buffer; older ones are
+    dropped from memory. If a spill path is given, every record is also
+    appended to a JSONL file, so the full history survives eviction and
+    restarts and can be streamed back without loading it all at once.
+    """
+    
+    def __init__(self, capacity: int = 1000, spill_path: Optional[str] = None):
+        """
+        Initialize a HistoryBuffer instance.
+        
+        Args:
+            capacity: Maximum number of records to keep in memory.
+            spill_path: Optional JSONL file to append every record to.
+        """
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._records: "deque[Dict[str, Any]]" = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._spill_file = None
+        self.total_count = 0
+        
+        if spill_path:
+            spill_dir = os.path.dirname(os.path.abspath(spill_path))
+            os.makedirs(spill_dir, exist_ok=True)
+            self._spill_file = open(spill_path, "a", encoding="utf-8")
+    
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Add a record, evicting the oldest in-memory record if the buffer is full.
+        
+        Args:
+            record: The record to add.
+        """
+        with self._lock:
+            self._records.append(record)
+            self.total_count += 1
+            
+            if self._spill_file is not None:
+                try:
+                    # Results can hold arbitrary tool output, so fall back to str()
+                    self._spill_file.write(json.dumps(record, default=str) + "\n")
+                    self._spill_file.flush()
+                except Exception as e:
+                    logging.error(f"Error spilling history record to {self.spill_path}: {e}")
+    
+    def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the newest in-memory records.
+        
+        Args:
+            limit: Maximum number of records to return.
+            
+        Returns:
+            Up to ``limit`` records, oldest first.
+        """
+        if limit <= 0:
+            return []
+        
+        with self._lock:
+            start = max(0, len(self._records) - limit)
+            return [self._records[i] for i in range(start, len(self._records))]
+    
+    def iter_all(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the full history, oldest first.
+        
+        With a spill file this reads the file line by line, including records
+        already evicted from memory. Without one it yields a snapshot of the
+        in-memory records.
+        
+        Returns:
+            An iterator of records.
+        """
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            with self._lock:
+                snapshot = list(self._records)
+            yield from snapshot
+            return
+        
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # Record still being written
+                    break
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    logging.error(f"Skipping corrupt history record in {self.spill_path}: {e}")
+    
+    def clear(self) -> None:
+        """
+        Drop all in-memory records. The spill file is left untouched.
+        """
+        with self._lock:
+            self._records.clear()
+    
+    def close(self) -> None:
+        """
+        Close the spill file.
+        """
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            snapshot = list(self._records)
+        return iter(snapshot)
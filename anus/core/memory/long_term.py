@@ -8,21 +8,47 @@ import time
 import json
 import os
 import logging
+import threading
 from pathlib import Path
 
 from anus.core.memory.base_memory import BaseMemory
+from anus.core.memory.storage import BaseStorage, FileStorage, SegmentStorage, SqliteStorage
+from anus.core.memory.storage.base_storage import matches_query
+from anus.core.memory.vector_index import VectorIndex
+from anus.models.base.base_model import BaseModel
 
 class LongTermMemory(BaseMemory):
     """
     Persistent implementation of the BaseMemory interface.
     
-    Provides a file-based persistent memory store.
+    Provides a persistent memory store on top of a pluggable storage backend:
+    - "file": one JSON file per item (the default)
+    - "segment": append-only segment files with an offset index
+    - "sqlite": a SQLite database that evaluates queries itself
+    
+    When an embedding model is provided, items are also embedded into a
+    persistent vector index for semantic recall through ``search_similar``.
+    
+    One instance can be shared between threads, e.g. by the orchestrator's
+    worker agents.
     """
     
+    # Available storage backends by name
+    _BACKENDS = {
+        "file": FileStorage,
+        "segment": SegmentStorage,
+        "sqlite": SqliteStorage
+    }
+    
     def __init__(
         self, 
         storage_path: Optional[str] = None,
-        index_in_memory: bool = True,
+        index_in_memory: Optional[bool] = None,
+        backend: Union[str, BaseStorage] = "file",
+        backend_options: Optional[Dict[str, Any]] = None,
+        embedding_model: Optional[BaseModel] = None,
+        embedding_field: Optional[str] = None,
+        vector_index_options: Optional[Dict[str, Any]] = None,
         **kwargs
     ):
         """
@@ -31,6 +57,17 @@ class LongTermMemory(BaseMemory):
         Args:
             storage_path: Path to store memory files. If None, uses a default location.
             index_in_memory: Whether to keep an in-memory index for faster searches.
+                The index is loaded on the first search rather than at startup.
+                If None, it is kept unless the backend evaluates searches itself
+                (e.g. "sqlite"), so memory use stays bounded by the backend.
+            backend: Name of the storage backend ("file", "segment" or "sqlite"),
+                or a BaseStorage instance.
+            backend_options: Additional options passed to the storage backend.
+            embedding_model: Optional model used to embed items for semantic recall.
+            embedding_field: Item field holding the text to embed. If None, the
+                whole item (without metadata) is embedded as JSON.
+            vector_index_options: Additional options passed to the VectorIndex,
+                e.g. {"n_lists": 256} to enable IVF partitioning.
             **kwargs: Additional configuration options.
         """
         super().__init__(**kwargs)
@@ -41,17 +78,36 @@ class LongTermMemory(BaseMemory):
             storage_path = os.path.join(home_dir, ".anus", "memory")
         
         self.storage_path = storage_path
-        self.index_in_memory = index_in_memory
         
-        # Create storage directory if it doesn't exist
-        os.makedirs(self.storage_path, exist_ok=True)
+        # Create the storage backend
+        if isinstance(backend, BaseStorage):
+            self.storage = backend
+            self.backend = type(backend).__name__
+        else:
+            if backend not in self._BACKENDS:
+                raise ValueError(f"Unknown long-term memory backend: {backend}")
+            self.storage = self._BACKENDS[backend](self.storage_path, **(backend_options or {}))
+            self.backend = backend
+        
+        # Backends that search on their own don't need the items mirrored in memory
+        if index_in_memory is None:
+            index_in_memory = not self.storage.supports_search
+        self.index_in_memory = index_in_memory
         
         # Create indexes
         self.index: Dict[str, Dict[str, Any]] = {}
-        
-        # Load index from disk if using in-memory indexing
-        if self.index_in_memory:
-            self._load_index()
+        self._index_loaded = False
+        self._index_lock = threading.RLock()
+        
+        # Create the vector index for semantic recall
+        self.embedding_model = embedding_model
+        self.embedding_field = embedding_field
+        self.vector_index: Optional[VectorIndex] = None
+        if embedding_model is not None:
+            self.vector_index = VectorIndex(
+                os.path.join(self.storage_path, "vectors"),
+                **(vector_index_options or {})
+            )
     
     def add(self, item: Dict[str, Any]) -> str:
         """
@@ -79,7 +135,9 @@ class LongTermMemory(BaseMemory):
         
         # Update the index
         if self.index_in_memory:
-            self.index[identifier] = item_with_metadata
+            with self._index_lock:
+                self.index[identifier] = item_with_metadata
+        self._embed_item(identifier, item_with_metadata)
         
         return identifier
     
@@ -97,17 +155,8 @@ class LongTermMemory(BaseMemory):
         if self.index_in_memory and identifier in self.index:
             return self.index[identifier]
         
-        # Otherwise, load from disk
-        item_path = self._get_item_path(identifier)
-        if not os.path.exists(item_path):
-            return None
-        
-        try:
-            with open(item_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logging.error(f"Error loading item {identifier}: {e}")
-            return None
+        # Otherwise, load from storage
+        return self.storage.load(identifier)
     
     def search(self, query: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -122,9 +171,22 @@ class LongTermMemory(BaseMemory):
         """
         results = []
         
+        # Let backends that can evaluate queries do so, newest first
+        if self.storage.supports_search:
+            for identifier, item in self.storage.search(query, limit):
+                results.append({
+                    "id": identifier,
+                    "item": item,
+                    "created_at": item.get("_meta", {}).get("created_at", 0)
+                })
+            return results
+        
         # If using in-memory index, search there
         if self.index_in_memory:
-            for identifier, item in self.index.items():
+            self._ensure_index()
+            with self._index_lock:
+                items = list(self.index.items())
+            for identifier, item in items:
                 if self._matches_query(item, query):
                     results.append({
                         "id": identifier,
@@ -135,14 +197,8 @@ class LongTermMemory(BaseMemory):
                     if len(results) >= limit:
                         break
         else:
-            # Otherwise, scan the storage directory
-            for item_file in os.listdir(self.storage_path):
-                if not item_file.endswith(".json"):
-                    continue
-                
-                identifier = item_file[:-5]  # Remove .json extension
-                item = self.get(identifier)
-                
+            # Otherwise, scan the storage backend
+            for identifier, item in self.storage.iter_items():
                 if item and self._matches_query(item, query):
                     results.append({
                         "id": identifier,
@@ -191,7 +247,9 @@ class LongTermMemory(BaseMemory):
         
         # Update the index
         if self.index_in_memory:
-            self.index[identifier] = item_with_metadata
+            with self._index_lock:
+                self.index[identifier] = item_with_metadata
+        self._embed_item(identifier, item_with_metadata)
         
         return True
     
@@ -205,38 +263,31 @@ class LongTermMemory(BaseMemory):
         Returns:
             True if the deletion was successful, False otherwise.
         """
-        item_path = self._get_item_path(identifier)
-        if not os.path.exists(item_path):
+        if not self.storage.delete(identifier):
             return False
         
-        try:
-            os.remove(item_path)
-            
-            # Update the index
-            if self.index_in_memory and identifier in self.index:
-                del self.index[identifier]
-            
-            return True
-        except Exception as e:
-            logging.error(f"Error deleting item {identifier}: {e}")
-            return False
+        # Update the index
+        if self.index_in_memory:
+            with self._index_lock:
+                self.index.pop(identifier, None)
+        if self.vector_index is not None:
+            self.vector_index.remove(identifier)
+        
+        return True
     
     def clear(self) -> None:
         """
         Clear all items from memory.
         """
-        for item_file in os.listdir(self.storage_path):
-            if not item_file.endswith(".json"):
-                continue
-            
-            try:
-                os.remove(os.path.join(self.storage_path, item_file))
-            except Exception as e:
-                logging.error(f"Error deleting file {item_file}: {e}")
+        self.storage.clear()
         
         # Clear the index
         if self.index_in_memory:
-            self.index = {}
+            with self._index_lock:
+                self.index = {}
+                self._index_loaded = True
+        if self.vector_index is not None:
+            self.vector_index.clear()
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -246,37 +297,106 @@ class LongTermMemory(BaseMemory):
             A dictionary containing memory statistics.
         """
         # Count the number of items
-        if self.index_in_memory:
+        if self.index_in_memory and self._index_loaded:
             item_count = len(self.index)
         else:
-            item_count = len([f for f in os.listdir(self.storage_path) if f.endswith(".json")])
+            item_count = self.storage.count()
         
-        # Get the total size of all items
-        total_size = sum(
-            os.path.getsize(os.path.join(self.storage_path, f)) 
-            for f in os.listdir(self.storage_path) 
-            if os.path.isfile(os.path.join(self.storage_path, f)) and f.endswith(".json")
-        )
-        
-        return {
+        stats = {
             "type": "long_term",
+            "backend": self.backend,
             "storage_path": self.storage_path,
             "index_in_memory": self.index_in_memory,
             "item_count": item_count,
-            "total_size_bytes": total_size
+            "total_size_bytes": self.storage.size_bytes()
         }
+        stats.update(self.storage.get_stats())
+        if self.vector_index is not None:
+            stats["vector_index"] = self.vector_index.get_stats()
+        
+        return stats
     
-    def _get_item_path(self, identifier: str) -> str:
+    def search_similar(self, text: str, k: int = 5) -> List[Dict[str, Any]]:
         """
-        Get the file path for an item.
+        Find the items most semantically similar to a text.
         
         Args:
-            identifier: The identifier of the item.
+            text: The text to compare against.
+            k: Maximum number of results to return.
             
         Returns:
-            The file path for the item.
+            A list of matching items with their cosine similarity, most similar first.
         """
-        return os.path.join(self.storage_path, f"{identifier}.json")
+        if self.vector_index is None:
+            logging.warning("Semantic recall requires LongTermMemory to be created with an embedding_model")
+            return []
+        
+        embedding = self.embedding_model.get_embedding(text)
+        if not embedding:
+            logging.error("Failed to embed the recall query")
+            return []
+        
+        results = []
+        for identifier, score in self.vector_index.search(embedding, k):
+            item = self.get(identifier)
+            if item is None:
+                continue
+            
+            results.append({
+                "id": identifier,
+                "item": item,
+                "score": score,
+                "created_at": item.get("_meta", {}).get("created_at", 0)
+            })
+        
+        return results
+    
+    def reindex_embeddings(self, batch_size: int = 256) -> int:
+        """
+        Rebuild the vector index from all stored items.
+        
+        Items are embedded batch_size at a time through the embedding model's
+        get_embeddings, so with a batching model (and a CachedModel with an
+        embedding store) a rebuild costs few requests, or none at all.
+        
+        Args:
+            batch_size: Number of items embedded per call.
+            
+        Returns:
+            The number of items in the rebuilt index.
+        """
+        if self.vector_index is None:
+            logging.warning("Semantic recall requires LongTermMemory to be created with an embedding_model")
+            return 0
+        
+        self.vector_index.clear()
+        
+        def flush(batch: List[Any]) -> None:
+            embeddings = self.embedding_model.get_embeddings([text for _, text in batch], batch_size)
+            for (identifier, _), embedding in zip(batch, embeddings):
+                if embedding:
+                    self.vector_index.add(identifier, embedding)
+                else:
+                    logging.error(f"Failed to embed item {identifier}; it won't be found by semantic recall")
+        
+        batch = []
+        for identifier, item in self.storage.iter_items():
+            text = self._embedding_text(item)
+            if text is not None:
+                batch.append((identifier, text))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+        
+        return len(self.vector_index)
+    
+    def close(self) -> None:
+        """
+        Flush the storage backend and release its resources.
+        """
+        self.storage.close()
     
     def _save_item(self, identifier: str, item: Dict[str, Any]) -> None:
         """
@@ -286,32 +406,69 @@ class LongTermMemory(BaseMemory):
             identifier: The identifier of the item.
             item: The item to save.
         """
-        item_path = self._get_item_path(identifier)
-        
-        try:
-            with open(item_path, "w") as f:
-                json.dump(item, f, indent=2)
-        except Exception as e:
-            logging.error(f"Error saving item {identifier}: {e}")
+        self.storage.save(identifier, item)
     
-    def _load_index(self) -> None:
+    def _embed_item(self, identifier: str, item: Dict[str, Any]) -> None:
         """
-        Load the index from disk.
+        Embed an item into the vector index, if semantic recall is enabled.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to embed.
+        """
+        if self.vector_index is None:
+            return
+        
+        text = self._embedding_text(item)
+        if text is None:
+            # Nothing to embed; drop any vector from a previous version
+            self.vector_index.remove(identifier)
+            return
+        
+        embedding = self.embedding_model.get_embedding(text)
+        if not embedding:
+            logging.error(f"Failed to embed item {identifier}; it won't be found by semantic recall")
+            self.vector_index.remove(identifier)
+            return
+        
+        self.vector_index.add(identifier, embedding)
+    
+    def _embedding_text(self, item: Dict[str, Any]) -> Optional[str]:
         """
-        self.index = {}
+        Get the text an item is embedded by.
         
-        for item_file in os.listdir(self.storage_path):
-            if not item_file.endswith(".json"):
-                continue
+        Args:
+            item: The item.
             
-            identifier = item_file[:-5]  # Remove .json extension
+        Returns:
+            The text, or None if the item has nothing to embed.
+        """
+        if self.embedding_field is not None:
+            text = item.get(self.embedding_field)
+            return text if isinstance(text, str) else None
+        return json.dumps({key: value for key, value in item.items() if key != "_meta"}, sort_keys=True)
+    
+    def _ensure_index(self) -> None:
+        """
+        Load the in-memory index on first use.
+        """
+        with self._index_lock:
+            if not self._index_loaded:
+                self._load_index()
+    
+    def _load_index(self) -> None:
+        """
+        Load the index from storage.
+        """
+        with self._index_lock:
+            index = {}
+            for identifier, item in self.storage.iter_items():
+                index[identifier] = item
             
-            try:
-                with open(os.path.join(self.storage_path, item_file), "r") as f:
-                    item = json.load(f)
-                    self.index[identifier] = item
-            except Exception as e:
-                logging.error(f"Error loading index for {identifier}: {e}")
+            # Keep anything added before the index was loaded
+            index.update(self.index)
+            self.index = index
+            self._index_loaded = True
     
     def _matches_query(self, item: Dict[str, Any], query: Dict[str, Any]) -> bool:
         """
@@ -324,21 +481,4 @@ class LongTermMemory(BaseMemory):
         Returns:
             True if the item matches the query, False otherwise.
         """
-        for key, value in query.items():
-            # Handle nested keys with dot notation
-            if "." in key:
-                parts = key.split(".")
-                curr = item
-                for part in parts:
-                    if isinstance(curr, dict) and part in curr:
-                        curr = curr[part]
-                    else:
-                        return False
-                
-                if curr != value:
-                    return False
-            # Handle simple keys
-            elif key not in item or item[key] != value:
-                return False
-        
-        return True 
\ No newline at end of file
+        return matches_query(item, query)
\ No newline at end of file
@@ -5,9 +5,9 @@ Because even an ANUS needs to remember what it just processed.
 """
 
 from typing import Dict, List, Any, Optional, Union
+from collections import OrderedDict
 import uuid
 import time
-import heapq
 import logging
 import random
 
@@ -19,6 +19,11 @@ class ShortTermMemory(BaseMemory):
     
     Provides a volatile memory store with automatic pruning of old items.
     
+    Items are kept in an ordered dictionary in least-recently-used order, so
+    touching, evicting and expiring an item are all amortized O(1). Because every
+    item shares the same TTL, creation order is also expiry order, and expired
+    items are dropped lazily from the head of the creation queue.
+    
     Just like the human ANUS, it's good at handling recent input but tends to 
     forget older stuff if not regularly refreshed.
     """
@@ -36,6 +41,7 @@ class ShortTermMemory(BaseMemory):
         self, 
         capacity: int = 1000, 
         ttl: int = 3600,  # Time to live in seconds
+        indexed_fields: Optional[List[str]] = None,
         **kwargs
     ):
         """
@@ -44,15 +50,30 @@ class ShortTermMemory(BaseMemory):
         Args:
             capacity: Maximum number of items to store.
             ttl: Time to live for items in seconds.
+            indexed_fields: Optional top-level item fields to keep hash indexes for,
+                e.g. ["type", "task_id", "agent"].
             **kwargs: Additional configuration options.
         """
         super().__init__(**kwargs)
         self.capacity = capacity
         self.ttl = ttl
-        self.items: Dict[str, Dict[str, Any]] = {}
+        self.items: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # Least recently used first
         self.access_times: Dict[str, float] = {}
-        self.creation_times: Dict[str, float] = {}
-        self.lru_queue: List[tuple] = []  # Priority queue for LRU eviction
+        self.creation_times: "OrderedDict[str, float]" = OrderedDict()  # Oldest (first to expire) first
+        
+        # Counters reported by get_stats()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        # Secondary indexes: field -> value -> {identifier: creation time}.
+        # Each posting keeps its identifiers in creation order so searches can
+        # walk it newest-first and stop as soon as the limit is reached.
+        self.indexes: Dict[str, Dict[Any, Dict[str, float]]] = {}
+        self._unordered_postings: set = set()
+        for field in indexed_fields or []:
+            self.add_index(field)
         
         if capacity < 100:
             logging.warning(f"ANUS short-term memory capacity of {capacity} is quite small. Performance may suffer.")
@@ -84,9 +105,7 @@ class ShortTermMemory(BaseMemory):
         current_time = time.time()
         self.access_times[identifier] = current_time
         self.creation_times[identifier] = current_time
-        
-        # Add to LRU queue
-        heapq.heappush(self.lru_queue, (current_time, identifier))
+        self._index_item(identifier, item)
         
         # Check capacity and evict if necessary
         if len(self.items) > self.capacity:
@@ -120,11 +139,13 @@ class ShortTermMemory(BaseMemory):
         
         # Check if the item exists
         if identifier not in self.items:
+            self.misses += 1
             logging.debug(f"ANUS has no recollection of item {identifier[:8]}...")
             return None
         
         # Update access time
-        self.access_times[identifier] = time.time()
+        self.hits += 1
+        self._touch(identifier)
         
         # Return the item
         logging.debug(f"ANUS recalls this item perfectly!")
@@ -134,7 +155,10 @@ class ShortTermMemory(BaseMemory):
         """
         Search memory for items matching the query.
         
-        Simple implementation that checks for exact matches on query fields.
+        Checks for exact matches on query fields. If any query field is indexed,
+        only the smallest matching posting is scanned; otherwise all items are
+        scanned. Either way results are produced newest-first, so the scan stops
+        as soon as ``limit`` matches have been found.
         
         Args:
             query: The search query.
@@ -149,8 +173,11 @@ class ShortTermMemory(BaseMemory):
         logging.debug(f"ANUS is probing deeply for matching items...")
         
         results = []
+        candidates = self._get_candidates(query)
         
-        for identifier, item in self.items.items():
+        for identifier in candidates:
+            item = self.items[identifier]
+            
             # Check if all query fields match
             is_match = True
             for key, value in query.items():
@@ -159,9 +186,6 @@ class ShortTermMemory(BaseMemory):
                     break
             
             if is_match:
-                # Update access time
-                self.access_times[identifier] = time.time()
-                
                 # Add to results
                 results.append({
                     "id": identifier,
@@ -173,8 +197,9 @@ class ShortTermMemory(BaseMemory):
                 if len(results) >= limit:
                     break
         
-        # Sort by recency
-        results.sort(key=lambda x: x["created_at"], reverse=True)
+        # Update access times outside the scan, since touching reorders the items
+        for result in results:
+            self._touch(result["id"])
         
         if not results:
             logging.debug("ANUS found nothing that matches. How disappointing.")
@@ -203,10 +228,11 @@ class ShortTermMemory(BaseMemory):
             return False
         
         # Update the item
+        self._reindex_item(identifier, self.items[identifier], item)
         self.items[identifier] = item
         
         # Update access time
-        self.access_times[identifier] = time.time()
+        self._touch(identifier)
         
         logging.debug(f"ANUS memory successfully updated with fresh content")
         return True
@@ -226,12 +252,11 @@ class ShortTermMemory(BaseMemory):
             return False
         
         # Delete the item
+        self._unindex_item(identifier, self.items[identifier])
         del self.items[identifier]
         del self.access_times[identifier]
         del self.creation_times[identifier]
         
-        # Note: The item will remain in the LRU queue, but will be skipped when it's popped
-        
         logging.debug(f"ANUS has purged this item from its memory")
         return True
     
@@ -240,10 +265,11 @@ class ShortTermMemory(BaseMemory):
         Clear all items from memory.
         """
         old_count = len(self.items)
-        self.items = {}
+        self.items = OrderedDict()
         self.access_times = {}
-        self.creation_times = {}
-        self.lru_queue = []
+        self.creation_times = OrderedDict()
+        self.indexes = {field: {} for field in self.indexes}
+        self._unordered_postings = set()
         
         logging.info(f"ANUS memory has been completely flushed of {old_count} items. Fresh and clean!")
     
@@ -255,6 +281,7 @@ class ShortTermMemory(BaseMemory):
             A dictionary containing memory statistics.
         """
         utilization = len(self.items) / self.capacity if self.capacity > 0 else 0
+        lookups = self.hits + self.misses
         
         # Add a funny message based on utilization
         if utilization > 0.9:
@@ -272,39 +299,210 @@ class ShortTermMemory(BaseMemory):
             "ttl": self.ttl,
             "current_size": len(self.items),
             "utilization": utilization,
-            "status": status
+            "status": status,
+            "indexed_fields": list(self.indexes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
         }
     
-    def _prune_expired(self) -> None:
+    def add_index(self, field: str) -> None:
         """
-        Remove items that have exceeded their time to live.
+        Declare a hash index on a top-level item field.
+        
+        Existing items are indexed immediately. Items whose value for the field
+        is unhashable are left out of the index and are only found by scans.
+        
+        Args:
+            field: The name of the field to index.
         """
-        current_time = time.time()
-        expired_identifiers = []
+        if field in self.indexes:
+            return
         
+        self.indexes[field] = {}
         for identifier, creation_time in self.creation_times.items():
-            if current_time - creation_time > self.ttl:
-                expired_identifiers.append(identifier)
+            self._add_posting(field, self.items[identifier], identifier, creation_time)
         
-        if expired_identifiers:
-            for identifier in expired_identifiers:
-                self.delete(identifier)
-            
-            logging.debug(f"ANUS has expelled {len(expired_identifiers)} expired items from memory")
+        logging.debug(f"ANUS short-term memory is now indexing field '{field}'")
     
-    def _evict_lru(self) -> None:
+    def _get_candidates(self, query: Dict[str, Any]):
         """
-        Evict the least recently used item from memory.
+        Get the identifiers that may match a query, newest first.
+        
+        Args:
+            query: The search query.
+            
+        Returns:
+            An iterator over candidate identifiers.
         """
-        while self.lru_queue:
-            _, identifier = heapq.heappop(self.lru_queue)
+        postings = []
+        for key, value in query.items():
+            if key not in self.indexes:
+                continue
+            try:
+                posting = self.indexes[key].get(value)
+            except TypeError:
+                # Unhashable query value, can't use the index
+                continue
+            if not posting:
+                return iter(())
+            postings.append((key, value, posting))
+        
+        if not postings:
+            return reversed(self.creation_times)
+        
+        key, value, posting = min(postings, key=lambda p: len(p[2]))
+        if (key, value) in self._unordered_postings:
+            posting = dict(sorted(posting.items(), key=lambda entry: entry[1]))
+            self.indexes[key][value] = posting
+            self._unordered_postings.discard((key, value))
+        
+        return reversed(posting)
+    
+    def _add_posting(self, field: str, item: Dict[str, Any], identifier: str, creation_time: float) -> bool:
+        """
+        Add an item to the posting for its value of an indexed field.
+        
+        Args:
+            field: The indexed field.
+            item: The item being indexed.
+            identifier: The identifier of the item.
+            creation_time: The creation time of the item.
             
-            # Skip if the item has been deleted
-            if identifier not in self.items:
+        Returns:
+            True if the item was added to a posting, False otherwise.
+        """
+        if not isinstance(item, dict) or field not in item:
+            return False
+        
+        value = item[field]
+        try:
+            posting = self.indexes[field].setdefault(value, {})
+        except TypeError:
+            return False
+        
+        posting[identifier] = creation_time
+        return True
+    
+    def _index_item(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Add an item to all secondary indexes.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to index.
+        """
+        creation_time = self.creation_times[identifier]
+        for field in self.indexes:
+            self._add_posting(field, item, identifier, creation_time)
+    
+    def _reindex_item(self, identifier: str, old_item: Dict[str, Any], new_item: Dict[str, Any]) -> None:
+        """
+        Move an updated item to the postings for its new field values.
+        
+        Postings for unchanged values are left alone. A changed value appends the
+        item out of creation order, so that posting is flagged to be re-sorted
+        the next time a search uses it.
+        
+        Args:
+            identifier: The identifier of the item.
+            old_item: The item as it is currently indexed.
+            new_item: The updated item.
+        """
+        creation_time = self.creation_times[identifier]
+        for field in self.indexes:
+            old_present = isinstance(old_item, dict) and field in old_item
+            new_present = isinstance(new_item, dict) and field in new_item
+            if old_present and new_present and old_item[field] == new_item[field]:
                 continue
             
-            # Delete the item
-            item_name = self.items[identifier].get("name", "unknown")
+            if old_present:
+                self._remove_posting(field, old_item[field], identifier)
+            if self._add_posting(field, new_item, identifier, creation_time):
+                self._unordered_postings.add((field, new_item[field]))
+    
+    def _remove_posting(self, field: str, value: Any, identifier: str) -> None:
+        """
+        Remove an item from the posting for one value of an indexed field.
+        
+        Args:
+            field: The indexed field.
+            value: The value whose posting should no longer contain the item.
+            identifier: The identifier of the item.
+        """
+        index = self.indexes[field]
+        try:
+            posting = index.get(value)
+        except TypeError:
+            return
+        if posting is None:
+            return
+        
+        posting.pop(identifier, None)
+        if not posting:
+            del index[value]
+            self._unordered_postings.discard((field, value))
+    
+    def _unindex_item(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Remove an item from all secondary indexes.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item as it is currently indexed.
+        """
+        if not isinstance(item, dict):
+            return
+        
+        for field in self.indexes:
+            if field in item:
+                self._remove_posting(field, item[field], identifier)
+    
+    def _touch(self, identifier: str) -> None:
+        """
+        Mark an item as most recently used.
+        
+        Args:
+            identifier: The identifier of the item that was accessed.
+        """
+        self.access_times[identifier] = time.time()
+        self.items.move_to_end(identifier)
+    
+    def _prune_expired(self) -> None:
+        """
+        Remove items that have exceeded their time to live.
+        
+        Only the head of the creation queue is inspected, so the cost is
+        proportional to the number of items that actually expired.
+        """
+        cutoff = time.time() - self.ttl
+        expired_count = 0
+        
+        while self.creation_times:
+            identifier, creation_time = next(iter(self.creation_times.items()))
+            if creation_time >= cutoff:
+                break
+            
             self.delete(identifier)
-            logging.debug(f"ANUS had to push out '{item_name}' to make room for new content")
-            break 
\ No newline at end of file
+            expired_count += 1
+        
+        if expired_count:
+            self.expirations += expired_count
+            logging.debug(f"ANUS has expelled {expired_count} expired items from memory")
+    
+    def _evict_lru(self) -> None:
+        """
+        Evict the least recently used item from memory.
+        """
+        if not self.items:
+            return
+        
+        identifier = next(iter(self.items))
+        
+        # Delete the item
+        item_name = self.items[identifier].get("name", "unknown")
+        self.delete(identifier)
+        self.evictions += 1
+        logging.debug(f"ANUS had to push out '{item_name}' to make room for new content")
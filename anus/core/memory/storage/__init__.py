@@ -0,0 +1,16 @@
+"""
+Storage backends for long-term memory in the ANUS framework.
+
+This module contains the storage backends used by LongTermMemory:
+- BaseStorage: Abstract base class for all storage backends
+- FileStorage: One JSON file per item
+- SegmentStorage: Append-only segment files with an offset index
+- SqliteStorage: SQLite database with indexed dotted-path queries
+"""
+
+from anus.core.memory.storage.base_storage import BaseStorage
+from anus.core.memory.storage.file_storage import FileStorage
+from anus.core.memory.storage.segment_storage import SegmentStorage
+from anus.core.memory.storage.sqlite_storage import SqliteStorage
+
+__all__ = ["BaseStorage", "FileStorage", "SegmentStorage", "SqliteStorage"]
@@ -0,0 +1,166 @@
+"""
+Base Storage module that defines the common interface for long-term memory storage.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+def matches_query(item: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """
+    Check if an item matches a query.
+    
+    Every query key must be present in the item with an equal value. Keys
+    containing dots address nested dictionaries, e.g. ``"_meta.id"``.
+    
+    Args:
+        item: The item to check.
+        query: The query to match against.
+        
+    Returns:
+        True if the item matches the query, False otherwise.
+    """
+    for key, value in query.items():
+        # Handle nested keys with dot notation
+        if "." in key:
+            parts = key.split(".")
+            curr = item
+            for part in parts:
+                if isinstance(curr, dict) and part in curr:
+                    curr = curr[part]
+                else:
+                    return False
+            
+            if curr != value:
+                return False
+        # Handle simple keys
+        elif key not in item or item[key] != value:
+            return False
+    
+    return True
+
+class BaseStorage(ABC):
+    """
+    Abstract base class for storage backends used by LongTermMemory.
+    
+    A storage backend persists items by identifier. Backends that can
+    evaluate queries themselves set ``supports_search`` and implement
+    ``search``; for all others the memory scans the items itself.
+    """
+    
+    # Whether the backend implements search()
+    supports_search = False
+    
+    def __init__(self, storage_path: str, **kwargs):
+        """
+        Initialize a BaseStorage instance.
+        
+        Args:
+            storage_path: Directory the backend keeps its files in.
+            **kwargs: Additional configuration options for the backend.
+        """
+        self.storage_path = storage_path
+        self.config = kwargs
+    
+    @abstractmethod
+    def save(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Persist an item, replacing any previous version.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to save.
+        """
+        pass
+    
+    @abstractmethod
+    def load(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Load an item by its identifier.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            The stored item, or None if not found.
+        """
+        pass
+    
+    @abstractmethod
+    def delete(self, identifier: str) -> bool:
+        """
+        Delete an item.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            True if the item existed and was deleted, False otherwise.
+        """
+        pass
+    
+    @abstractmethod
+    def iter_items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over all stored items.
+        
+        Returns:
+            An iterator of (identifier, item) tuples.
+        """
+        pass
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Delete all stored items.
+        """
+        pass
+    
+    @abstractmethod
+    def count(self) -> int:
+        """
+        Get the number of stored items.
+        
+        Returns:
+            The item count.
+        """
+        pass
+    
+    @abstractmethod
+    def size_bytes(self) -> int:
+        """
+        Get the number of bytes used on disk.
+        
+        Returns:
+            The total size in bytes.
+        """
+        pass
+    
+    def search(self, query: Dict[str, Any], limit: int = 10) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Find the newest items matching a query.
+        
+        Only available on backends that set ``supports_search``.
+        
+        Args:
+            query: The query, with the same semantics as ``matches_query``.
+            limit: Maximum number of results to return.
+            
+        Returns:
+            A list of (identifier, item) tuples, newest first.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support search")
+    
+    def close(self) -> None:
+        """
+        Flush pending state and release any open resources.
+        """
+        pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get backend-specific statistics.
+        
+        Returns:
+            A dictionary containing storage statistics.
+        """
+        return {}
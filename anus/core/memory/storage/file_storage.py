@@ -0,0 +1,153 @@
+"""
+File storage backend that keeps one JSON file per item.
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+import json
+import os
+import logging
+
+from anus.core.memory.storage.base_storage import BaseStorage
+
+class FileStorage(BaseStorage):
+    """
+    Storage backend that writes each item to its own JSON file.
+    
+    This is the original LongTermMemory layout. It is simple and easy to
+    inspect by hand, but startup and statistics need to touch every file.
+    """
+    
+    def __init__(self, storage_path: str, **kwargs):
+        """
+        Initialize a FileStorage instance.
+        
+        Args:
+            storage_path: Directory to store item files in.
+            **kwargs: Additional configuration options.
+        """
+        super().__init__(storage_path, **kwargs)
+        os.makedirs(self.storage_path, exist_ok=True)
+    
+    def save(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Save an item to its JSON file.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to save.
+        """
+        item_path = self._get_item_path(identifier)
+        
+        try:
+            with open(item_path, "w") as f:
+                json.dump(item, f, indent=2)
+        except Exception as e:
+            logging.error(f"Error saving item {identifier}: {e}")
+    
+    def load(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Load an item from its JSON file.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            The stored item, or None if not found.
+        """
+        item_path = self._get_item_path(identifier)
+        if not os.path.exists(item_path):
+            return None
+        
+        try:
+            with open(item_path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.error(f"Error loading item {identifier}: {e}")
+            return None
+    
+    def delete(self, identifier: str) -> bool:
+        """
+        Delete an item's JSON file.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            True if the item existed and was deleted, False otherwise.
+        """
+        item_path = self._get_item_path(identifier)
+        if not os.path.exists(item_path):
+            return False
+        
+        try:
+            os.remove(item_path)
+            return True
+        except Exception as e:
+            logging.error(f"Error deleting item {identifier}: {e}")
+            return False
+    
+    def iter_items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over all item files in the storage directory.
+        
+        Returns:
+            An iterator of (identifier, item) tuples.
+        """
+        for item_file in os.listdir(self.storage_path):
+            if not item_file.endswith(".json"):
+                continue
+            
+            identifier = item_file[:-5]  # Remove .json extension
+            
+            try:
+                with open(os.path.join(self.storage_path, item_file), "r") as f:
+                    yield identifier, json.load(f)
+            except Exception as e:
+                logging.error(f"Error loading index for {identifier}: {e}")
+    
+    def clear(self) -> None:
+        """
+        Delete all item files.
+        """
+        for item_file in os.listdir(self.storage_path):
+            if not item_file.endswith(".json"):
+                continue
+            
+            try:
+                os.remove(os.path.join(self.storage_path, item_file))
+            except Exception as e:
+                logging.error(f"Error deleting file {item_file}: {e}")
+    
+    def count(self) -> int:
+        """
+        Count the item files in the storage directory.
+        
+        Returns:
+            The item count.
+        """
+        return len([f for f in os.listdir(self.storage_path) if f.endswith(".json")])
+    
+    def size_bytes(self) -> int:
+        """
+        Sum the sizes of all item files.
+        
+        Returns:
+            The total size in bytes.
+        """
+        return sum(
+            os.path.getsize(os.path.join(self.storage_path, f))
+            for f in os.listdir(self.storage_path)
+            if os.path.isfile(os.path.join(self.storage_path, f)) and f.endswith(".json")
+        )
+    
+    def _get_item_path(self, identifier: str) -> str:
+        """
+        Get the file path for an item.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            The file path for the item.
+        """
+        return os.path.join(self.storage_path, f"{identifier}.json")
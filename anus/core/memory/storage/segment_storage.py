@@ -0,0 +1,567 @@
+"""
+Segment storage backend built on an append-only record log.
+
+Items are appended as compact JSON lines to numbered segment files. An offset
+index maps each identifier to the location of its latest record, so startup
+only reads the index and the few records written after the last checkpoint.
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+import json
+import os
+import logging
+import threading
+
+from anus.core.memory.storage.base_storage import BaseStorage
+
+class SegmentStorage(BaseStorage):
+    """
+    Storage backend that appends records to segment files.
+    
+    Layout of the storage directory:
+    - ``segment-NNNNNN.log``: append-only logs of ``{"id", "item"}`` records
+      and ``{"id", "deleted"}`` tombstones, one JSON object per line
+    - ``index-NNNNNN.idx``: a snapshot of the offset index
+    - ``MANIFEST``: the live segments, the current index snapshot and the
+      log position the snapshot covers; replacing it is the commit point for
+      checkpoints and compactions
+    
+    Updates and deletes leave dead records behind. Once dead bytes make up
+    more than ``compact_ratio`` of the log, live records are copied to fresh
+    segments and the old ones are removed.
+    """
+    
+    MANIFEST_NAME = "MANIFEST"
+    
+    def __init__(
+        self,
+        storage_path: str,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        checkpoint_interval: int = 1000,
+        compact_ratio: float = 0.5,
+        compact_min_bytes: int = 1024 * 1024,
+        fsync: bool = False,
+        **kwargs
+    ):
+        """
+        Initialize a SegmentStorage instance.
+        
+        Args:
+            storage_path: Directory to store segments, index and manifest in.
+            max_segment_bytes: Size at which the active segment is rotated.
+            checkpoint_interval: Number of writes between index snapshots.
+            compact_ratio: Fraction of dead bytes that triggers compaction.
+            compact_min_bytes: Log size below which compaction never runs.
+            fsync: Whether to fsync the active segment after every write.
+            **kwargs: Additional configuration options.
+        """
+        super().__init__(storage_path, **kwargs)
+        self.max_segment_bytes = max_segment_bytes
+        self.checkpoint_interval = checkpoint_interval
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self.fsync = fsync
+        
+        os.makedirs(self.storage_path, exist_ok=True)
+        
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Tuple[int, int, int]] = {}  # id -> (segment, offset, length)
+        self._segments: List[int] = []
+        self._segment_sizes: Dict[int, int] = {}
+        self._index_generation = 0
+        self._live_bytes = 0
+        self._writes_since_checkpoint = 0
+        self._compactions = 0
+        self._compacting = False
+        self._readers: Dict[int, Any] = {}
+        self._writer = None
+        
+        self._open()
+    
+    def save(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Append a record for an item.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to save.
+        """
+        record = self._encode({"id": identifier, "item": item})
+        
+        with self._lock:
+            location = self._append(record)
+            self._set_entry(identifier, location)
+            self._after_write()
+    
+    def load(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the latest record for an item.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            The stored item, or None if not found.
+        """
+        with self._lock:
+            location = self._entries.get(identifier)
+            if location is None:
+                return None
+            
+            try:
+                return json.loads(self._read(*location))["item"]
+            except Exception as e:
+                logging.error(f"Error loading item {identifier}: {e}")
+                return None
+    
+    def delete(self, identifier: str) -> bool:
+        """
+        Append a tombstone for an item.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            True if the item existed and was deleted, False otherwise.
+        """
+        with self._lock:
+            if identifier not in self._entries:
+                return False
+            
+            self._append(self._encode({"id": identifier, "deleted": True}))
+            self._set_entry(identifier, None)
+            self._after_write()
+            return True
+    
+    def iter_items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over all live items in log order.
+        
+        Returns:
+            An iterator of (identifier, item) tuples.
+        """
+        with self._lock:
+            locations = sorted(self._entries.items(), key=lambda entry: entry[1])
+        
+        for identifier, _ in locations:
+            with self._lock:
+                # Items may have moved or been deleted since the iteration started
+                location = self._entries.get(identifier)
+                if location is None:
+                    continue
+                try:
+                    item = json.loads(self._read(*location))["item"]
+                except Exception as e:
+                    logging.error(f"Error loading item {identifier}: {e}")
+                    continue
+            yield identifier, item
+    
+    def clear(self) -> None:
+        """
+        Delete all segments and start a fresh log.
+        """
+        with self._lock:
+            self._close_files()
+            
+            for segment in self._segments:
+                self._remove_file(self._segment_path(segment))
+            self._remove_file(self._index_path(self._index_generation))
+            
+            self._entries = {}
+            self._segments = []
+            self._segment_sizes = {}
+            self._live_bytes = 0
+            self._writes_since_checkpoint = 0
+            
+            self._start_segment(1)
+            self.checkpoint()
+    
+    def count(self) -> int:
+        """
+        Get the number of live items.
+        
+        Returns:
+            The item count.
+        """
+        return len(self._entries)
+    
+    def size_bytes(self) -> int:
+        """
+        Get the total size of all segments.
+        
+        Returns:
+            The total size in bytes.
+        """
+        return sum(self._segment_sizes.values())
+    
+    def close(self) -> None:
+        """
+        Write a final checkpoint and close all open files.
+        """
+        with self._lock:
+            if self._writer is None:
+                return
+            self.checkpoint()
+            self._close_files()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the segment log.
+        
+        Returns:
+            A dictionary containing storage statistics.
+        """
+        total_bytes = self.size_bytes()
+        return {
+            "segments": len(self._segments),
+            "live_bytes": self._live_bytes,
+            "dead_bytes": total_bytes - self._live_bytes,
+            "compactions": self._compactions
+        }
+    
+    def checkpoint(self) -> None:
+        """
+        Persist a snapshot of the offset index and commit it in the manifest.
+        """
+        with self._lock:
+            self._flush()
+            
+            generation = self._index_generation + 1
+            index_path = self._index_path(generation)
+            self._write_json(index_path, {
+                "entries": {identifier: list(location) for identifier, location in self._entries.items()}
+            })
+            
+            active = self._segments[-1]
+            self._write_json(os.path.join(self.storage_path, self.MANIFEST_NAME), {
+                "version": 1,
+                "segments": self._segments,
+                "index_generation": generation,
+                "checkpoint": [active, self._segment_sizes[active]]
+            })
+            
+            self._remove_file(self._index_path(self._index_generation))
+            self._index_generation = generation
+            self._writes_since_checkpoint = 0
+    
+    def compact(self) -> None:
+        """
+        Copy all live records into fresh segments and drop the old ones.
+        """
+        with self._lock:
+            self._flush()
+            old_segments = self._segments
+            locations = sorted(self._entries.items(), key=lambda entry: entry[1])
+            
+            self._close_writer()
+            self._segments = []
+            self._start_segment(old_segments[-1] + 1)
+            
+            # Records are copied verbatim, without decoding them. The old
+            # manifest stays in effect until the checkpoint below commits the
+            # new segments, so a crash here loses nothing.
+            self._compacting = True
+            try:
+                for identifier, location in locations:
+                    self._entries[identifier] = self._append(self._read(*location))
+            finally:
+                self._compacting = False
+            
+            self.checkpoint()
+            
+            for segment in old_segments:
+                reader = self._readers.pop(segment, None)
+                if reader is not None:
+                    reader.close()
+                self._segment_sizes.pop(segment, None)
+                self._remove_file(self._segment_path(segment))
+            
+            self._compactions += 1
+            logging.debug(f"ANUS compacted {len(old_segments)} memory segments into {len(self._segments)}")
+    
+    def _open(self) -> None:
+        """
+        Load the manifest and index, then replay records written after the checkpoint.
+        """
+        manifest_path = os.path.join(self.storage_path, self.MANIFEST_NAME)
+        manifest = None
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, "r") as f:
+                    manifest = json.load(f)
+            except Exception as e:
+                logging.error(f"Error loading memory manifest, rebuilding from segments: {e}")
+        
+        if manifest is None:
+            # No usable manifest: rebuild everything from the segment files on disk
+            segments = sorted(
+                int(name[len("segment-"):-len(".log")])
+                for name in os.listdir(self.storage_path)
+                if name.startswith("segment-") and name.endswith(".log")
+            )
+            checkpoint = (segments[0], 0) if segments else None
+        else:
+            segments = manifest["segments"]
+            checkpoint = tuple(manifest["checkpoint"])
+            self._index_generation = manifest["index_generation"]
+            try:
+                with open(self._index_path(self._index_generation), "r") as f:
+                    entries = json.load(f)["entries"]
+                self._entries = {identifier: tuple(location) for identifier, location in entries.items()}
+            except Exception as e:
+                logging.error(f"Error loading memory index, rebuilding from segments: {e}")
+                self._entries = {}
+                checkpoint = (segments[0], 0)
+        
+        if not segments:
+            self._start_segment(1)
+            self.checkpoint()
+            return
+        
+        self._segments = list(segments)
+        for segment in self._segments:
+            path = self._segment_path(segment)
+            self._segment_sizes[segment] = os.path.getsize(path) if os.path.exists(path) else 0
+        
+        replayed = 0
+        for segment in self._segments:
+            if segment < checkpoint[0]:
+                continue
+            start = checkpoint[1] if segment == checkpoint[0] else 0
+            replayed += self._replay(segment, start)
+        
+        self._live_bytes = sum(location[2] for location in self._entries.values())
+        self._writer = open(self._segment_path(self._segments[-1]), "ab")
+        
+        if replayed or manifest is None:
+            logging.debug(f"ANUS replayed {replayed} memory records written after the last checkpoint")
+            self.checkpoint()
+    
+    def _replay(self, segment: int, start: int) -> int:
+        """
+        Apply the records of a segment from an offset onwards to the index.
+        
+        A partial record at the end of the segment, left behind by a crash in
+        the middle of a write, is truncated away.
+        
+        Args:
+            segment: The segment number.
+            start: The byte offset to start reading at.
+            
+        Returns:
+            The number of records replayed.
+        """
+        path = self._segment_path(segment)
+        if not os.path.exists(path):
+            return 0
+        
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+        
+        offset = start
+        count = 0
+        for line in data.split(b"\n")[:-1]:
+            length = len(line) + 1
+            try:
+                record = json.loads(line)
+            except Exception as e:
+                logging.error(f"Skipping corrupt memory record in segment {segment} at offset {offset}: {e}")
+                offset += length
+                continue
+            
+            if record.get("deleted"):
+                self._entries.pop(record["id"], None)
+            else:
+                self._entries[record["id"]] = (segment, offset, length)
+            offset += length
+            count += 1
+        
+        if offset < start + len(data):
+            logging.warning(f"Truncating partial memory record at the end of segment {segment}")
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+            self._segment_sizes[segment] = offset
+        
+        return count
+    
+    def _append(self, record: bytes) -> Tuple[int, int, int]:
+        """
+        Append an encoded record to the active segment, rotating it if full.
+        
+        Args:
+            record: The encoded record.
+            
+        Returns:
+            The (segment, offset, length) location of the record.
+        """
+        active = self._segments[-1]
+        if self._segment_sizes[active] >= self.max_segment_bytes:
+            self._close_writer()
+            active += 1
+            self._start_segment(active)
+            if not self._compacting:
+                # Commit the new segment so it is replayed after a crash
+                self.checkpoint()
+        
+        offset = self._segment_sizes[active]
+        self._writer.write(record)
+        self._writer.flush()
+        if self.fsync:
+            os.fsync(self._writer.fileno())
+        
+        self._segment_sizes[active] = offset + len(record)
+        return active, offset, len(record)
+    
+    def _read(self, segment: int, offset: int, length: int) -> bytes:
+        """
+        Read a raw record from a segment.
+        
+        Args:
+            segment: The segment number.
+            offset: The byte offset of the record.
+            length: The length of the record in bytes.
+            
+        Returns:
+            The raw record bytes.
+        """
+        reader = self._readers.get(segment)
+        if reader is None:
+            reader = open(self._segment_path(segment), "rb")
+            self._readers[segment] = reader
+        
+        reader.seek(offset)
+        return reader.read(length)
+    
+    def _set_entry(self, identifier: str, location: Optional[Tuple[int, int, int]]) -> None:
+        """
+        Point an identifier at a new record, keeping the live byte count in sync.
+        
+        Args:
+            identifier: The identifier of the item.
+            location: The new record location, or None if the item was deleted.
+        """
+        previous = self._entries.pop(identifier, None)
+        if previous is not None:
+            self._live_bytes -= previous[2]
+        if location is not None:
+            self._entries[identifier] = location
+            self._live_bytes += location[2]
+    
+    def _after_write(self) -> None:
+        """
+        Run periodic maintenance after a write.
+        """
+        total_bytes = self.size_bytes()
+        dead_bytes = total_bytes - self._live_bytes
+        if total_bytes >= self.compact_min_bytes and dead_bytes > total_bytes * self.compact_ratio:
+            self.compact()
+            return
+        
+        self._writes_since_checkpoint += 1
+        if self._writes_since_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+    
+    def _start_segment(self, segment: int) -> None:
+        """
+        Create a new empty segment and make it the active one.
+        
+        Args:
+            segment: The segment number.
+        """
+        self._writer = open(self._segment_path(segment), "wb")
+        self._segments.append(segment)
+        self._segment_sizes[segment] = 0
+    
+    def _flush(self) -> None:
+        """
+        Flush buffered writes to the active segment.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+            if self.fsync:
+                os.fsync(self._writer.fileno())
+    
+    def _close_writer(self) -> None:
+        """
+        Close the active segment writer.
+        """
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+    
+    def _close_files(self) -> None:
+        """
+        Close the writer and all cached readers.
+        """
+        self._close_writer()
+        for reader in self._readers.values():
+            reader.close()
+        self._readers = {}
+    
+    def _encode(self, record: Dict[str, Any]) -> bytes:
+        """
+        Encode a record as a compact JSON line.
+        
+        Args:
+            record: The record to encode.
+            
+        Returns:
+            The encoded record.
+        """
+        return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+    
+    def _write_json(self, path: str, data: Dict[str, Any]) -> None:
+        """
+        Atomically replace a JSON file.
+        
+        Args:
+            path: The file path.
+            data: The data to write.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
+    def _remove_file(self, path: str) -> None:
+        """
+        Remove a file if it exists.
+        
+        Args:
+            path: The file path.
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.error(f"Error deleting file {path}: {e}")
+    
+    def _segment_path(self, segment: int) -> str:
+        """
+        Get the file path for a segment.
+        
+        Args:
+            segment: The segment number.
+            
+        Returns:
+            The segment file path.
+        """
+        return os.path.join(self.storage_path, f"segment-{segment:06d}.log")
+    
+    def _index_path(self, generation: int) -> str:
+        """
+        Get the file path for an index snapshot.
+        
+        Args:
+            generation: The index generation.
+            
+        Returns:
+            The index file path.
+        """
+        return os.path.join(self.storage_path, f"index-{generation:06d}.idx")
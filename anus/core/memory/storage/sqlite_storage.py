@@ -0,0 +1,300 @@
+"""
+SQLite storage backend with indexed dotted-path queries.
+
+Items are stored as JSON text in a single table. Query keys are translated to
+``json_extract`` expressions, so filtering, recency ordering and the result
+limit all run inside SQLite, and frequently queried paths can be backed by
+expression indexes.
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+import json
+import os
+import logging
+import sqlite3
+import threading
+
+from anus.core.memory.storage.base_storage import BaseStorage, matches_query
+
+class SqliteStorage(BaseStorage):
+    """
+    Storage backend that keeps items in a SQLite database in WAL mode.
+    
+    Query values that SQLite can compare exactly (strings, numbers, booleans
+    and None) are pushed down into SQL. Anything else, such as a nested dict
+    or list value, is checked in Python on the rows SQL already narrowed down.
+    """
+    
+    supports_search = True
+    
+    DATABASE_NAME = "memory.db"
+    
+    def __init__(
+        self,
+        storage_path: str,
+        indexed_paths: Optional[List[str]] = None,
+        **kwargs
+    ):
+        """
+        Initialize a SqliteStorage instance.
+        
+        Args:
+            storage_path: Directory to store the database in.
+            indexed_paths: Dotted item keys to create expression indexes for,
+                e.g. ["type", "_meta.id"].
+            **kwargs: Additional configuration options.
+        """
+        super().__init__(storage_path, **kwargs)
+        os.makedirs(self.storage_path, exist_ok=True)
+        
+        self.database_path = os.path.join(self.storage_path, self.DATABASE_NAME)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.database_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "id TEXT PRIMARY KEY, "
+            "data TEXT NOT NULL, "
+            "created_at REAL NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS items_created_at ON items(created_at)")
+        
+        for path in indexed_paths or []:
+            self.add_index(path)
+    
+    def add_index(self, path: str) -> None:
+        """
+        Create an expression index on a dotted item key.
+        
+        The index also covers the creation time, so an equality lookup on the
+        key can return the newest matches without sorting.
+        
+        Args:
+            path: The dotted key to index, e.g. "type" or "_meta.id".
+        """
+        json_path = self._json_path(path)
+        if json_path is None:
+            logging.warning(f"Can't index memory path '{path}': quotes are not supported in keys")
+            return
+        
+        index_name = "items_path_" + "".join(c if c.isalnum() else "_" for c in path)
+        with self._lock:
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name} "
+                f"ON items(json_extract(data, {self._quote(json_path)}), created_at)"
+            )
+    
+    def save(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Insert or replace an item.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to save.
+        """
+        created_at = item.get("_meta", {}).get("created_at", 0)
+        
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO items (id, data, created_at) VALUES (?, ?, ?)",
+                    (identifier, json.dumps(item, separators=(",", ":")), created_at)
+                )
+        except Exception as e:
+            logging.error(f"Error saving item {identifier}: {e}")
+    
+    def load(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Load an item by its identifier.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            The stored item, or None if not found.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM items WHERE id = ?", (identifier,)).fetchone()
+        
+        if row is None:
+            return None
+        
+        try:
+            return json.loads(row[0])
+        except Exception as e:
+            logging.error(f"Error loading item {identifier}: {e}")
+            return None
+    
+    def delete(self, identifier: str) -> bool:
+        """
+        Delete an item.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            True if the item existed and was deleted, False otherwise.
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM items WHERE id = ?", (identifier,))
+        return cursor.rowcount > 0
+    
+    def search(self, query: Dict[str, Any], limit: int = 10) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Find the newest items matching a query.
+        
+        Args:
+            query: The query, with the same semantics as ``matches_query``.
+            limit: Maximum number of results to return.
+            
+        Returns:
+            A list of (identifier, item) tuples, newest first.
+        """
+        conditions = []
+        params: List[Any] = []
+        residual = {}
+        
+        for key, value in query.items():
+            condition = self._condition(key, value)
+            if condition is None:
+                residual[key] = value
+                continue
+            conditions.append(condition[0])
+            params.extend(condition[1])
+        
+        sql = "SELECT id, data FROM items"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY created_at DESC"
+        if not residual:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        results = []
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            for identifier, data in cursor:
+                item = json.loads(data)
+                if residual and not matches_query(item, residual):
+                    continue
+                
+                results.append((identifier, item))
+                if len(results) >= limit:
+                    break
+            cursor.close()
+        
+        return results
+    
+    def iter_items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over all stored items.
+        
+        Returns:
+            An iterator of (identifier, item) tuples.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM items").fetchall()
+        
+        for identifier, data in rows:
+            try:
+                yield identifier, json.loads(data)
+            except Exception as e:
+                logging.error(f"Error loading item {identifier}: {e}")
+    
+    def clear(self) -> None:
+        """
+        Delete all stored items.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM items")
+    
+    def count(self) -> int:
+        """
+        Get the number of stored items.
+        
+        Returns:
+            The item count.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    
+    def size_bytes(self) -> int:
+        """
+        Get the size of the database and its write-ahead log.
+        
+        Returns:
+            The total size in bytes.
+        """
+        return sum(
+            os.path.getsize(path)
+            for path in (self.database_path, f"{self.database_path}-wal")
+            if os.path.exists(path)
+        )
+    
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._conn.close()
+    
+    def _condition(self, key: str, value: Any) -> Optional[Tuple[str, List[Any]]]:
+        """
+        Translate one query key into a SQL condition.
+        
+        The JSON path is inlined as a literal rather than bound as a parameter,
+        since SQLite only uses an expression index when the expression matches
+        the indexed one exactly.
+        
+        Args:
+            key: The dotted query key.
+            value: The value the key must equal.
+            
+        Returns:
+            A (condition, params) tuple, or None if the key must be checked in Python.
+        """
+        json_path = self._json_path(key)
+        if json_path is None:
+            return None
+        
+        quoted_path = self._quote(json_path)
+        if value is None:
+            return f"json_type(data, {quoted_path}) = 'null'", []
+        if isinstance(value, str):
+            # Objects and arrays also extract as text, so pin the JSON type
+            return f"json_extract(data, {quoted_path}) = ? AND json_type(data, {quoted_path}) = 'text'", [value]
+        if isinstance(value, int) and not -2**63 <= value < 2**63:
+            return None
+        if isinstance(value, (int, float)):
+            # bool is an int, and JSON true/false extract as 1/0, which matches
+            # Python's True == 1 semantics
+            return f"json_extract(data, {quoted_path}) = ?", [value]
+        return None
+    
+    def _json_path(self, key: str) -> Optional[str]:
+        """
+        Convert a dotted key into a SQLite JSON path.
+        
+        Args:
+            key: The dotted key.
+            
+        Returns:
+            The JSON path, or None if a key part can't be expressed.
+        """
+        parts = key.split(".")
+        if any('"' in part for part in parts):
+            return None
+        return "$" + "".join(f'."{part}"' for part in parts)
+    
+    def _quote(self, literal: str) -> str:
+        """
+        Quote a string as a SQL literal.
+        
+        Args:
+            literal: The string to quote.
+            
+        Returns:
+            The quoted literal.
+        """
+        return "'" + literal.replace("'", "''") + "'"
@@ -0,0 +1,474 @@
+"""
+Vector index module for semantic recall in the ANUS framework.
+
+Stores embeddings as rows of a contiguous float32 matrix in a flat file that
+is memory-mapped on load, so reopening an index does not read the vectors.
+"""
+
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from array import array
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+class VectorIndex:
+    """
+    A persistent cosine-similarity index over float32 vectors.
+    
+    Vectors are normalized on insert, so similarity is a plain dot product.
+    With NumPy, searches are batched matrix products over the memory-mapped
+    matrix, processed in row chunks to bound memory use. Without NumPy, a
+    pure-Python fallback scans the mapped file through a ``memoryview``.
+    
+    For large corpora an optional IVF (inverted file) partitioning can be
+    enabled with ``n_lists``: vectors are assigned to the nearest of
+    ``n_lists`` k-means centroids and a search only scores the vectors in
+    the ``n_probe`` closest partitions. IVF requires NumPy.
+    
+    Files in the index directory:
+    - ``vectors.f32``: the matrix, one row per vector
+    - ``vectors.ids``: the identifier of each row, one per line
+    - ``vectors.deleted``: row numbers of removed vectors, one per line
+    - ``centroids.f32`` and ``assignments.i32``: the IVF partitioning
+    - ``meta.json``: the vector dimension
+    
+    An index can be shared between threads.
+    """
+    
+    # Rows scored per matrix product
+    _CHUNK_ROWS = 65536
+    
+    def __init__(
+        self,
+        path: str,
+        n_lists: int = 0,
+        n_probe: int = 8,
+        train_threshold: Optional[int] = None
+    ):
+        """
+        Initialize a VectorIndex instance.
+        
+        Args:
+            path: Directory to store the index files in.
+            n_lists: Number of IVF partitions. 0 disables partitioning.
+            n_probe: Number of partitions scored per query when IVF is enabled.
+            train_threshold: Number of vectors at which the IVF partitioning is
+                trained. Defaults to 40 vectors per partition.
+        """
+        self.path = path
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_threshold = train_threshold or n_lists * 40
+        
+        if n_lists and not NUMPY_AVAILABLE:
+            logging.warning("NumPy not installed. ANUS vector index will scan all vectors instead of using IVF.")
+            self.n_lists = 0
+        
+        os.makedirs(self.path, exist_ok=True)
+        
+        self.dim: Optional[int] = None
+        self._ids: List[Optional[str]] = []  # Row -> identifier, None once removed
+        self._rows: Dict[str, int] = {}  # Identifier -> row
+        self._alive = bytearray()  # Row -> 1 if live, 0 once removed
+        self._matrix = None  # Memory map over the rows, refreshed when rows are added
+        self._mapped_rows = 0
+        self._centroids = None
+        self._assignments = array("i")
+        self._lock = threading.RLock()
+        
+        self._load()
+    
+    def __len__(self) -> int:
+        """
+        Get the number of live vectors.
+        
+        Returns:
+            The vector count.
+        """
+        return len(self._rows)
+    
+    def add(self, identifier: str, vector: Sequence[float]) -> None:
+        """
+        Add a vector, replacing any previous vector for the identifier.
+        
+        Args:
+            identifier: The identifier the vector belongs to.
+            vector: The embedding vector.
+            
+        Raises:
+            ValueError: If the vector dimension doesn't match the index.
+        """
+        normalized = self._normalize(vector)
+        
+        with self._lock:
+            if self.dim is None:
+                self.dim = len(vector)
+                self._write_meta()
+            elif len(vector) != self.dim:
+                raise ValueError(f"Vector has dimension {len(vector)}, index expects {self.dim}")
+            
+            if identifier in self._rows:
+                self.remove(identifier)
+            
+            row = len(self._ids)
+            
+            with open(self._file("vectors.f32"), "ab") as f:
+                f.write(normalized.tobytes())
+            with open(self._file("vectors.ids"), "a") as f:
+                f.write(identifier + "\n")
+            
+            self._ids.append(identifier)
+            self._rows[identifier] = row
+            self._alive.append(1)
+            
+            if self._centroids is not None:
+                assignment = int(np.argmax(self._centroids @ np.frombuffer(normalized.tobytes(), dtype=np.float32)))
+                self._assignments.append(assignment)
+                with open(self._file("assignments.i32"), "ab") as f:
+                    f.write(array("i", [assignment]).tobytes())
+    
+    def remove(self, identifier: str) -> bool:
+        """
+        Remove the vector for an identifier.
+        
+        Args:
+            identifier: The identifier to remove.
+            
+        Returns:
+            True if a vector was removed, False otherwise.
+        """
+        with self._lock:
+            row = self._rows.pop(identifier, None)
+            if row is None:
+                return False
+            
+            self._ids[row] = None
+            self._alive[row] = 0
+            with open(self._file("vectors.deleted"), "a") as f:
+                f.write(f"{row}\n")
+            return True
+    
+    def clear(self) -> None:
+        """
+        Remove all vectors and delete the index files.
+        """
+        with self._lock:
+            self._matrix = None
+            for name in ("vectors.f32", "vectors.ids", "vectors.deleted", "centroids.f32", "assignments.i32", "meta.json"):
+                if os.path.exists(self._file(name)):
+                    os.remove(self._file(name))
+            
+            self.dim = None
+            self._ids = []
+            self._rows = {}
+            self._alive = bytearray()
+            self._mapped_rows = 0
+            self._centroids = None
+            self._assignments = array("i")
+    
+    def search(self, vector: Sequence[float], k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Find the vectors most similar to a query vector.
+        
+        Args:
+            vector: The query vector.
+            k: Number of results to return.
+            
+        Returns:
+            A list of (identifier, cosine similarity) tuples, most similar first.
+        """
+        return self.search_many([vector], k)[0]
+    
+    def search_many(self, vectors: Sequence[Sequence[float]], k: int = 5) -> List[List[Tuple[str, float]]]:
+        """
+        Find the most similar vectors for a batch of query vectors at once.
+        
+        Args:
+            vectors: The query vectors.
+            k: Number of results to return per query.
+            
+        Returns:
+            One list of (identifier, cosine similarity) tuples per query.
+        """
+        if not vectors:
+            return []
+        
+        with self._lock:
+            if not self._rows or k <= 0:
+                return [[] for _ in vectors]
+            
+            for vector in vectors:
+                if len(vector) != self.dim:
+                    raise ValueError(f"Vector has dimension {len(vector)}, index expects {self.dim}")
+            
+            if NUMPY_AVAILABLE:
+                if self.n_lists and self._centroids is None and len(self._rows) >= self.train_threshold:
+                    self.train()
+                return self._search_numpy(vectors, k)
+            return [self._search_python(vector, k) for vector in vectors]
+    
+    def train(self, iterations: int = 10, sample_size: int = 50000) -> None:
+        """
+        Train the IVF partitioning with k-means over a sample of the vectors.
+        
+        Args:
+            iterations: Number of k-means iterations.
+            sample_size: Maximum number of vectors to cluster.
+        """
+        with self._lock:
+            if not self.n_lists or not self._rows:
+                return
+            
+            matrix = self._get_matrix()
+            live_rows = np.fromiter(self._rows.values(), dtype=np.int64)
+            rng = np.random.default_rng(0)
+            sample = matrix[np.sort(rng.choice(live_rows, size=min(sample_size, len(live_rows)), replace=False))]
+            n_lists = min(self.n_lists, len(sample))
+            
+            centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for j in range(n_lists):
+                    members = sample[labels == j]
+                    if len(members):
+                        centroid = members.sum(axis=0)
+                        norm = np.linalg.norm(centroid)
+                        if norm > 0:
+                            centroids[j] = centroid / norm
+            
+            # Assign every row, including removed ones, so rows and assignments line up
+            assignments = np.empty(len(self._ids), dtype=np.int32)
+            for start in range(0, len(self._ids), self._CHUNK_ROWS):
+                block = matrix[start:start + self._CHUNK_ROWS]
+                assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+            
+            self._centroids = centroids.astype(np.float32)
+            self._assignments = array("i", assignments.tobytes())
+            with open(self._file("centroids.f32"), "wb") as f:
+                f.write(self._centroids.tobytes())
+            with open(self._file("assignments.i32"), "wb") as f:
+                f.write(assignments.tobytes())
+            
+            logging.info(f"ANUS vector index partitioned {len(self._rows)} vectors into {n_lists} lists")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the index.
+        
+        Returns:
+            A dictionary containing index statistics.
+        """
+        return {
+            "vector_count": len(self._rows),
+            "dimension": self.dim,
+            "removed_rows": len(self._ids) - len(self._rows),
+            "ivf_lists": len(self._centroids) if self._centroids is not None else 0,
+            "numpy": NUMPY_AVAILABLE
+        }
+    
+    def _search_numpy(self, vectors: Sequence[Sequence[float]], k: int) -> List[List[Tuple[str, float]]]:
+        """
+        Score query vectors against the matrix in chunks, keeping a running top-k.
+        
+        Args:
+            vectors: The query vectors.
+            k: Number of results to return per query.
+            
+        Returns:
+            One list of (identifier, cosine similarity) tuples per query.
+        """
+        queries = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms > 0, norms, 1)
+        
+        matrix = self._get_matrix()
+        alive = np.frombuffer(bytes(self._alive), dtype=bool)
+        
+        if self._centroids is not None:
+            # Only score rows in the partitions closest to each query
+            probe = min(self.n_probe, len(self._centroids))
+            lists = np.argpartition(-(queries @ self._centroids.T), probe - 1, axis=1)[:, :probe]
+            assignments = np.frombuffer(self._assignments, dtype=np.int32)
+            probed = np.zeros((len(queries), len(self._centroids)), dtype=bool)
+            np.put_along_axis(probed, lists, True, axis=1)
+        
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        
+        for start in range(0, len(self._ids), self._CHUNK_ROWS):
+            block = matrix[start:start + self._CHUNK_ROWS]
+            scores = queries @ block.T
+            
+            mask = alive[start:start + len(block)][np.newaxis, :]
+            if self._centroids is not None:
+                mask = mask & probed[:, assignments[start:start + len(block)]]
+            scores = np.where(mask, scores, -np.inf).astype(np.float32)
+            
+            rows = np.broadcast_to(np.arange(start, start + len(block)), scores.shape)
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            
+            keep = min(k, scores.shape[1])
+            top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            best_scores = np.take_along_axis(scores, top, axis=1)
+            best_rows = np.take_along_axis(rows, top, axis=1)
+        
+        results = []
+        order = np.argsort(-best_scores, axis=1)
+        for scores, rows, query_order in zip(best_scores, best_rows, order):
+            results.append([
+                (self._ids[rows[i]], float(scores[i]))
+                for i in query_order
+                if np.isfinite(scores[i])
+            ])
+        return results
+    
+    def _search_python(self, vector: Sequence[float], k: int) -> List[Tuple[str, float]]:
+        """
+        Score a query vector against every row without NumPy.
+        
+        Args:
+            vector: The query vector.
+            k: Number of results to return.
+            
+        Returns:
+            A list of (identifier, cosine similarity) tuples, most similar first.
+        """
+        query = self._normalize(vector)
+        matrix = self._get_matrix()
+        dim = self.dim
+        
+        def scores():
+            for row, identifier in enumerate(self._ids):
+                if identifier is not None:
+                    offset = row * dim
+                    yield sum(a * b for a, b in zip(matrix[offset:offset + dim], query)), identifier
+        
+        return [(identifier, score) for score, identifier in heapq.nlargest(k, scores())]
+    
+    def _get_matrix(self):
+        """
+        Get a memory map over all rows, remapping the file if rows were added.
+        
+        Returns:
+            A NumPy memmap of shape (rows, dim), or a flat float ``memoryview``
+            without NumPy.
+        """
+        if self._matrix is None or self._mapped_rows != len(self._ids):
+            rows = len(self._ids)
+            if NUMPY_AVAILABLE:
+                self._matrix = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r", shape=(rows, self.dim))
+            else:
+                with open(self._file("vectors.f32"), "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._matrix = memoryview(mapped).cast("f")
+            self._mapped_rows = rows
+        return self._matrix
+    
+    def _normalize(self, vector: Sequence[float]) -> array:
+        """
+        Scale a vector to unit length.
+        
+        Args:
+            vector: The vector to normalize.
+            
+        Returns:
+            The normalized vector as a float32 array.
+        """
+        norm = math.sqrt(sum(x * x for x in vector))
+        if norm == 0:
+            return array("f", vector)
+        return array("f", (x / norm for x in vector))
+    
+    def _load(self) -> None:
+        """
+        Load the row identifiers and partitioning; the vectors themselves are mapped lazily.
+        """
+        if not os.path.exists(self._file("meta.json")):
+            return
+        
+        with open(self._file("meta.json"), "r") as f:
+            self.dim = json.load(f)["dim"]
+        
+        # An id line without its newline was cut short
+        id_data = b""
+        if os.path.exists(self._file("vectors.ids")):
+            with open(self._file("vectors.ids"), "rb") as f:
+                id_data = f.read()
+        id_lines = id_data[:id_data.rfind(b"\n") + 1].split(b"\n")[:-1]
+        ids = [line.decode("utf-8") for line in id_lines]
+        
+        # A crash can leave the two files a row apart, or a row partly written;
+        # keep the complete rows both files have and cut off the rest, so later
+        # rows are appended in step
+        vector_rows = os.path.getsize(self._file("vectors.f32")) // (4 * self.dim) if os.path.exists(self._file("vectors.f32")) else 0
+        rows = min(len(ids), vector_rows)
+        self._truncate("vectors.f32", rows * 4 * self.dim)
+        self._truncate("vectors.ids", sum(len(line) + 1 for line in id_lines[:rows]))
+        self._ids = ids[:rows]
+        
+        if os.path.exists(self._file("vectors.deleted")):
+            with open(self._file("vectors.deleted"), "rb") as f:
+                data = f.read()
+            complete = data[:data.rfind(b"\n") + 1]
+            self._truncate("vectors.deleted", len(complete))
+            for line in complete.split():
+                row = int(line)
+                if row < rows:
+                    self._ids[row] = None
+        
+        self._rows = {identifier: row for row, identifier in enumerate(self._ids) if identifier is not None}
+        self._alive = bytearray(identifier is not None for identifier in self._ids)
+        
+        if self.n_lists and os.path.exists(self._file("centroids.f32")):
+            self._centroids = np.fromfile(self._file("centroids.f32"), dtype=np.float32).reshape(-1, self.dim)
+            with open(self._file("assignments.i32"), "rb") as f:
+                data = f.read()
+            self._assignments.frombytes(data[:len(data) - len(data) % self._assignments.itemsize])
+            if len(self._assignments) != rows:
+                # Partitioning is out of step with the rows; retrain on next search
+                self._centroids = None
+                self._assignments = array("i")
+    
+    def _truncate(self, name: str, size: int) -> None:
+        """
+        Cut an index file down to a size, if it is longer.
+        
+        Args:
+            name: The file name.
+            size: The size in bytes to keep.
+        """
+        path = self._file(name)
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            logging.warning(f"Discarding {os.path.getsize(path) - size} bytes of an interrupted write to {path}")
+            with open(path, "r+b") as f:
+                f.truncate(size)
+    
+    def _write_meta(self) -> None:
+        """
+        Persist the index metadata.
+        """
+        with open(self._file("meta.json"), "w") as f:
+            json.dump({"dim": self.dim}, f)
+    
+    def _file(self, name: str) -> str:
+        """
+        Get the path of an index file.
+        
+        Args:
+            name: The file name.
+            
+        Returns:
+            The file path.
+        """
+        return os.path.join(self.path, name)
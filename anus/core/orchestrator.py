@@ -7,15 +7,19 @@ lifecycle and coordinates task execution across multiple agents.
 Behind every successful ANUS is a well-designed Orchestrator.
 """
 
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, Executor, wait, FIRST_COMPLETED
+import collections
 import logging
+import queue
+import threading
 import yaml
 import os
 import time
 import random
 
 from anus.core.agent import BaseAgent, HybridAgent
-from anus.core.memory import ShortTermMemory, LongTermMemory
+from anus.core.memory import ShortTermMemory, LongTermMemory, HistoryBuffer
 
 # Create a custom logger for ANUS-specific wisdom
 class ANUSLogger(logging.Logger):
@@ -43,6 +47,101 @@ class ANUSLogger(logging.Logger):
 logging.setLoggerClass(ANUSLogger)
 logger = logging.getLogger("anus.orchestrator")
 
+# Per-process agent used by process pool workers
+_process_agent = None
+
+def _build_agent(
+    config: Dict[str, Any],
+    name: Optional[str] = None,
+    short_term_memory: Optional[ShortTermMemory] = None,
+    long_term_memory: Optional[LongTermMemory] = None
+) -> HybridAgent:
+    """
+    Create a HybridAgent from an orchestrator configuration.
+    
+    Args:
+        config: The orchestrator configuration.
+        name: Optional name overriding the configured agent name.
+        short_term_memory: Optional short-term memory for the agent.
+        long_term_memory: Optional long-term memory for the agent.
+        
+    Returns:
+        A HybridAgent instance.
+    """
+    agent_config = config.get("agent", {})
+    
+    return HybridAgent(
+        name=name or agent_config.get("name", "anus"),
+        max_iterations=agent_config.get("max_iterations", 10),
+        tools=config.get("tools", {}).get("enabled", []),
+        mode=agent_config.get("mode", "single"),
+        complexity_threshold=agent_config.get("complexity_threshold", 7),
+        pipeline=agent_config.get("pipeline", "sequential"),
+        history_capacity=config.get("history", {}).get("agent_capacity", 1000),
+        short_term_memory=short_term_memory,
+        long_term_memory=long_term_memory
+    )
+
+def _run_task(agent: BaseAgent, task: str, mode: str) -> Dict[str, Any]:
+    """
+    Execute a task with an agent and build its task record.
+    
+    Failures are recorded in the task record rather than raised, so one bad
+    task doesn't take down a whole batch.
+    
+    Args:
+        agent: The agent to execute the task with.
+        task: The task description to execute.
+        mode: Execution mode ("single" or "multi").
+        
+    Returns:
+        The task record.
+    """
+    start_time = time.time()
+    
+    try:
+        result = agent.execute(task, mode=mode)
+        status = "completed"
+    except Exception as e:
+        logging.error(f"Error executing task '{task}': {e}")
+        result = {"task": task, "error": str(e)}
+        status = "failed"
+    
+    return {
+        "task": task,
+        "mode": mode,
+        "start_time": start_time,
+        "execution_time": time.time() - start_time,
+        "status": status,
+        "result": result
+    }
+
+def _init_process_worker(config: Dict[str, Any]) -> None:
+    """
+    Create the agent for a process pool worker.
+    
+    The agent has no long-term memory: the orchestrator's memory lives in
+    the parent process and can't be shared with the workers.
+    
+    Args:
+        config: The orchestrator configuration.
+    """
+    global _process_agent
+    _process_agent = _build_agent(config, name=f"{config.get('agent', {}).get('name', 'anus')}-{os.getpid()}")
+
+def _run_process_task(task: str, mode: str) -> Dict[str, Any]:
+    """
+    Execute a task with the agent of the current process pool worker.
+    
+    Args:
+        task: The task description to execute.
+        mode: Execution mode ("single" or "multi").
+        
+    Returns:
+        The task record.
+    """
+    return _run_task(_process_agent, task, mode)
+
 class AgentOrchestrator:
     """
     Coordinates multiple agents and manages their lifecycle.
@@ -68,7 +167,14 @@ class AgentOrchestrator:
         self.agents: Dict[str, BaseAgent] = {}
         self.primary_agent = self._create_primary_agent()
         self.last_result: Dict[str, Any] = {}
-        self.task_history: List[Dict[str, Any]] = []
+        self.task_history = self._create_task_history()
+        
+        # Idle worker agents for concurrent execution, created on demand
+        self._idle_agents: "queue.SimpleQueue[HybridAgent]" = queue.SimpleQueue()
+        self._worker_count = 0
+        self._worker_lock = threading.Lock()
+        self._history_lock = threading.Lock()
+        self._executor: Optional[Executor] = None
         
         # Easter eggs for internal task names
         self._easter_egg_tasks = {
@@ -92,26 +198,9 @@ class AgentOrchestrator:
         Returns:
             The execution result.
         """
-        # Use config default if mode not specified
-        if mode is None:
-            mode = self.config.get("agent", {}).get("mode", "single")
-        
+        mode = self._prepare_task(task, mode)
         start_time = time.time()
         
-        # Check for easter egg task names
-        display_task = task
-        for keyword, message in self._easter_egg_tasks.items():
-            if keyword.lower() in task.lower().split():
-                display_task = message
-                logger.info(f"Easter egg activated: {message}")
-                break
-        
-        # Log the task
-        if mode == "multi":
-            logger.info(f"ANUS expanding to handle multiple agents for task: {display_task}")
-        else:
-            logger.info(f"ANUS processing task: {display_task}")
-        
         # Execute the task with the primary agent
         result = self.primary_agent.execute(task, mode=mode)
         
@@ -128,19 +217,301 @@ class AgentOrchestrator:
             "result": result
         }
         
-        # Add to task history
-        self.task_history.append(task_record)
+        self._record_task(task_record)
+        return result
+    
+    def execute_task_stream(self, task: str, mode: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a task, yielding execution events as they happen.
+        
+        Events come from the primary agent's execute_stream(): "thought",
+        "action", "observation" and "token" events while the task runs, then a
+        final "result" event whose "result" is what execute_task() returns.
+        
+        Args:
+            task: The task description to execute.
+            mode: Execution mode ("single" or "multi"). If None, uses the config default.
+            
+        Returns:
+            An iterator of execution events.
+        """
+        mode = self._prepare_task(task, mode)
+        start_time = time.time()
+        
+        for event in self.primary_agent.execute_stream(task, mode=mode):
+            # Record the task before handing out the result, in case the
+            # caller stops iterating once it has it
+            if event["type"] == "result":
+                self._record_task({
+                    "task": task,
+                    "mode": mode,
+                    "start_time": start_time,
+                    "execution_time": time.time() - start_time,
+                    "status": "completed",
+                    "result": event["result"]
+                })
+            yield event
+    
+    def submit(self, task: str, mode: Optional[str] = None) -> Future:
+        """
+        Schedule a task for concurrent execution.
+        
+        Tasks run on the orchestrator's shared worker pool, configured by the
+        "execution" section of the config. Each worker uses its own agent, since
+        agents keep per-task state and can't be shared between threads.
+        
+        Thread workers get a fresh short-term memory and share the primary
+        agent's long-term memory, as execute_task does. Process workers
+        ("executor": "process") run without long-term memory, since it can't
+        be shared across processes.
+        
+        Args:
+            task: The task description to execute.
+            mode: Execution mode ("single" or "multi"). If None, uses the config default.
+            
+        Returns:
+            A Future resolving to the task record (task, mode, start_time,
+            execution_time, status and result).
+        """
+        if self._executor is None:
+            with self._worker_lock:
+                if self._executor is None:
+                    execution_config = self.config.get("execution", {})
+                    self._executor = self._create_executor(
+                        execution_config.get("max_workers", 4),
+                        execution_config.get("executor", "thread")
+                    )
+        
+        return self._submit_to(self._executor, task, mode)
+    
+    def execute_many(
+        self,
+        tasks: Iterable[str],
+        concurrency: int = 4,
+        mode: Optional[str] = None,
+        ordered: bool = True,
+        executor: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Execute many tasks concurrently.
+        
+        Tasks are pulled from the iterable lazily and at most ``2 * concurrency``
+        are in flight at a time, so large batches don't pile up in memory.
+        
+        Args:
+            tasks: The task descriptions to execute.
+            concurrency: Number of tasks to execute at the same time.
+            mode: Execution mode ("single" or "multi"). If None, uses the config default.
+            ordered: If True, yield records in task order; otherwise as they complete.
+            executor: "thread" for I/O-bound work such as model calls, "process"
+                for CPU-bound tools. If None, uses the config default. Process
+                workers run without long-term memory, see submit().
+                
+        Returns:
+            An iterator of task records, each with the "index" of its task.
+        """
+        if executor is None:
+            executor = self.config.get("execution", {}).get("executor", "thread")
+        
+        window = max(1, concurrency) * 2
+        task_iter = enumerate(tasks)
+        pending = collections.deque()
+        
+        logger.info(f"ANUS is taking on a batch of tasks, {concurrency} at a time")
+        
+        with self._create_executor(concurrency, executor) as pool:
+            def fill() -> None:
+                while len(pending) < window:
+                    try:
+                        index, task = next(task_iter)
+                    except StopIteration:
+                        return
+                    pending.append((index, self._submit_to(pool, task, mode)))
+            
+            fill()
+            while pending:
+                if ordered:
+                    index, future = pending.popleft()
+                    record = future.result()
+                    record["index"] = index
+                    yield record
+                else:
+                    done, _ = wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+                    for entry in [e for e in pending if e[1] in done]:
+                        pending.remove(entry)
+                        record = entry[1].result()
+                        record["index"] = entry[0]
+                        yield record
+                fill()
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down the worker pool used by submit().
+        
+        Args:
+            wait: Whether to wait for pending tasks to finish.
+        """
+        with self._worker_lock:
+            executor, self._executor = self._executor, None
+        
+        if executor is not None:
+            executor.shutdown(wait=wait)
+    
+    def _create_task_history(self) -> HistoryBuffer:
+        """
+        Create the task history buffer based on configuration.
+        
+        Returns:
+            A HistoryBuffer instance.
+        """
+        history_config = self.config.get("history", {})
+        capacity = history_config.get("capacity", 1000)
+        spill_path = history_config.get("spill_path")
+        
+        if spill_path:
+            logger.debug(f"ANUS will spill task history to: {spill_path}")
+        
+        return HistoryBuffer(capacity=capacity, spill_path=spill_path)
+    
+    def _prepare_task(self, task: str, mode: Optional[str]) -> str:
+        """
+        Resolve the execution mode for a task and log its start.
+        
+        Args:
+            task: The task description to execute.
+            mode: Execution mode, or None for the config default.
+            
+        Returns:
+            The resolved execution mode.
+        """
+        # Use config default if mode not specified
+        if mode is None:
+            mode = self.config.get("agent", {}).get("mode", "single")
+        
+        # Check for easter egg task names
+        display_task = task
+        for keyword, message in self._easter_egg_tasks.items():
+            if keyword.lower() in task.lower().split():
+                display_task = message
+                logger.info(f"Easter egg activated: {message}")
+                break
         
-        # Update last result
-        self.last_result = result
+        # Log the task
+        if mode == "multi":
+            logger.info(f"ANUS expanding to handle multiple agents for task: {display_task}")
+        else:
+            logger.info(f"ANUS processing task: {display_task}")
+        
+        return mode
+    
+    def _record_task(self, task_record: Dict[str, Any]) -> None:
+        """
+        Add a finished task to the history and update the last result.
+        
+        Args:
+            task_record: The task record.
+        """
+        with self._history_lock:
+            # Add to task history (bounded, so long-running services stay flat)
+            self.task_history.append(task_record)
+            
+            # Update last result
+            self.last_result = task_record["result"]
         
         # Log completion
+        execution_time = task_record["execution_time"]
         if execution_time > 10:
             logger.info(f"ANUS finished after {execution_time:.2f}s - that was quite a workout!")
         else:
             logger.info(f"ANUS completed task in {execution_time:.2f}s")
+    
+    def _create_executor(self, max_workers: int, kind: str) -> Executor:
+        """
+        Create a worker pool.
         
-        return result
+        Args:
+            max_workers: Maximum number of workers.
+            kind: "thread" or "process".
+            
+        Returns:
+            The executor.
+        """
+        max_workers = max(1, max_workers)
+        
+        if kind == "process":
+            return ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_process_worker,
+                initargs=(self.config,)
+            )
+        if kind != "thread":
+            logger.warning(f"Unknown executor '{kind}'. ANUS falls back to a thread pool.")
+        
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="anus-worker")
+    
+    def _submit_to(self, executor: Executor, task: str, mode: Optional[str]) -> Future:
+        """
+        Submit a task to a worker pool and record it in the history when done.
+        
+        Args:
+            executor: The worker pool.
+            task: The task description to execute.
+            mode: Execution mode, or None for the config default.
+            
+        Returns:
+            A Future resolving to the task record.
+        """
+        mode = self._prepare_task(task, mode)
+        
+        if isinstance(executor, ProcessPoolExecutor):
+            future = executor.submit(_run_process_task, task, mode)
+        else:
+            future = executor.submit(self._run_pooled_task, task, mode)
+        
+        future.add_done_callback(self._on_task_done)
+        return future
+    
+    def _run_pooled_task(self, task: str, mode: str) -> Dict[str, Any]:
+        """
+        Execute a task on a worker thread with an agent checked out of the pool.
+        
+        Args:
+            task: The task description to execute.
+            mode: Execution mode.
+            
+        Returns:
+            The task record.
+        """
+        try:
+            agent = self._idle_agents.get_nowait()
+        except queue.Empty:
+            with self._worker_lock:
+                self._worker_count += 1
+                worker_name = f"{self.primary_agent.name}-worker-{self._worker_count}"
+            agent = _build_agent(
+                self.config,
+                name=worker_name,
+                short_term_memory=self._create_short_term_memory(),
+                long_term_memory=self.long_term_memory
+            )
+            logger.debug(f"ANUS created worker agent {worker_name}")
+        
+        try:
+            return _run_task(agent, task, mode)
+        finally:
+            self._idle_agents.put(agent)
+    
+    def _on_task_done(self, future: Future) -> None:
+        """
+        Record the task of a finished Future in the history.
+        
+        Args:
+            future: The finished Future.
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+        
+        self._record_task(future.result())
     
     def list_agents(self) -> List[Dict[str, Any]]:
         """
@@ -187,7 +558,19 @@ class AgentOrchestrator:
         if limit > 50:
             logger.warning(f"Requesting {limit} history items? That's a deep dive into ANUS history!")
         
-        return self.task_history[-limit:]
+        return self.task_history.recent(limit)
+    
+    def iter_task_history(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the history of executed tasks, oldest first.
+        
+        With a history spill file configured this includes tasks already
+        evicted from the in-memory history, read back one record at a time.
+        
+        Returns:
+            An iterator of task history records.
+        """
+        return self.task_history.iter_all()
     
     def get_last_result(self) -> Dict[str, Any]:
         """
@@ -214,17 +597,21 @@ class AgentOrchestrator:
                 "name": "anus",
                 "mode": "single",
                 "max_iterations": 10,
-                "complexity_threshold": 7
+                "complexity_threshold": 7,
+                "pipeline": "sequential"
             },
             "memory": {
                 "short_term": {
                     "capacity": 1000,
-                    "ttl": 3600
+                    "ttl": 3600,
+                    "indexed_fields": []
                 },
                 "long_term": {
                     "enabled": True,
                     "storage_path": None,
-                    "index_in_memory": True
+                    "index_in_memory": None,  # Automatic: off for backends that search themselves
+                    "backend": "file",
+                    "backend_options": {}
                 }
             },
             "models": {
@@ -236,6 +623,15 @@ class AgentOrchestrator:
             },
             "tools": {
                 "enabled": []
+            },
+            "execution": {
+                "executor": "thread",
+                "max_workers": 4
+            },
+            "history": {
+                "capacity": 1000,
+                "agent_capacity": 1000,
+                "spill_path": None
             }
         }
         
@@ -295,8 +691,6 @@ class AgentOrchestrator:
         agent_config = self.config.get("agent", {})
         name = agent_config.get("name", "anus")
         mode = agent_config.get("mode", "single")
-        max_iterations = agent_config.get("max_iterations", 10)
-        complexity_threshold = agent_config.get("complexity_threshold", 7)
         
         # Get tools config
         tools_config = self.config.get("tools", {})
@@ -304,17 +698,15 @@ class AgentOrchestrator:
         
         # Create memories
         short_term_memory = self._create_short_term_memory()
-        long_term_memory = self._create_long_term_memory()
+        
+        # Kept on the orchestrator, so worker agents share it
+        self.long_term_memory = self._create_long_term_memory()
         
         # Create the agent
-        agent = HybridAgent(
-            name=name,
-            max_iterations=max_iterations,
-            tools=enabled_tools,
-            mode=mode,
-            complexity_threshold=complexity_threshold,
+        agent = _build_agent(
+            self.config,
             short_term_memory=short_term_memory,
-            long_term_memory=long_term_memory
+            long_term_memory=self.long_term_memory
         )
         
         logger.info(f"Primary agent created. ANUS is ready with {len(enabled_tools)} tools available")
@@ -338,9 +730,10 @@ class AgentOrchestrator:
         memory_config = self.config.get("memory", {}).get("short_term", {})
         capacity = memory_config.get("capacity", 1000)
         ttl = memory_config.get("ttl", 3600)
+        indexed_fields = memory_config.get("indexed_fields", [])
         
         logger.debug(f"Initializing ANUS short-term memory with capacity {capacity}")
-        return ShortTermMemory(capacity=capacity, ttl=ttl)
+        return ShortTermMemory(capacity=capacity, ttl=ttl, indexed_fields=indexed_fields)
     
     def _create_long_term_memory(self) -> Optional[LongTermMemory]:
         """
@@ -357,14 +750,22 @@ class AgentOrchestrator:
             return None
         
         storage_path = memory_config.get("storage_path")
-        index_in_memory = memory_config.get("index_in_memory", True)
+        index_in_memory = memory_config.get("index_in_memory")
+        backend = memory_config.get("backend", "file")
+        backend_options = memory_config.get("backend_options", {})
         
         if storage_path:
             logger.debug(f"ANUS will store long-term memories at: {storage_path}")
         else:
             logger.debug("ANUS will store long-term memories in the default location")
         
-        return LongTermMemory(storage_path=storage_path, index_in_memory=index_in_memory)
+        logger.debug(f"ANUS long-term memory is using the '{backend}' storage backend")
+        return LongTermMemory(
+            storage_path=storage_path,
+            index_in_memory=index_in_memory,
+            backend=backend,
+            backend_options=backend_options
+        )
     
     def _create_specialized_agents(self, primary_agent: HybridAgent) -> None:
         """
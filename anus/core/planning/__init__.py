@@ -4,9 +4,11 @@ Planning module for the ANUS framework.
 This module contains classes for task planning:
 - BasePlanner: Abstract base class for planners
 - TaskPlanner: LLM-based task planning implementation
+- PlanExecutor: Parallel execution of a plan's steps along their dependencies
 """
 
 from anus.core.planning.base_planner import BasePlanner
 from anus.core.planning.task_planner import TaskPlanner
+from anus.core.planning.plan_executor import PlanExecutor, PlanGraph, PlanCycleError
 
-__all__ = ["BasePlanner", "TaskPlanner"] 
\ No newline at end of file
+__all__ = ["BasePlanner", "TaskPlanner", "PlanExecutor", "PlanGraph", "PlanCycleError"] 
\ No newline at end of file
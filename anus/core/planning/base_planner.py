@@ -3,7 +3,7 @@ Base Planner module that defines the common interface for task planning.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 
 class BasePlanner(ABC):
     """
@@ -63,7 +63,14 @@ class BasePlanner(ABC):
         pass
     
     @abstractmethod
-    def mark_step_complete(self, plan: Dict[str, Any], step_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    def mark_step_complete(
+        self,
+        plan: Dict[str, Any],
+        step_id: str,
+        result: Dict[str, Any],
+        copy: bool = True,
+        completed_ids: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
         """
         Mark a step as complete in a plan.
         
@@ -71,7 +78,10 @@ class BasePlanner(ABC):
             plan: The current plan.
             step_id: The ID of the completed step.
             result: The result of the step execution.
-            
+            copy: If False, update the plan in place instead of returning a copy.
+            completed_ids: Optional set of the IDs of the plan's completed steps,
+                kept by a caller completing many steps; the step is added to it.
+                
         Returns:
             The updated plan.
         """
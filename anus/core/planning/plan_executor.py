@@ -0,0 +1,277 @@
+"""
+Plan Executor module for running the steps of a plan in parallel.
+
+Steps whose dependencies are all complete are dispatched together, so
+independent branches of a plan don't wait on each other.
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Set
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+import collections
+import heapq
+import logging
+import time
+
+from anus.core.planning.base_planner import BasePlanner
+from anus.tools.base.tool_collection import ToolCollection
+
+class PlanCycleError(ValueError):
+    """Raised when the dependencies of a plan's steps form a cycle."""
+    
+    def __init__(self, step_ids: List[str]):
+        """
+        Initialize a PlanCycleError instance.
+        
+        Args:
+            step_ids: The IDs of the steps on or behind the cycle.
+        """
+        super().__init__(f"Plan steps have cyclic dependencies: {', '.join(step_ids)}")
+        self.step_ids = step_ids
+
+class PlanGraph:
+    """
+    The dependency graph of a plan's steps.
+    
+    Keeps the number of unfinished dependencies of every step, so completing
+    a step only touches its dependents and the ready set is updated
+    incrementally instead of rescanning the plan.
+    """
+    
+    def __init__(self, steps: Iterable[Dict[str, Any]], completed_ids: Iterable[str] = ()):
+        """
+        Initialize a PlanGraph instance.
+        
+        Args:
+            steps: The plan's steps.
+            completed_ids: IDs of steps that are already complete.
+            
+        Raises:
+            ValueError: If a step ID is duplicated or a dependency is unknown.
+            PlanCycleError: If the dependencies form a cycle.
+        """
+        completed = set(completed_ids)
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        for step in steps:
+            step_id = step.get("id")
+            if step_id in self.steps:
+                raise ValueError(f"Duplicate step ID in plan: {step_id}")
+            if step_id not in completed:
+                self.steps[step_id] = step
+        
+        self.dependents: Dict[str, List[str]] = {step_id: [] for step_id in self.steps}
+        self.waiting_on: Dict[str, int] = {}
+        for step_id, step in self.steps.items():
+            pending = set(step.get("dependencies") or ()) - completed
+            unknown = pending - self.steps.keys()
+            if unknown:
+                raise ValueError(f"Step {step_id} depends on unknown steps: {', '.join(sorted(unknown))}")
+            
+            self.waiting_on[step_id] = len(pending)
+            for dep_id in pending:
+                self.dependents[dep_id].append(step_id)
+        
+        self.order = self._topological_order()
+        self.ready: Set[str] = {step_id for step_id, count in self.waiting_on.items() if count == 0}
+    
+    def complete(self, step_id: str) -> List[str]:
+        """
+        Mark a step as complete.
+        
+        Args:
+            step_id: The ID of the completed step.
+            
+        Returns:
+            The IDs of the steps that became ready.
+        """
+        self.ready.discard(step_id)
+        
+        newly_ready = []
+        for dependent in self.dependents.get(step_id, ()):
+            self.waiting_on[dependent] -= 1
+            if self.waiting_on[dependent] == 0:
+                newly_ready.append(dependent)
+        
+        self.ready.update(newly_ready)
+        return newly_ready
+    
+    def descendants(self, step_id: str) -> List[str]:
+        """
+        Get every step that depends on a step, directly or transitively.
+        
+        Args:
+            step_id: The step ID.
+            
+        Returns:
+            The dependent step IDs.
+        """
+        found: Set[str] = set()
+        stack = list(self.dependents.get(step_id, ()))
+        while stack:
+            dependent = stack.pop()
+            if dependent not in found:
+                found.add(dependent)
+                stack.extend(self.dependents[dependent])
+        return [s for s in self.order if s in found]
+    
+    def _topological_order(self) -> List[str]:
+        """
+        Sort the steps so every step comes after its dependencies (Kahn's algorithm).
+        
+        Returns:
+            The step IDs in dependency order.
+            
+        Raises:
+            PlanCycleError: If the dependencies form a cycle.
+        """
+        waiting_on = dict(self.waiting_on)
+        queue = collections.deque(step_id for step_id, count in waiting_on.items() if count == 0)
+        order = []
+        
+        while queue:
+            step_id = queue.popleft()
+            order.append(step_id)
+            for dependent in self.dependents[step_id]:
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] == 0:
+                    queue.append(dependent)
+        
+        if len(order) < len(self.steps):
+            raise PlanCycleError([step_id for step_id, count in waiting_on.items() if count > 0])
+        return order
+
+class PlanExecutor:
+    """
+    Executes a plan by dispatching every ready step to its tool concurrently.
+    
+    Completed steps are recorded through the planner's mark_step_complete,
+    updating the plan in place. When a step fails, the steps that depend on
+    it are skipped while independent branches carry on.
+    """
+    
+    def __init__(self, tools: ToolCollection, planner: Optional[BasePlanner] = None, max_parallel: int = 4):
+        """
+        Initialize a PlanExecutor instance.
+        
+        Args:
+            tools: The tools to execute steps with.
+            planner: The planner that records completed steps. If None, the
+                executor records them itself.
+            max_parallel: Maximum number of steps executing at the same time.
+        """
+        self.tools = tools
+        self.planner = planner
+        self.max_parallel = max(1, max_parallel)
+    
+    def execute(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute the remaining steps of a plan.
+        
+        Args:
+            plan: The plan, as created by a planner.
+            
+        Returns:
+            The plan, updated in place with completed, failed and skipped steps.
+            
+        Raises:
+            ValueError: If the plan's dependencies are invalid.
+            PlanCycleError: If the plan's dependencies form a cycle.
+        """
+        plan.setdefault("completed_steps", [])
+        completed_ids = {step.get("id") for step in plan["completed_steps"]}
+        graph = PlanGraph(plan.get("steps", []), completed_ids)
+        
+        # Ready steps are dispatched in plan order
+        position = {step.get("id"): i for i, step in enumerate(plan.get("steps", []))}
+        ready = [(position[step_id], step_id) for step_id in graph.ready]
+        heapq.heapify(ready)
+        running: Dict[Future, str] = {}
+        failed: List[str] = []
+        skipped: Set[str] = set()
+        
+        logging.info(f"ANUS is working through {len(graph.steps)} plan steps, up to {self.max_parallel} at a time")
+        
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="anus-plan") as pool:
+            while ready or running:
+                while ready and len(running) < self.max_parallel:
+                    _, step_id = heapq.heappop(ready)
+                    running[pool.submit(self._execute_step, graph.steps[step_id])] = step_id
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step_id = running.pop(future)
+                    result = future.result()
+                    
+                    if result.get("status") == "error":
+                        logging.warning(f"Plan step {step_id} failed: {result.get('error')}")
+                        failed.append(step_id)
+                        graph.steps[step_id]["error"] = result.get("error")
+                        skipped.update(graph.descendants(step_id))
+                        continue
+                    
+                    self._record_completion(plan, graph.steps[step_id], result, completed_ids)
+                    for ready_id in graph.complete(step_id):
+                        if ready_id not in skipped:
+                            heapq.heappush(ready, (position[ready_id], ready_id))
+        
+        if failed:
+            plan["status"] = "failed"
+            plan["failed_steps"] = failed
+            plan["skipped_steps"] = [s for s in graph.order if s in skipped]
+            plan["error"] = f"{len(failed)} step(s) failed, {len(skipped)} dependent step(s) skipped"
+        elif not graph.steps:
+            plan["status"] = "completed"
+        
+        return plan
+    
+    def _execute_step(self, step: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute one step with its tool.
+        
+        Args:
+            step: The plan step.
+            
+        Returns:
+            The tool collection's result dictionary, with an error status if
+            the tool itself reported an error.
+        """
+        start = time.time()
+        try:
+            result = self.tools.execute_tool(step.get("tool", ""), **(step.get("tool_input") or {}))
+        except Exception as e:
+            result = {"status": "error", "error": f"Error executing step {step.get('id')}: {e}"}
+        
+        tool_result = result.get("result")
+        if isinstance(tool_result, dict) and tool_result.get("status") == "error":
+            result = {"status": "error", "error": tool_result.get("error"), "result": tool_result}
+        
+        result["duration"] = time.time() - start
+        return result
+    
+    def _record_completion(
+        self,
+        plan: Dict[str, Any],
+        step: Dict[str, Any],
+        result: Dict[str, Any],
+        completed_ids: Set[str]
+    ) -> None:
+        """
+        Record a completed step in the plan.
+        
+        Args:
+            plan: The plan, updated in place.
+            step: The completed step.
+            result: The step's result.
+            completed_ids: IDs of the plan's completed steps, updated with the step.
+        """
+        if self.planner is not None:
+            self.planner.mark_step_complete(plan, step.get("id"), result, copy=False, completed_ids=completed_ids)
+            return
+        
+        completed_ids.add(step.get("id"))
+        completed_step = step.copy()
+        completed_step["result"] = result
+        completed_step["completed_at"] = time.time()
+        plan["completed_steps"].append(completed_step)
+        if len(plan["completed_steps"]) >= len(plan["steps"]):
+            plan["status"] = "completed"
+            plan["completed_at"] = time.time()
@@ -6,7 +6,7 @@ import uuid
 import time
 import json
 import logging
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Set
 
 from anus.core.planning.base_planner import BasePlanner
 from anus.models.base.base_model import BaseModel
@@ -43,9 +43,6 @@ class TaskPlanner(BasePlanner):
         """
         context = context or {}
         
-        # Prepare the planning prompt
-        prompt = self._create_planning_prompt(task, context)
-        
         # Extract JSON schema for the plan
         plan_schema = {
             "type": "object",
@@ -77,6 +74,9 @@ class TaskPlanner(BasePlanner):
         
         # Generate the plan using the model
         try:
+            # Prepare the planning prompt; it may not fit the model's context window
+            prompt = self._create_planning_prompt(task, context)
+            
             plan_data = self.model.extract_json(
                 prompt=prompt,
                 schema=plan_schema,
@@ -85,7 +85,7 @@ class TaskPlanner(BasePlanner):
             
             # Process the plan data
             return self._process_plan_data(task, plan_data)
-            
+        
         except Exception as e:
             logging.error(f"Error creating plan: {e}")
             # Return a minimal plan
@@ -118,9 +118,6 @@ class TaskPlanner(BasePlanner):
         completed_steps = plan.get("completed_steps", [])
         remaining_steps = self._get_remaining_steps(plan)
         
-        # Prepare the replanning prompt
-        prompt = self._create_replanning_prompt(task, plan, feedback)
-        
         # Extract JSON schema for the updated plan
         plan_schema = {
             "type": "object",
@@ -150,6 +147,9 @@ class TaskPlanner(BasePlanner):
         }
         
         try:
+            # Prepare the replanning prompt; it may not fit the model's context window
+            prompt = self._create_replanning_prompt(task, plan, feedback)
+            
             # Generate the updated plan
             updated_plan_data = self.model.extract_json(
                 prompt=prompt,
@@ -176,7 +176,7 @@ class TaskPlanner(BasePlanner):
             updated_plan["metadata"]["feedback"] = feedback
             
             return updated_plan
-            
+        
         except Exception as e:
             logging.error(f"Error replanning: {e}")
             # Return the original plan with an error flag
@@ -206,7 +206,7 @@ class TaskPlanner(BasePlanner):
         
         # Check dependencies
         if "dependencies" in next_step and next_step["dependencies"]:
-            completed_step_ids = [step.get("id") for step in plan.get("completed_steps", [])]
+            completed_step_ids = {step.get("id") for step in plan.get("completed_steps", [])}
             
             # Check if all dependencies are satisfied
             for dep_id in next_step["dependencies"]:
@@ -222,7 +222,14 @@ class TaskPlanner(BasePlanner):
         
         return next_step
     
-    def mark_step_complete(self, plan: Dict[str, Any], step_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    def mark_step_complete(
+        self,
+        plan: Dict[str, Any],
+        step_id: str,
+        result: Dict[str, Any],
+        copy: bool = True,
+        completed_ids: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
         """
         Mark a step as complete in a plan.
         
@@ -230,20 +237,26 @@ class TaskPlanner(BasePlanner):
             plan: The current plan.
             step_id: The ID of the completed step.
             result: The result of the step execution.
-            
+            copy: If False, update the plan in place instead of returning a copy.
+            completed_ids: Optional set of the IDs of the plan's completed steps,
+                kept by a caller completing many steps; the step is added to it.
+                
         Returns:
             The updated plan.
         """
-        updated_plan = plan.copy()
+        updated_plan = plan.copy() if copy else plan
         steps = updated_plan.get("steps", [])
         current_index = updated_plan.get("current_step_index", 0)
         
-        # Find the step
+        # Find the step, usually the current one
         step_index = -1
-        for i, step in enumerate(steps):
-            if step.get("id") == step_id:
-                step_index = i
-                break
+        if current_index < len(steps) and steps[current_index].get("id") == step_id:
+            step_index = current_index
+        else:
+            for i, step in enumerate(steps):
+                if step.get("id") == step_id:
+                    step_index = i
+                    break
         
         if step_index == -1:
             logging.warning(f"Step {step_id} not found in plan")
@@ -258,10 +271,18 @@ class TaskPlanner(BasePlanner):
         if "completed_steps" not in updated_plan:
             updated_plan["completed_steps"] = []
         updated_plan["completed_steps"].append(completed_step)
+        if completed_ids is not None:
+            completed_ids.add(step_id)
         
-        # Update current step index
+        # Update current step index, skipping steps that completed out of order
         if step_index == current_index:
-            updated_plan["current_step_index"] = current_index + 1
+            current_index += 1
+            if current_index < len(steps) and len(updated_plan["completed_steps"]) > current_index:
+                if completed_ids is None:
+                    completed_ids = {step.get("id") for step in updated_plan["completed_steps"]}
+                while current_index < len(steps) and steps[current_index].get("id") in completed_ids:
+                    current_index += 1
+            updated_plan["current_step_index"] = current_index
         
         # Check if plan is complete
         if updated_plan["current_step_index"] >= len(steps):
@@ -281,22 +302,21 @@ class TaskPlanner(BasePlanner):
         Returns:
             A prompt string.
         """
-        prompt = f"""
-Task: {task}
-
-I need a detailed plan to accomplish this task. Please break it down into specific steps.
+        instructions = """I need a detailed plan to accomplish this task. Please break it down into specific steps.
 
 For each step, include:
 1. A clear name and description
 2. The tool required (e.g., web_search, file_read, code_execution)
 3. The expected input for the tool
-4. Any dependencies on previous steps
-
-Context information:
-{json.dumps(context, indent=2)}
-
-Please provide a structured plan with no more than {self.max_steps} steps.
-"""
+4. Any dependencies on previous steps"""
+        
+        # The context is trimmed first if the prompt doesn't fit the model
+        prompt = self.model.fit_prompt([
+            {"text": f"\nTask: {task}", "priority": 2, "min_tokens": 256},
+            {"text": instructions, "trim": False},
+            {"text": f"Context information:\n{json.dumps(context, indent=2)}"},
+            {"text": f"Please provide a structured plan with no more than {self.max_steps} steps.\n", "trim": False}
+        ])
         return prompt
     
     def _create_replanning_prompt(self, task: str, plan: Dict[str, Any], feedback: Dict[str, Any]) -> str:
@@ -327,22 +347,18 @@ Please provide a structured plan with no more than {self.max_steps} steps.
         for i, step in enumerate(remaining_steps):
             remaining_steps_text += f"{i+1}. {step.get('name', 'Step')}: {step.get('description', 'No description')}\n"
         
-        prompt = f"""
-Task: {task}
-
-I need to revise my plan based on execution feedback. 
-
-Completed steps:
-{completed_steps_text}
-
-Current feedback:
-{json.dumps(feedback, indent=2)}
-
-Current remaining steps:
-{remaining_steps_text}
-
-Please provide an updated plan for the remaining steps, considering the feedback and results from completed steps.
-"""
+        # Older completed steps are trimmed first if the prompt doesn't fit the model
+        prompt = self.model.fit_prompt([
+            {"text": f"\nTask: {task}", "priority": 2, "min_tokens": 256},
+            {"text": "I need to revise my plan based on execution feedback. ", "trim": False},
+            {"text": f"Completed steps:\n{completed_steps_text}", "keep": "tail"},
+            {"text": f"Current feedback:\n{json.dumps(feedback, indent=2)}", "priority": 1},
+            {"text": f"Current remaining steps:\n{remaining_steps_text}", "priority": 1},
+            {
+                "text": "Please provide an updated plan for the remaining steps, considering the feedback and results from completed steps.\n",
+                "trim": False
+            }
+        ])
         return prompt
     
     def _process_plan_data(self, task: str, plan_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -416,21 +432,15 @@ Please provide an updated plan for the remaining steps, considering the feedback
         """
         steps = plan.get("steps", [])
         current_index = plan.get("current_step_index", 0)
-        completed_step_ids = [step.get("id") for step in plan.get("completed_steps", [])]
+        completed_step_ids = {step.get("id") for step in plan.get("completed_steps", [])}
         
         # Look for steps after the current index
         for i in range(current_index, len(steps)):
             step = steps[i]
             dependencies = step.get("dependencies", [])
             
-            # Check if all dependencies are satisfied
-            dependencies_satisfied = True
-            for dep_id in dependencies:
-                if dep_id not in completed_step_ids:
-                    dependencies_satisfied = False
-                    break
-            
-            if dependencies_satisfied:
+            # Check if all dependencies are satisfied (and the step isn't done already)
+            if step.get("id") not in completed_step_ids and completed_step_ids.issuperset(dependencies):
                 return step
         
         return None 
\ No newline at end of file
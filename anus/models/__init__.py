@@ -4,11 +4,34 @@ Models module for the ANUS framework.
 This module contains language model implementations and utilities:
 - BaseModel: Abstract base class for all language models
 - OpenAIModel: Implementation for the OpenAI API
+- AsyncOpenAIModel: Implementation for the OpenAI API on the async client
 - ModelRouter: Dynamic model selection based on task requirements
+- RoutingEngine, RoutedModel: Latency- and cost-aware routing with failover
+- CachedModel: Response-caching wrapper for any model
+- CoalescingModel, SingleFlight: Share one call between identical in-flight requests
+- ResponseCache: Two-tier (memory and disk) response cache
+- EmbeddingStore: Persistent, content-addressed embedding store
+- BPETokenizer, ApproximateTokenizer: Token counting for prompts
+- PromptBudget: Fits prompt sections into a token budget
+- RateLimiter: Client-side requests- and tokens-per-minute limiter
 """
 
 from anus.models.base import BaseModel
 from anus.models.openai_model import OpenAIModel
+from anus.models.async_openai_model import AsyncOpenAIModel
 from anus.models.model_router import ModelRouter
+from anus.models.routing import RoutingEngine, RoutedModel
+from anus.models.cached_model import CachedModel
+from anus.models.coalescing_model import CoalescingModel
+from anus.models.single_flight import SingleFlight
+from anus.models.response_cache import ResponseCache
+from anus.models.embedding_store import EmbeddingStore
+from anus.models.rate_limiter import RateLimiter
+from anus.models.tokenizer import BaseTokenizer, BPETokenizer, ApproximateTokenizer
+from anus.models.prompt_budget import PromptBudget, PromptBudgetError
 
-__all__ = ["BaseModel", "OpenAIModel", "ModelRouter"] 
\ No newline at end of file
+__all__ = [
+    "BaseModel", "OpenAIModel", "AsyncOpenAIModel", "ModelRouter", "RoutingEngine", "RoutedModel",
+    "CachedModel", "CoalescingModel", "SingleFlight", "ResponseCache", "EmbeddingStore", "RateLimiter",
+    "BaseTokenizer", "BPETokenizer", "ApproximateTokenizer", "PromptBudget", "PromptBudgetError"
+] 
\ No newline at end of file
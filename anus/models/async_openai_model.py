@@ -0,0 +1,377 @@
+"""
+Async OpenAI Model implementation for the ANUS framework.
+
+Hundreds of requests can be in flight from one event loop, without a thread
+per request.
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Tuple, AsyncIterator
+import asyncio
+import logging
+import threading
+import weakref
+
+try:
+    from openai import AsyncOpenAI
+    ASYNC_OPENAI_AVAILABLE = True
+except ImportError:
+    ASYNC_OPENAI_AVAILABLE = False
+
+from anus.models.openai_model import OpenAIModel
+
+class AsyncOpenAIModel(OpenAIModel):
+    """
+    OpenAI language model implementation on the async client.
+    
+    The async methods (agenerate, agenerate_stream, agenerate_with_tools,
+    aextract_json, aget_embedding and aget_embeddings) await the API directly,
+    with the same retries and rate limits as the synchronous methods, which
+    keep working as well.
+    
+    Async clients hold connections bound to the event loop they were used
+    on, so they are shared per event loop rather than globally.
+    """
+    
+    # Shared async clients per event loop, dropped with their loop
+    _async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Any, ...], Any]]" = weakref.WeakKeyDictionary()
+    _async_pool_lock = threading.Lock()
+    
+    # Maximum number of embedding requests in flight per aget_embeddings call
+    _MAX_CONCURRENT_EMBEDDING_REQUESTS = 8
+    
+    def __init__(self, model_name: str = "gpt-4", **kwargs):
+        """
+        Initialize an AsyncOpenAIModel instance.
+        
+        Args:
+            model_name: The name of the OpenAI model to use.
+            **kwargs: The options of OpenAIModel.
+        """
+        if not ASYNC_OPENAI_AVAILABLE:
+            logging.error("OpenAI package not installed. Please install it with 'pip install openai'.")
+            raise ImportError("OpenAI package not installed")
+        
+        super().__init__(model_name, **kwargs)
+    
+    @property
+    def async_client(self) -> Any:
+        """
+        The shared async client for this model's endpoint on the running event loop.
+        
+        Returns:
+            An AsyncOpenAI client.
+        """
+        loop = asyncio.get_running_loop()
+        key = (self.api_key, self.base_url, self.timeout)
+        
+        with self._async_pool_lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(key)
+            if client is None:
+                client_kwargs = {"api_key": self.api_key, "base_url": self.base_url, "max_retries": 0}
+                if self.timeout is not None:
+                    client_kwargs["timeout"] = self.timeout
+                client = AsyncOpenAI(**client_kwargs)
+                clients[key] = client
+            return client
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Asynchronously generate text based on a prompt using OpenAI.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for the model.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        messages = self._build_messages(prompt, system_message)
+        temp, tokens = self._resolve_parameters(temperature, max_tokens)
+        
+        try:
+            response = await self._arequest(
+                self.async_client.chat.completions.create,
+                self._estimate_tokens(messages, tokens),
+                model=self.model_name,
+                messages=messages,
+                temperature=temp,
+                max_tokens=tokens,
+                **kwargs
+            )
+            
+            return response.choices[0].message.content
+        
+        except Exception as e:
+            logging.error(f"Error generating with OpenAI: {e}")
+            return f"Error: {str(e)}"
+    
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronously generate text based on a prompt using OpenAI, yielding chunks as they arrive.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for the model.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            An async iterator of text chunks.
+        """
+        messages = self._build_messages(prompt, system_message)
+        temp, tokens = self._resolve_parameters(temperature, max_tokens)
+        
+        try:
+            # Only the request itself is retried, as in generate_stream()
+            stream = await self._arequest(
+                self.async_client.chat.completions.create,
+                self._estimate_tokens(messages, tokens),
+                model=self.model_name,
+                messages=messages,
+                temperature=temp,
+                max_tokens=tokens,
+                stream=True,
+                **kwargs
+            )
+            
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        
+        except Exception as e:
+            logging.error(f"Error streaming with OpenAI: {e}")
+            yield f"Error: {str(e)}"
+    
+    async def agenerate_with_tools(
+        self,
+        prompt: str,
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously generate text with tool calling capabilities.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for the model.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        messages = self._build_messages(prompt, system_message)
+        temp, tokens = self._resolve_parameters(temperature, max_tokens)
+        
+        try:
+            response = await self._arequest(
+                self.async_client.chat.completions.create,
+                self._estimate_tokens(messages, tokens),
+                model=self.model_name,
+                messages=messages,
+                temperature=temp,
+                max_tokens=tokens,
+                tools=self._convert_tools(tools),
+                **kwargs
+            )
+            
+            return self._parse_tool_response(response)
+        
+        except Exception as e:
+            logging.error(f"Error generating with tools using OpenAI: {e}")
+            return {
+                "content": f"Error: {str(e)}",
+                "tool_calls": []
+            }
+    
+    async def aextract_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured JSON data based on a prompt.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for the model.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        messages = self._build_json_messages(prompt, schema, system_message)
+        temp, tokens = self._resolve_parameters(temperature, max_tokens)
+        
+        try:
+            response = await self._arequest(
+                self.async_client.chat.completions.create,
+                self._estimate_tokens(messages, tokens),
+                model=self.model_name,
+                messages=messages,
+                temperature=temp,
+                max_tokens=tokens,
+                response_format={"type": "json_object"},
+                **kwargs
+            )
+            
+            return self._parse_json_response(response)
+        
+        except Exception as e:
+            logging.error(f"Error extracting JSON with OpenAI: {e}")
+            return {"error": str(e)}
+    
+    async def aget_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Asynchronously generate an embedding vector for the given text.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        try:
+            response = await self._arequest(
+                self.async_client.embeddings.create,
+                self.get_token_count(text),
+                model=self.embedding_model,
+                input=text,
+                **kwargs
+            )
+            
+            return response.data[0].embedding
+        
+        except Exception as e:
+            logging.error(f"Error generating embedding with OpenAI: {e}")
+            return []
+    
+    async def aget_embeddings(self, texts: List[str], batch_size: Optional[int] = None, **kwargs) -> List[List[float]]:
+        """
+        Asynchronously generate embedding vectors for many texts.
+        
+        The texts are packed into batches as in get_embeddings(), and the
+        batch requests run concurrently.
+        
+        Args:
+            texts: The texts to embed.
+            batch_size: Maximum number of texts per request, or None for the API limit.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            The embedding vectors in text order, with an empty list for any
+            text that couldn't be embedded.
+        """
+        semaphore = asyncio.Semaphore(self._MAX_CONCURRENT_EMBEDDING_REQUESTS)
+        
+        async def embed(batch: List[str], batch_tokens: int) -> Dict[str, List[float]]:
+            async with semaphore:
+                return await self._aembed_batch(batch, batch_tokens, **kwargs)
+        
+        embeddings: Dict[str, List[float]] = {}
+        for result in await asyncio.gather(*(embed(*batch) for batch in self._pack_embedding_batches(texts, batch_size))):
+            embeddings.update(result)
+        
+        return [embeddings.get(text, []) for text in texts]
+    
+    async def _aembed_batch(self, batch: List[str], estimated_tokens: int, **kwargs) -> Dict[str, List[float]]:
+        """
+        Embed one batch of texts in a single request.
+        
+        Args:
+            batch: The texts to embed.
+            estimated_tokens: Estimated tokens of the batch for the rate limiter.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            The embedding of each text, or an empty dictionary if the request failed.
+        """
+        try:
+            response = await self._arequest(
+                self.async_client.embeddings.create,
+                estimated_tokens,
+                model=self.embedding_model,
+                input=batch,
+                **kwargs
+            )
+            return {batch[item.index]: item.embedding for item in response.data}
+        
+        except Exception as e:
+            logging.error(f"Error generating {len(batch)} embeddings with OpenAI: {e}")
+            return {}
+    
+    async def _arequest(self, create: Callable[..., Any], estimated_tokens: int, **params) -> Any:
+        """
+        Await an API call under the rate limiter, retrying transient failures.
+        
+        Args:
+            create: The async client method to call.
+            estimated_tokens: Estimated tokens for the rate limiter.
+            **params: Parameters for the API call.
+            
+        Returns:
+            The API response.
+            
+        Raises:
+            Exception: The last error if the call fails permanently or runs out of retries.
+        """
+        attempt = 0
+        
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire(estimated_tokens)
+            
+            try:
+                response = await create(**params)
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                
+                delay = self._retry_delay(attempt, e)
+                attempt += 1
+                logging.warning(f"OpenAI request failed ({e}). ANUS retrying in {delay:.2f}s (attempt {attempt}/{self.max_retries})")
+                await asyncio.sleep(delay)
+                continue
+            
+            if self.rate_limiter is not None:
+                usage = getattr(response, "usage", None)
+                actual_tokens = getattr(usage, "total_tokens", None)
+                if isinstance(actual_tokens, int):
+                    self.rate_limiter.record_usage(estimated_tokens, actual_tokens)
+            
+            return response
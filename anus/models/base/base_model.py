@@ -3,7 +3,11 @@ Base Model module that defines the common interface for all language models.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Union, Callable
+from typing import Dict, List, Any, Optional, Union, Callable, Iterator, AsyncIterator, Sequence
+import asyncio
+
+from anus.models.tokenizer import BaseTokenizer, default_tokenizer
+from anus.models.prompt_budget import PromptBudget
 
 class BaseModel(ABC):
     """
@@ -12,11 +16,29 @@ class BaseModel(ABC):
     Provides a common interface for interacting with different LLM providers.
     """
     
+    # Context window sizes of known models, by name prefix (longest prefix wins)
+    _CONTEXT_WINDOWS = {
+        "gpt-4": 8192,
+        "gpt-4-32k": 32768,
+        "gpt-4-turbo": 128000,
+        "gpt-4o": 128000,
+        "gpt-4.1": 1047576,
+        "gpt-3.5-turbo": 16385,
+        "o1": 200000,
+        "o3": 200000,
+        "o4": 200000
+    }
+    
+    # Context window assumed for unknown models
+    _DEFAULT_CONTEXT_WINDOW = 8192
+    
     def __init__(
         self, 
         model_name: str, 
         temperature: float = 0.0,
         max_tokens: Optional[int] = None,
+        tokenizer: Optional[BaseTokenizer] = None,
+        context_window: Optional[int] = None,
         **kwargs
     ):
         """
@@ -26,11 +48,16 @@ class BaseModel(ABC):
             model_name: The name of the model to use.
             temperature: Controls randomness in outputs. Lower values are more deterministic.
             max_tokens: Maximum number of tokens to generate.
+            tokenizer: Tokenizer for counting prompt tokens. Defaults to the shared tokenizer.
+            context_window: Context window size in tokens. Defaults to the known
+                size for the model name.
             **kwargs: Additional model-specific parameters.
         """
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.tokenizer = tokenizer or default_tokenizer
+        self.context_window = context_window or self._lookup_context_window(model_name)
         self.config = kwargs
     
     @abstractmethod
@@ -57,6 +84,107 @@ class BaseModel(ABC):
         """
         pass
     
+    def generate_stream(
+        self, 
+        prompt: str, 
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Generate text based on a prompt, yielding it in chunks as it arrives.
+        
+        The default implementation yields the whole response of generate() as
+        one chunk. Models whose API can stream should override it.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            An iterator of text chunks.
+        """
+        yield self.generate(prompt, system_message, temperature, max_tokens, **kwargs)
+    
+    async def agenerate_stream(
+        self, 
+        prompt: str, 
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronously generate text based on a prompt, yielding it in chunks as it arrives.
+        
+        The default implementation runs generate_stream() in a worker thread and
+        hands each chunk to the event loop as soon as it is produced.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            An async iterator of text chunks.
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        def produce() -> None:
+            try:
+                for chunk in self.generate_stream(prompt, system_message, temperature, max_tokens, **kwargs):
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(chunks.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, done)
+        
+        producer = loop.run_in_executor(None, produce)
+        
+        while True:
+            chunk = await chunks.get()
+            if chunk is done:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+        
+        await producer
+    
+    async def agenerate(
+        self, 
+        prompt: str, 
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Asynchronously generate text based on a prompt.
+        
+        The default implementation runs generate() in a worker thread. Models
+        with an async client should override it.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        return await asyncio.to_thread(self.generate, prompt, system_message, temperature, max_tokens, **kwargs)
+    
     @abstractmethod
     def generate_with_tools(
         self, 
@@ -83,6 +211,35 @@ class BaseModel(ABC):
         """
         pass
     
+    async def agenerate_with_tools(
+        self, 
+        prompt: str, 
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously generate text with tool calling capabilities.
+        
+        The default implementation runs generate_with_tools() in a worker thread.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        return await asyncio.to_thread(
+            self.generate_with_tools, prompt, tools, system_message, temperature, max_tokens, **kwargs
+        )
+    
     @abstractmethod
     def extract_json(
         self, 
@@ -109,6 +266,35 @@ class BaseModel(ABC):
         """
         pass
     
+    async def aextract_json(
+        self, 
+        prompt: str, 
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured JSON data based on a prompt.
+        
+        The default implementation runs extract_json() in a worker thread.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        return await asyncio.to_thread(
+            self.extract_json, prompt, schema, system_message, temperature, max_tokens, **kwargs
+        )
+    
     @abstractmethod
     def get_embedding(self, text: str, **kwargs) -> List[float]:
         """
@@ -123,18 +309,134 @@ class BaseModel(ABC):
         """
         pass
     
+    def get_embeddings(self, texts: List[str], batch_size: Optional[int] = None, **kwargs) -> List[List[float]]:
+        """
+        Generate embedding vectors for many texts.
+        
+        The default implementation embeds the texts one at a time. Models whose
+        API accepts several inputs per request should override it.
+        
+        Args:
+            texts: The texts to embed.
+            batch_size: Maximum number of texts per request, or None for the model's limit.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vectors in text order, with an empty list for any
+            text that couldn't be embedded.
+        """
+        return [self.get_embedding(text, **kwargs) for text in texts]
+    
+    async def aget_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Asynchronously generate an embedding vector for the given text.
+        
+        The default implementation runs get_embedding() in a worker thread.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        return await asyncio.to_thread(self.get_embedding, text, **kwargs)
+    
+    async def aget_embeddings(self, texts: List[str], batch_size: Optional[int] = None, **kwargs) -> List[List[float]]:
+        """
+        Asynchronously generate embedding vectors for many texts.
+        
+        The default implementation runs get_embeddings() in a worker thread.
+        
+        Args:
+            texts: The texts to embed.
+            batch_size: Maximum number of texts per request, or None for the model's limit.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vectors in text order, with an empty list for any
+            text that couldn't be embedded.
+        """
+        return await asyncio.to_thread(self.get_embeddings, texts, batch_size, **kwargs)
+    
     def get_token_count(self, text: str) -> int:
         """
-        Estimate the number of tokens in the given text.
+        Count the number of tokens in the given text.
         
         Args:
             text: The text to count tokens for.
             
         Returns:
-            The approximate token count.
+            The token count, exact or estimated depending on the tokenizer.
+        """
+        return self.tokenizer.count(text)
+    
+    def get_prompt_budget(self, reserve_tokens: Optional[int] = None) -> int:
+        """
+        Get the number of tokens a prompt may use.
+        
+        Args:
+            reserve_tokens: Tokens kept free for the response. Defaults to
+                max_tokens, or a quarter of the context window without it.
+                
+        Returns:
+            The prompt token budget.
+        """
+        if reserve_tokens is None:
+            reserve_tokens = self.max_tokens if self.max_tokens is not None else self.context_window // 4
+        return max(0, self.context_window - reserve_tokens)
+    
+    def fit_prompt(
+        self,
+        sections: Sequence[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        separator: str = "\n\n",
+        summarize: bool = False
+    ) -> str:
+        """
+        Build a prompt from sections, trimming the least important ones to fit.
+        
+        See PromptBudget for the section options.
+        
+        Args:
+            sections: The prompt sections, in prompt order.
+            max_tokens: The prompt token budget. Defaults to get_prompt_budget().
+            separator: The text the sections are joined with.
+            summarize: If True, sections marked "summarize" are summarized by
+                this model instead of cut.
+                
+        Returns:
+            The prompt.
+            
+        Raises:
+            PromptBudgetError: If the sections don't fit even when trimmed as far as allowed.
+        """
+        budget = PromptBudget(
+            max_tokens if max_tokens is not None else self.get_prompt_budget(),
+            self.tokenizer,
+            self.summarize_text if summarize else None
+        )
+        return budget.build(sections, separator)
+    
+    def summarize_text(self, text: str, max_tokens: int) -> str:
+        """
+        Summarize a text in about max_tokens tokens.
+        
+        Args:
+            text: The text to summarize.
+            max_tokens: The length of the summary in tokens.
+            
+        Returns:
+            The summary.
         """
-        # Simple approximation: 1 token ≈ 4 characters
-        return len(text) // 4
+        # Summarize the part of the text that fits, leaving room for the instruction and summary
+        text = self.tokenizer.truncate(text, self.get_prompt_budget(max_tokens) - 64)
+        return self.generate(
+            f"Summarize the following in at most {max_tokens} tokens, keeping all facts needed to act on it:\n\n{text}",
+            system_message="You write faithful, compact summaries.",
+            temperature=0.0,
+            max_tokens=max_tokens
+        )
     
     def get_model_details(self) -> Dict[str, Any]:
         """
@@ -147,5 +449,21 @@ class BaseModel(ABC):
             "model_name": self.model_name,
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
+            "context_window": self.context_window,
             "config": self.config
-        } 
\ No newline at end of file
+        }
+    
+    def _lookup_context_window(self, model_name: str) -> int:
+        """
+        Look up the context window of a model by its name.
+        
+        Args:
+            model_name: The model name.
+            
+        Returns:
+            The context window size in tokens.
+        """
+        prefixes = [prefix for prefix in self._CONTEXT_WINDOWS if model_name.startswith(prefix)]
+        if not prefixes:
+            return self._DEFAULT_CONTEXT_WINDOW
+        return self._CONTEXT_WINDOWS[max(prefixes, key=len)] 
\ No newline at end of file
@@ -0,0 +1,566 @@
+"""
+Cached Model wrapper for the ANUS framework.
+
+Why ask the same question twice when ANUS remembers the answer?
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Iterator
+import logging
+
+from anus.models.base.base_model import BaseModel
+from anus.models.embedding_store import EmbeddingStore
+from anus.models.response_cache import ResponseCache
+
+class CachedModel(BaseModel):
+    """
+    Wrapper that memoizes the responses of any BaseModel.
+    
+    Requests are keyed on the model name, the messages, the temperature, the
+    token limit, the tools or schema and any extra parameters. By default only
+    deterministic calls (temperature 0) are cached, since sampling at a higher
+    temperature is usually meant to give a different answer each time. Error
+    responses are never cached.
+    
+    Embeddings can instead be kept in an EmbeddingStore, which holds them
+    compactly on disk, keyed by text, and is shared between processes.
+    """
+    
+    def __init__(
+        self,
+        model: BaseModel,
+        cache: Optional[ResponseCache] = None,
+        max_temperature: float = 0.0,
+        embedding_store: Optional[EmbeddingStore] = None,
+        **kwargs
+    ):
+        """
+        Initialize a CachedModel instance.
+        
+        Args:
+            model: The model to wrap.
+            cache: The response cache to use. If None, an in-memory cache is created.
+            max_temperature: Highest temperature at which responses are cached.
+            embedding_store: Optional store for embeddings. If None, embeddings
+                are cached in the response cache.
+            **kwargs: Additional configuration options.
+        """
+        kwargs.setdefault("tokenizer", model.tokenizer)
+        kwargs.setdefault("context_window", model.context_window)
+        super().__init__(model.model_name, model.temperature, model.max_tokens, **kwargs)
+        self.model = model
+        self.cache = cache or ResponseCache()
+        self.max_temperature = max_temperature
+        self.embedding_store = embedding_store
+        self.bypassed = 0
+    
+    def generate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate text based on a prompt, using a cached response if available.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        return self._cached_call(
+            "generate",
+            lambda: self.model.generate(prompt, system_message, temperature, max_tokens, **kwargs),
+            lambda response: isinstance(response, str) and not response.startswith("Error:"),
+            prompt, system_message, temperature, max_tokens, kwargs
+        )
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream generated text, serving a cached response as a single chunk.
+        
+        A streamed response is cached once it has been read to the end, under
+        the same key as generate(), so either call can serve the other. A
+        stream that broke off with an error chunk isn't cached.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            An iterator of text chunks.
+        """
+        key = self._request_key("generate", prompt, system_message, temperature, max_tokens, kwargs)
+        if key is None:
+            self.bypassed += 1
+            yield from self.model.generate_stream(prompt, system_message, temperature, max_tokens, **kwargs)
+            return
+        
+        found, response = self.cache.get(key)
+        if found:
+            yield response
+            return
+        
+        chunks = []
+        failed = False
+        for chunk in self.model.generate_stream(prompt, system_message, temperature, max_tokens, **kwargs):
+            # Streams report a failure as a final "Error: ..." chunk, possibly after partial content
+            failed = failed or chunk.startswith("Error:")
+            chunks.append(chunk)
+            yield chunk
+        
+        if not failed:
+            self.cache.set(key, "".join(chunks))
+    
+    def generate_with_tools(
+        self,
+        prompt: str,
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Generate text with tool calling capabilities, using a cached response if available.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        return self._cached_call(
+            "generate_with_tools",
+            lambda: self.model.generate_with_tools(prompt, tools, system_message, temperature, max_tokens, **kwargs),
+            lambda response: not str(response.get("content") or "").startswith("Error:"),
+            prompt, system_message, temperature, max_tokens, kwargs,
+            tools=tools
+        )
+    
+    def extract_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Extract structured JSON data based on a prompt, using a cached response if available.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        return self._cached_call(
+            "extract_json",
+            lambda: self.model.extract_json(prompt, schema, system_message, temperature, max_tokens, **kwargs),
+            lambda response: not (isinstance(response, dict) and "error" in response),
+            prompt, system_message, temperature, max_tokens, kwargs,
+            schema=schema
+        )
+    
+    def get_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Generate an embedding vector for the given text, using a cached vector if available.
+        
+        Embeddings are deterministic, so they are cached regardless of temperature.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        if self.embedding_store is not None and not kwargs:
+            return self.get_embeddings([text])[0]
+        
+        key = self._embedding_key(text, kwargs)
+        found, embedding = self.cache.get(key)
+        if found:
+            return embedding
+        
+        embedding = self.model.get_embedding(text, **kwargs)
+        if embedding:
+            self.cache.set(key, list(embedding))
+        return embedding
+    
+    def get_embeddings(self, texts: List[str], batch_size: Optional[int] = None, **kwargs) -> List[List[float]]:
+        """
+        Generate embedding vectors for many texts, embedding only those not cached yet.
+        
+        The missing texts are embedded together through the wrapped model's
+        get_embeddings, so they are batched if the model supports it. The
+        embedding store is only used without extra parameters, since those
+        may change the vectors.
+        
+        Args:
+            texts: The texts to embed.
+            batch_size: Maximum number of texts per request, or None for the model's limit.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vectors in text order, with an empty list for any
+            text that couldn't be embedded.
+        """
+        if self.embedding_store is not None and not kwargs:
+            embeddings = self.embedding_store.get_many(texts)
+        else:
+            keys = [self._embedding_key(text, kwargs) for text in texts]
+            embeddings = [embedding if found else None for found, embedding in map(self.cache.get, keys)]
+        
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+        if not missing:
+            return embeddings
+        
+        logging.debug(f"ANUS is embedding {len(missing)} of {len(texts)} texts, the rest are cached")
+        embedded = dict(zip(missing, self.model.get_embeddings(missing, batch_size, **kwargs)))
+        new = {text: list(embedding) for text, embedding in embedded.items() if embedding}
+        
+        if self.embedding_store is not None and not kwargs:
+            self.embedding_store.put_many(list(new), list(new.values()))
+        else:
+            for text, embedding in new.items():
+                self.cache.set(self._embedding_key(text, kwargs), embedding)
+        
+        return [embedding if embedding is not None else embedded[text] for text, embedding in zip(texts, embeddings)]
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Asynchronously generate text based on a prompt, using a cached response if available.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        return await self._acached_call(
+            "generate",
+            lambda: self.model.agenerate(prompt, system_message, temperature, max_tokens, **kwargs),
+            lambda response: isinstance(response, str) and not response.startswith("Error:"),
+            prompt, system_message, temperature, max_tokens, kwargs
+        )
+    
+    async def agenerate_with_tools(
+        self,
+        prompt: str,
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously generate text with tool calling capabilities, using a cached response if available.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        return await self._acached_call(
+            "generate_with_tools",
+            lambda: self.model.agenerate_with_tools(prompt, tools, system_message, temperature, max_tokens, **kwargs),
+            lambda response: not str(response.get("content") or "").startswith("Error:"),
+            prompt, system_message, temperature, max_tokens, kwargs,
+            tools=tools
+        )
+    
+    async def aextract_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured JSON data based on a prompt, using a cached response if available.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        return await self._acached_call(
+            "extract_json",
+            lambda: self.model.aextract_json(prompt, schema, system_message, temperature, max_tokens, **kwargs),
+            lambda response: not (isinstance(response, dict) and "error" in response),
+            prompt, system_message, temperature, max_tokens, kwargs,
+            schema=schema
+        )
+    
+    async def aget_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Asynchronously generate an embedding vector for the given text, using a cached vector if available.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        if self.embedding_store is not None and not kwargs:
+            embedding = self.embedding_store.get(text)
+            if embedding is not None:
+                return embedding
+        else:
+            key = self._embedding_key(text, kwargs)
+            found, embedding = self.cache.get(key)
+            if found:
+                return embedding
+        
+        embedding = await self.model.aget_embedding(text, **kwargs)
+        if embedding:
+            if self.embedding_store is not None and not kwargs:
+                self.embedding_store.put(text, embedding)
+            else:
+                self.cache.set(key, list(embedding))
+        return embedding
+    
+    def get_token_count(self, text: str) -> int:
+        """
+        Estimate the number of tokens in the given text using the wrapped model.
+        
+        Args:
+            text: The text to count tokens for.
+            
+        Returns:
+            The approximate token count.
+        """
+        return self.model.get_token_count(text)
+    
+    def get_model_details(self) -> Dict[str, Any]:
+        """
+        Get details about the wrapped model and the cache.
+        
+        Returns:
+            A dictionary containing model information.
+        """
+        details = self.model.get_model_details()
+        details["cache"] = self.get_cache_stats()
+        return details
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the response cache.
+        
+        Returns:
+            A dictionary containing cache statistics.
+        """
+        stats = self.cache.get_stats()
+        stats["bypassed"] = self.bypassed
+        if self.embedding_store is not None:
+            stats["embedding_store"] = self.embedding_store.get_stats()
+        return stats
+    
+    def _embedding_key(self, text: str, kwargs: Dict[str, Any]) -> str:
+        """
+        Build the response cache key for an embedding.
+        
+        Args:
+            text: The embedded text.
+            kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The cache key.
+        """
+        return ResponseCache.make_key({
+            "method": "get_embedding",
+            "model": self.model.model_name,
+            "embedding_model": getattr(self.model, "embedding_model", None),
+            "text": text,
+            "kwargs": kwargs
+        })
+    
+    def _cached_call(
+        self,
+        method: str,
+        call: Callable[[], Any],
+        cacheable: Callable[[Any], bool],
+        prompt: str,
+        system_message: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+        **request: Any
+    ) -> Any:
+        """
+        Serve a request from the cache, or make it and cache the response.
+        
+        Args:
+            method: The name of the model method.
+            call: Function making the actual request.
+            cacheable: Function deciding whether a response may be cached.
+            prompt: The text prompt.
+            system_message: Optional system message.
+            temperature: The requested temperature, or None for the model default.
+            max_tokens: The requested token limit, or None for the model default.
+            kwargs: Additional model-specific parameters.
+            **request: Further request parameters for the key, e.g. tools or schema.
+            
+        Returns:
+            The model response.
+        """
+        key = self._request_key(method, prompt, system_message, temperature, max_tokens, kwargs, **request)
+        if key is None:
+            self.bypassed += 1
+            return call()
+        
+        found, response = self.cache.get(key)
+        if found:
+            logging.debug(f"ANUS served {method} for {self.model.model_name} from cache")
+            return response
+        
+        response = call()
+        if cacheable(response):
+            self.cache.set(key, response)
+        return response
+    
+    async def _acached_call(
+        self,
+        method: str,
+        call: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool],
+        prompt: str,
+        system_message: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+        **request: Any
+    ) -> Any:
+        """
+        Serve a request from the cache, or await it and cache the response.
+        
+        Cache hits are served without leaving the event loop. Requests share
+        their cache keys with the synchronous methods.
+        
+        Args:
+            method: The name of the synchronous model method.
+            call: Function returning the awaitable making the actual request.
+            cacheable: Function deciding whether a response may be cached.
+            prompt: The text prompt.
+            system_message: Optional system message.
+            temperature: The requested temperature, or None for the model default.
+            max_tokens: The requested token limit, or None for the model default.
+            kwargs: Additional model-specific parameters.
+            **request: Further request parameters for the key, e.g. tools or schema.
+            
+        Returns:
+            The model response.
+        """
+        key = self._request_key(method, prompt, system_message, temperature, max_tokens, kwargs, **request)
+        if key is None:
+            self.bypassed += 1
+            return await call()
+        
+        found, response = self.cache.get(key)
+        if found:
+            logging.debug(f"ANUS served {method} for {self.model.model_name} from cache")
+            return response
+        
+        response = await call()
+        if cacheable(response):
+            self.cache.set(key, response)
+        return response
+    
+    def _request_key(
+        self,
+        method: str,
+        prompt: str,
+        system_message: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+        **request: Any
+    ) -> Optional[str]:
+        """
+        Build the cache key for a request.
+        
+        Args:
+            method: The name of the model method.
+            prompt: The text prompt.
+            system_message: Optional system message.
+            temperature: The requested temperature, or None for the model default.
+            max_tokens: The requested token limit, or None for the model default.
+            kwargs: Additional model-specific parameters.
+            **request: Further request parameters for the key, e.g. tools or schema.
+            
+        Returns:
+            The cache key, or None if the request is too random to cache.
+        """
+        temp = temperature if temperature is not None else self.model.temperature
+        if temp > self.max_temperature:
+            return None
+        
+        messages = []
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        messages.append({"role": "user", "content": prompt})
+        
+        return ResponseCache.make_key({
+            "method": method,
+            "model": self.model.model_name,
+            "messages": messages,
+            "temperature": temp,
+            "max_tokens": max_tokens if max_tokens is not None else self.model.max_tokens,
+            "kwargs": kwargs,
+            **request
+        })
@@ -0,0 +1,389 @@
+"""
+Coalescing Model wrapper for the ANUS framework.
+
+Ten identical questions at once, one trip to the API.
+"""
+
+from typing import Dict, List, Any, Optional, Iterator
+
+from anus.models.base.base_model import BaseModel
+from anus.models.response_cache import ResponseCache
+from anus.models.single_flight import SingleFlight
+
+class CoalescingModel(BaseModel):
+    """
+    Wrapper that shares one call between identical in-flight requests to any BaseModel.
+    
+    Requests are keyed like CachedModel keys them: on the model name, the
+    messages, the temperature, the token limit, the tools or schema and any
+    extra parameters. A request arriving while an identical one is in flight
+    waits for it and gets the same response, whatever the temperature, from
+    threads and coroutines alike. Unlike caching, nothing outlives the call.
+    
+    Streaming calls are passed through, since their chunks can't be shared
+    once they have been read.
+    """
+    
+    def __init__(self, model: BaseModel, single_flight: Optional[SingleFlight] = None, **kwargs):
+        """
+        Initialize a CoalescingModel instance.
+        
+        Args:
+            model: The model to wrap.
+            single_flight: The single-flight group to use. If None, one is created.
+            **kwargs: Additional configuration options.
+        """
+        kwargs.setdefault("tokenizer", model.tokenizer)
+        kwargs.setdefault("context_window", model.context_window)
+        super().__init__(model.model_name, model.temperature, model.max_tokens, **kwargs)
+        self.model = model
+        self.single_flight = single_flight or SingleFlight()
+    
+    def generate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate text based on a prompt, sharing an identical call in flight.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        return self.single_flight.do(
+            self._request_key("generate", prompt, system_message, temperature, max_tokens, kwargs),
+            lambda: self.model.generate(prompt, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream generated text from the wrapped model, without coalescing.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            An iterator of text chunks.
+        """
+        return self.model.generate_stream(prompt, system_message, temperature, max_tokens, **kwargs)
+    
+    def generate_with_tools(
+        self,
+        prompt: str,
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Generate text with tool calling capabilities, sharing an identical call in flight.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        return self.single_flight.do(
+            self._request_key("generate_with_tools", prompt, system_message, temperature, max_tokens, kwargs, tools=tools),
+            lambda: self.model.generate_with_tools(prompt, tools, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    def extract_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Extract structured JSON data based on a prompt, sharing an identical call in flight.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        return self.single_flight.do(
+            self._request_key("extract_json", prompt, system_message, temperature, max_tokens, kwargs, schema=schema),
+            lambda: self.model.extract_json(prompt, schema, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    def get_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Generate an embedding vector for the given text, sharing an identical call in flight.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        return self.single_flight.do(
+            self._embedding_key(text, kwargs),
+            lambda: self.model.get_embedding(text, **kwargs)
+        )
+    
+    def get_embeddings(self, texts: List[str], batch_size: Optional[int] = None, **kwargs) -> List[List[float]]:
+        """
+        Generate embedding vectors for many texts through the wrapped model.
+        
+        Batches are passed through whole; only identical batches in flight
+        are coalesced.
+        
+        Args:
+            texts: The texts to embed.
+            batch_size: Maximum number of texts per request, or None for the model's limit.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vectors in text order, with an empty list for any
+            text that couldn't be embedded.
+        """
+        return self.single_flight.do(
+            self._embedding_key(texts, kwargs),
+            lambda: self.model.get_embeddings(texts, batch_size, **kwargs)
+        )
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Asynchronously generate text based on a prompt, sharing an identical call in flight.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        return await self.single_flight.ado(
+            self._request_key("generate", prompt, system_message, temperature, max_tokens, kwargs),
+            lambda: self.model.agenerate(prompt, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    async def agenerate_with_tools(
+        self,
+        prompt: str,
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously generate text with tool calling capabilities, sharing an identical call in flight.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        return await self.single_flight.ado(
+            self._request_key("generate_with_tools", prompt, system_message, temperature, max_tokens, kwargs, tools=tools),
+            lambda: self.model.agenerate_with_tools(prompt, tools, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    async def aextract_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured JSON data based on a prompt, sharing an identical call in flight.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        return await self.single_flight.ado(
+            self._request_key("extract_json", prompt, system_message, temperature, max_tokens, kwargs, schema=schema),
+            lambda: self.model.aextract_json(prompt, schema, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    async def aget_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Asynchronously generate an embedding vector for the given text, sharing an identical call in flight.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        return await self.single_flight.ado(
+            self._embedding_key(text, kwargs),
+            lambda: self.model.aget_embedding(text, **kwargs)
+        )
+    
+    async def aget_embeddings(self, texts: List[str], batch_size: Optional[int] = None, **kwargs) -> List[List[float]]:
+        """
+        Asynchronously generate embedding vectors for many texts through the wrapped model.
+        
+        Args:
+            texts: The texts to embed.
+            batch_size: Maximum number of texts per request, or None for the model's limit.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vectors in text order, with an empty list for any
+            text that couldn't be embedded.
+        """
+        return await self.single_flight.ado(
+            self._embedding_key(texts, kwargs),
+            lambda: self.model.aget_embeddings(texts, batch_size, **kwargs)
+        )
+    
+    def get_token_count(self, text: str) -> int:
+        """
+        Estimate the number of tokens in the given text using the wrapped model.
+        
+        Args:
+            text: The text to count tokens for.
+            
+        Returns:
+            The approximate token count.
+        """
+        return self.model.get_token_count(text)
+    
+    def get_model_details(self) -> Dict[str, Any]:
+        """
+        Get details about the wrapped model and coalesced calls.
+        
+        Returns:
+            A dictionary containing model information.
+        """
+        details = self.model.get_model_details()
+        details["coalescing"] = self.get_coalescing_stats()
+        return details
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about coalesced calls.
+        
+        Returns:
+            A dictionary containing coalescing statistics.
+        """
+        return self.single_flight.get_stats()
+    
+    def _embedding_key(self, texts: Any, kwargs: Dict[str, Any]) -> str:
+        """
+        Build the coalescing key for an embedding request.
+        
+        Args:
+            texts: The text or list of texts to embed.
+            kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The request key.
+        """
+        return ResponseCache.make_key({
+            "method": "get_embeddings" if isinstance(texts, list) else "get_embedding",
+            "model": self.model.model_name,
+            "embedding_model": getattr(self.model, "embedding_model", None),
+            "text": texts,
+            "kwargs": kwargs
+        })
+    
+    def _request_key(
+        self,
+        method: str,
+        prompt: str,
+        system_message: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+        **request: Any
+    ) -> str:
+        """
+        Build the coalescing key for a request.
+        
+        Args:
+            method: The name of the model method.
+            prompt: The text prompt.
+            system_message: Optional system message.
+            temperature: The requested temperature, or None for the model default.
+            max_tokens: The requested token limit, or None for the model default.
+            kwargs: Additional model-specific parameters.
+            **request: Further request parameters for the key, e.g. tools or schema.
+            
+        Returns:
+            The request key.
+        """
+        messages = []
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        messages.append({"role": "user", "content": prompt})
+        
+        return ResponseCache.make_key({
+            "method": method,
+            "model": self.model.model_name,
+            "messages": messages,
+            "temperature": temperature if temperature is not None else self.model.temperature,
+            "max_tokens": max_tokens if max_tokens is not None else self.model.max_tokens,
+            "kwargs": kwargs,
+            **request
+        })
@@ -0,0 +1,319 @@
+"""
+Persistent embedding store for the ANUS framework.
+
+Embeddings are keyed by a hash of the text they embed, so a text is only
+ever sent to the embedding API once, across processes and restarts.
+"""
+
+from typing import Dict, List, Any, Optional, Sequence
+from array import array
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Bytes per key in the offset index (a SHA-256 digest)
+_KEY_SIZE = 32
+
+class EmbeddingStore:
+    """
+    A content-addressed, append-only store of float32 embedding vectors.
+    
+    The vectors are rows of a flat file that is memory-mapped for reads.
+    The offset index holds the SHA-256 digest of each row's text, so row i
+    starts at byte ``i * dim * 4``. Both files are only ever appended to,
+    under an exclusive file lock, and each process picks up the rows other
+    processes added when a lookup misses.
+    
+    A store holds the vectors of a single embedding model.
+    
+    Files in the store directory:
+    - ``embeddings.f32``: the vectors, one row per text
+    - ``embeddings.idx``: the digest of each row's text
+    - ``meta.json``: the embedding model and vector dimension
+    """
+    
+    def __init__(self, path: str, model: Optional[str] = None):
+        """
+        Initialize an EmbeddingStore instance.
+        
+        Args:
+            path: Directory to store the embeddings in.
+            model: The embedding model the vectors come from. Opening a store
+                written for another model raises a ValueError.
+        """
+        self.path = path
+        self.model = model
+        os.makedirs(self.path, exist_ok=True)
+        
+        self.dim: Optional[int] = None
+        self._rows: Dict[bytes, int] = {}  # Digest -> row
+        self._index_bytes = 0  # Bytes of the offset index read so far
+        self._mapped = None
+        self._view = None  # Flat float view over the mapped vectors
+        self._mapped_rows = 0
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        
+        self._load_meta()
+        self._refresh()
+    
+    def __len__(self) -> int:
+        """
+        Get the number of stored embeddings.
+        
+        Returns:
+            The embedding count.
+        """
+        return len(self._rows)
+    
+    @staticmethod
+    def make_key(text: str) -> bytes:
+        """
+        Get the key a text is stored under.
+        
+        Args:
+            text: The embedded text.
+            
+        Returns:
+            The SHA-256 digest of the text.
+        """
+        return hashlib.sha256(text.encode("utf-8")).digest()
+    
+    def get(self, text: str) -> Optional[List[float]]:
+        """
+        Look up the embedding of a text.
+        
+        Args:
+            text: The embedded text.
+            
+        Returns:
+            The embedding vector, or None if the text hasn't been stored.
+        """
+        return self.get_many([text])[0]
+    
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up the embeddings of many texts.
+        
+        Args:
+            texts: The embedded texts.
+            
+        Returns:
+            The embedding vectors in text order, with None for texts that
+            haven't been stored.
+        """
+        keys = [self.make_key(text) for text in texts]
+        
+        with self._lock:
+            if any(key not in self._rows for key in keys):
+                # Another process may have stored them in the meantime
+                self._refresh()
+            
+            vectors = []
+            for key in keys:
+                row = self._rows.get(key)
+                if row is None:
+                    self.misses += 1
+                    vectors.append(None)
+                else:
+                    self.hits += 1
+                    vectors.append(self._read_row(row))
+            return vectors
+    
+    def put(self, text: str, vector: Sequence[float]) -> None:
+        """
+        Store the embedding of a text.
+        
+        Args:
+            text: The embedded text.
+            vector: The embedding vector.
+        """
+        self.put_many([text], [vector])
+    
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> int:
+        """
+        Store the embeddings of many texts. Texts already stored are skipped.
+        
+        Args:
+            texts: The embedded texts.
+            vectors: Their embedding vectors.
+            
+        Returns:
+            The number of embeddings added.
+            
+        Raises:
+            ValueError: If a vector's dimension doesn't match the store.
+        """
+        with self._lock:
+            with open(self._file("embeddings.idx"), "ab") as index_file:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(index_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    self._load_meta()
+                    self._refresh()
+                    
+                    pending: Dict[bytes, Sequence[float]] = {}
+                    for text, vector in zip(texts, vectors):
+                        key = self.make_key(text)
+                        if key not in self._rows and key not in pending:
+                            pending[key] = vector
+                    if not pending:
+                        return 0
+                    
+                    if self.dim is None:
+                        self.dim = len(next(iter(pending.values())))
+                        self._write_meta()
+                    for vector in pending.values():
+                        if len(vector) != self.dim:
+                            raise ValueError(f"Embedding has dimension {len(vector)}, store expects {self.dim}")
+                    
+                    # Drop a partial entry a crashed writer left, so new entries stay aligned
+                    if os.path.getsize(self._file("embeddings.idx")) > self._index_bytes:
+                        logging.warning(f"Discarding an interrupted write to {self._file('embeddings.idx')}")
+                        index_file.truncate(self._index_bytes)
+                    
+                    # Vectors go first, so an index entry never points past the vector file
+                    rows = self._index_bytes // _KEY_SIZE
+                    with open(self._file("embeddings.f32"), "r+b" if os.path.exists(self._file("embeddings.f32")) else "wb") as f:
+                        f.truncate(rows * self.dim * 4)  # Drop rows a crashed writer left without an index entry
+                        f.seek(0, os.SEEK_END)
+                        f.write(array("f", [x for vector in pending.values() for x in vector]).tobytes())
+                    
+                    index_file.write(b"".join(pending))
+                    index_file.flush()
+                    
+                    for key in pending:
+                        self._rows[key] = rows
+                        rows += 1
+                    self._index_bytes += len(pending) * _KEY_SIZE
+                    return len(pending)
+                finally:
+                    if FCNTL_AVAILABLE:
+                        fcntl.flock(index_file.fileno(), fcntl.LOCK_UN)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the store.
+        
+        Returns:
+            A dictionary containing store statistics.
+        """
+        return {
+            "path": self.path,
+            "model": self.model,
+            "dim": self.dim,
+            "embeddings": len(self._rows),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+    
+    def close(self) -> None:
+        """
+        Release the memory map over the vectors.
+        """
+        with self._lock:
+            self._unmap()
+    
+    def _refresh(self) -> None:
+        """
+        Read the index entries appended since the last refresh.
+        """
+        index_path = self._file("embeddings.idx")
+        if not os.path.exists(index_path) or os.path.getsize(index_path) <= self._index_bytes:
+            return
+        
+        if self.dim is None:
+            self._load_meta()
+        
+        with open(index_path, "rb") as f:
+            f.seek(self._index_bytes)
+            data = f.read()
+        
+        # Ignore a partially written trailing entry
+        data = data[:len(data) - len(data) % _KEY_SIZE]
+        row = self._index_bytes // _KEY_SIZE
+        for offset in range(0, len(data), _KEY_SIZE):
+            self._rows.setdefault(data[offset:offset + _KEY_SIZE], row)
+            row += 1
+        self._index_bytes += len(data)
+    
+    def _read_row(self, row: int) -> List[float]:
+        """
+        Read one vector, remapping the vector file if it has grown.
+        
+        Args:
+            row: The row number.
+            
+        Returns:
+            The vector as a list of floats.
+        """
+        if self._view is None or row >= self._mapped_rows:
+            self._unmap()
+            with open(self._file("embeddings.f32"), "rb") as f:
+                self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_rows = len(self._mapped) // (4 * self.dim)
+            self._view = memoryview(self._mapped)[:self._mapped_rows * 4 * self.dim].cast("f")
+        
+        offset = row * self.dim
+        return self._view[offset:offset + self.dim].tolist()
+    
+    def _unmap(self) -> None:
+        """
+        Release the memory map over the vectors.
+        """
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+        self._mapped_rows = 0
+    
+    def _load_meta(self) -> None:
+        """
+        Load the store metadata, checking that it belongs to the same model.
+        
+        Raises:
+            ValueError: If the store was written for a different embedding model.
+        """
+        if not os.path.exists(self._file("meta.json")):
+            return
+        
+        with open(self._file("meta.json"), "r") as f:
+            meta = json.load(f)
+        
+        if self.model is not None and meta.get("model") not in (None, self.model):
+            raise ValueError(f"Embedding store {self.path} holds embeddings of {meta['model']}, not {self.model}")
+        self.dim = meta.get("dim")
+    
+    def _write_meta(self) -> None:
+        """
+        Persist the store metadata.
+        """
+        with open(self._file("meta.json"), "w") as f:
+            json.dump({"model": self.model, "dim": self.dim}, f)
+        logging.debug(f"ANUS embedding store {self.path} holds {self.dim}-dimensional vectors")
+    
+    def _file(self, name: str) -> str:
+        """
+        Get the path of a store file.
+        
+        Args:
+            name: The file name.
+            
+        Returns:
+            The file path.
+        """
+        return os.path.join(self.path, name)
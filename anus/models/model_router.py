@@ -3,10 +3,18 @@ Model Router module for dynamic model selection.
 """
 
 from typing import Dict, List, Any, Optional, Union, Type
+import json
 import logging
+import threading
 
 from anus.models.base.base_model import BaseModel
 from anus.models.openai_model import OpenAIModel
+from anus.models.async_openai_model import AsyncOpenAIModel
+from anus.models.cached_model import CachedModel
+from anus.models.coalescing_model import CoalescingModel
+from anus.models.embedding_store import EmbeddingStore
+from anus.models.response_cache import ResponseCache
+from anus.models.routing import RoutingEngine, RoutedModel
 
 class ModelRouter:
     """
@@ -16,55 +24,95 @@ class ModelRouter:
     - Registering different model implementations
     - Selecting models based on task requirements
     - Fallback mechanisms for reliability
+    - Reusing model instances (and their clients) for identical configurations
+    - Handing out async-native models for callers on an event loop
+    - Routing tasks between registered models by latency, cost and complexity
+    
+    Every model has the async methods (agenerate and friends); providers
+    without an async-native class run them on worker threads.
     """
     
-    def __init__(self, default_model_config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        default_model_config: Optional[Dict[str, Any]] = None,
+        routing_config: Optional[Dict[str, Any]] = None,
+        complexity_scorer: Optional[Any] = None
+    ):
         """
         Initialize a ModelRouter instance.
         
         Args:
             default_model_config: Configuration for the default model.
+            routing_config: Options for the RoutingEngine, e.g. "policy",
+                "latency_slo", "error_threshold" and "cooldown".
+            complexity_scorer: Optional object with a score(task) method rating
+                task complexity from 0 to 10, e.g. HybridAgent.complexity_scorer,
+                used to route tasks without an explicit complexity.
         """
         self.models: Dict[str, BaseModel] = {}
         self.model_classes: Dict[str, Type[BaseModel]] = {
             "openai": OpenAIModel
         }
+        self.async_model_classes: Dict[str, Type[BaseModel]] = {
+            "openai": AsyncOpenAIModel
+        }
         self.default_model_config = default_model_config or {
             "provider": "openai",
             "model_name": "gpt-4",
             "temperature": 0.0
         }
         self.default_model = None
+        self.default_async_model = None
+        self.response_caches: Dict[str, ResponseCache] = {}
+        self.embedding_stores: Dict[str, EmbeddingStore] = {}
+        self.routing = RoutingEngine(**(routing_config or {}))
+        self.complexity_scorer = complexity_scorer
+        
+        # Model instances keyed by their canonical configuration
+        self._model_pool: Dict[str, BaseModel] = {}
+        self._pool_lock = threading.Lock()
     
-    def register_model(self, name: str, model: BaseModel) -> None:
+    def register_model(self, name: str, model: BaseModel, routing: Optional[Dict[str, Any]] = None) -> None:
         """
         Register a model instance.
         
         Args:
             name: A unique name for the model.
             model: The model instance to register.
+            routing: Optional routing profile making the model a candidate for
+                select_model_for_task, with "cost_per_1k_tokens",
+                "min_complexity" and "max_complexity" (all optional).
         """
         self.models[name] = model
+        if routing is not None:
+            self.routing.register(name, routing)
         logging.info(f"Registered model: {name}")
     
-    def register_model_class(self, provider: str, model_class: Type[BaseModel]) -> None:
+    def register_model_class(self, provider: str, model_class: Type[BaseModel], asynchronous: bool = False) -> None:
         """
         Register a model class for a provider.
         
         Args:
             provider: The model provider name.
             model_class: The model class to register.
+            asynchronous: Whether the class is the provider's async-native flavor.
         """
-        self.model_classes[provider] = model_class
-        logging.info(f"Registered model class for provider: {provider}")
+        if asynchronous:
+            self.async_model_classes[provider] = model_class
+            logging.info(f"Registered async model class for provider: {provider}")
+        else:
+            self.model_classes[provider] = model_class
+            logging.info(f"Registered model class for provider: {provider}")
     
-    def get_model(self, name_or_config: Union[str, Dict[str, Any]]) -> BaseModel:
+    def get_model(self, name_or_config: Union[str, Dict[str, Any]], asynchronous: bool = False) -> BaseModel:
         """
         Get a model instance by name or create one from config.
         
         Args:
             name_or_config: Either a model name or a model configuration dictionary.
-            
+            asynchronous: Whether to prefer the async-native flavor of a configured model.
+                Registered models are returned as they are.
+                
         Returns:
             A model instance.
         """
@@ -76,46 +124,151 @@ class ModelRouter:
             
             # If not found, use default model
             logging.warning(f"Model '{name_or_config}' not found. Using default model.")
-            return self.get_default_model()
+            return self.get_default_model(asynchronous)
         
-        # If it's a config dict, create a new model
+        # If it's a config dict, reuse or create a model
         elif isinstance(name_or_config, dict):
-            return self._create_model_from_config(name_or_config)
+            return self._get_pooled_model(self._with_flavor(name_or_config, asynchronous))
         
         # Invalid input
         else:
             logging.error(f"Invalid model specification: {name_or_config}")
-            return self.get_default_model()
+            return self.get_default_model(asynchronous)
     
-    def get_default_model(self) -> BaseModel:
+    def get_default_model(self, asynchronous: bool = False) -> BaseModel:
         """
         Get the default model, creating it if necessary.
         
+        Args:
+            asynchronous: Whether to get the async-native flavor.
+            
         Returns:
             The default model instance.
         """
-        if self.default_model is None:
-            self.default_model = self._create_model_from_config(self.default_model_config)
+        if asynchronous:
+            if self.default_async_model is not None:
+                return self.default_async_model
+            model = self._get_pooled_model(self._with_flavor(self.default_model_config, True))
+            if self._is_pooled(model):
+                self.default_async_model = model
+            return model
         
-        return self.default_model
+        if self.default_model is not None:
+            return self.default_model
+        
+        # A fallback isn't kept, so the configured model is tried again next time
+        model = self._get_pooled_model(self.default_model_config)
+        if self._is_pooled(model):
+            self.default_model = model
+        return model
     
-    def select_model_for_task(self, task: str, requirements: Dict[str, Any] = None) -> BaseModel:
+    def select_model_for_task(
+        self,
+        task: str,
+        requirements: Dict[str, Any] = None,
+        asynchronous: bool = False,
+        complexity: Optional[float] = None
+    ) -> BaseModel:
         """
         Select an appropriate model for a given task.
         
+        If models were registered with a routing profile, the task gets a
+        RoutedModel that picks between them on every call by the routing
+        policy and their live statistics, and fails over when one fails.
+        
         Args:
             task: The task description.
-            requirements: Optional requirements for the model.
-            
+            requirements: Optional requirements: a model configuration, or the
+                routing options "policy", "latency_slo" and "complexity".
+            asynchronous: Whether to prefer the async-native flavor.
+            complexity: Optional task complexity between 0 and 10, e.g. from
+                HybridAgent._assess_complexity. Scored with the complexity
+                scorer if not given.
+                
         Returns:
             The selected model instance.
         """
-        # Simple implementation: just use requirements if provided
-        if requirements:
-            return self._create_model_from_config(requirements)
+        options = dict(requirements or {})
+        policy = options.pop("policy", None)
+        latency_slo = options.pop("latency_slo", None)
+        complexity = options.pop("complexity", complexity)
+        
+        # A model configuration picks the model directly
+        if options:
+            return self._get_pooled_model(self._with_flavor(options, asynchronous))
+        
+        candidates = {name: self.models[name] for name in self.routing.profiles if name in self.models}
+        if candidates:
+            if complexity is None and self.complexity_scorer is not None and task:
+                complexity = self.complexity_scorer.score(task)
+            return RoutedModel(self.routing, candidates, complexity, policy, latency_slo)
         
         # Default to the default model
-        return self.get_default_model()
+        return self.get_default_model(asynchronous)
+    
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """
+        Get the live routing statistics of the registered models.
+        
+        Returns:
+            A dictionary of statistics by model name.
+        """
+        return self.routing.get_stats()
+    
+    def _with_flavor(self, config: Dict[str, Any], asynchronous: bool) -> Dict[str, Any]:
+        """
+        Mark a configuration as asking for the async-native flavor.
+        
+        Args:
+            config: The model configuration.
+            asynchronous: Whether the async-native flavor is wanted.
+            
+        Returns:
+            The configuration, with "asynchronous" set if it is wanted.
+        """
+        if asynchronous and not config.get("asynchronous"):
+            return {**config, "asynchronous": True}
+        return config
+    
+    def _get_pooled_model(self, config: Dict[str, Any]) -> BaseModel:
+        """
+        Get the pooled model for a configuration, creating it on first use.
+        
+        Args:
+            config: The model configuration.
+            
+        Returns:
+            A model instance shared by all callers with the same configuration.
+        """
+        key = json.dumps(config, sort_keys=True, default=str)
+        
+        with self._pool_lock:
+            model = self._model_pool.get(key)
+            if model is not None:
+                return model
+            
+            try:
+                model = self._create_model_from_config(config)
+            except Exception as e:
+                # The fallback isn't pooled, so the configuration is tried again next time
+                logging.error(f"Error creating model for provider {config.get('provider', 'openai')}: {e}")
+                return self._create_fallback_model(e)
+            
+            self._model_pool[key] = model
+            return model
+    
+    def _is_pooled(self, model: BaseModel) -> bool:
+        """
+        Tell whether a model was built from its configuration and pooled.
+        
+        Args:
+            model: The model.
+            
+        Returns:
+            False for fallback models.
+        """
+        with self._pool_lock:
+            return any(pooled is model for pooled in self._model_pool.values())
     
     def _create_model_from_config(self, config: Dict[str, Any]) -> BaseModel:
         """
@@ -126,6 +279,9 @@ class ModelRouter:
             
         Returns:
             A model instance.
+            
+        Raises:
+            Exception: Whatever the model class raises for an invalid configuration.
         """
         # Get the provider
         provider = config.get("provider", "openai").lower()
@@ -135,25 +291,87 @@ class ModelRouter:
             logging.error(f"Unknown model provider: {provider}. Using OpenAI as fallback.")
             provider = "openai"
         
-        try:
-            # Get the model class
-            model_class = self.model_classes[provider]
-            
-            # Extract kwargs for the model
-            kwargs = config.copy()
-            kwargs.pop("provider", None)
-            
-            # Create the model
-            return model_class(**kwargs)
+        # Extract kwargs for the model
+        kwargs = config.copy()
+        kwargs.pop("provider", None)
+        cache_config = kwargs.pop("cache", None)
+        coalesce = kwargs.pop("coalesce", False)
+        asynchronous = kwargs.pop("asynchronous", False)
+        
+        # Get the model class, falling back to the synchronous one whose
+        # async methods run on worker threads
+        model_class = self.model_classes[provider]
+        if asynchronous:
+            model_class = self.async_model_classes.get(provider, model_class)
+        
+        # Create the model
+        model = model_class(**kwargs)
+        
+        # Coalesce below the cache, so concurrent misses share one call
+        if coalesce:
+            model = CoalescingModel(model)
+            logging.info(f"Request coalescing enabled for model: {model.model_name}")
+        
+        if cache_config:
+            model = self._wrap_with_cache(model, cache_config)
+        
+        return model
+    
+    def _create_fallback_model(self, error: Exception) -> BaseModel:
+        """
+        Create the model used when a configuration can't be built.
+        
+        Args:
+            error: The error building the configured model.
             
-        except Exception as e:
-            logging.error(f"Error creating model for provider {provider}: {e}")
+        Returns:
+            A minimal OpenAI model.
             
-            # Fallback to OpenAI with minimal config
-            try:
-                return OpenAIModel(model_name="gpt-4")
-            except Exception:
-                raise ValueError(f"Failed to create model: {e}")
+        Raises:
+            ValueError: If the fallback model can't be created either.
+        """
+        try:
+            return OpenAIModel(model_name="gpt-4")
+        except Exception:
+            raise ValueError(f"Failed to create model: {error}")
+    
+    def _wrap_with_cache(self, model: BaseModel, cache_config: Union[bool, Dict[str, Any]]) -> CachedModel:
+        """
+        Wrap a model with a response cache.
+        
+        Models configured with the same cache path share one cache, so the
+        disk tier isn't opened more than once. The same goes for embedding stores.
+        
+        Args:
+            model: The model to wrap.
+            cache_config: True for an in-memory cache, or a dictionary with the
+                ResponseCache options plus "max_temperature" and
+                "embedding_store_path".
+                
+        Returns:
+            The cached model.
+        """
+        options = dict(cache_config) if isinstance(cache_config, dict) else {}
+        max_temperature = options.pop("max_temperature", 0.0)
+        embedding_store_path = options.pop("embedding_store_path", None)
+        cache_path = options.get("cache_path")
+        
+        if cache_path and cache_path in self.response_caches:
+            cache = self.response_caches[cache_path]
+        else:
+            cache = ResponseCache(**options)
+            if cache_path:
+                self.response_caches[cache_path] = cache
+        
+        embedding_store = None
+        if embedding_store_path:
+            embedding_store = self.embedding_stores.get(embedding_store_path)
+            if embedding_store is None:
+                embedding_store = EmbeddingStore(embedding_store_path, model=getattr(model, "embedding_model", None))
+                self.embedding_stores[embedding_store_path] = embedding_store
+        
+        logging.info(f"Response caching enabled for model: {model.model_name}")
+        return CachedModel(model, cache=cache, max_temperature=max_temperature, embedding_store=embedding_store)
     
     def list_available_models(self) -> List[Dict[str, Any]]:
         """
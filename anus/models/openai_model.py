@@ -2,10 +2,13 @@
 OpenAI Model implementation for the ANUS framework.
 """
 
-from typing import Dict, List, Any, Optional, Union, Callable
+from typing import Dict, List, Any, Optional, Union, Callable, Tuple, Iterator
 import json
 import logging
 import os
+import random
+import threading
+import time
 
 try:
     import openai
@@ -15,14 +18,32 @@ except ImportError:
     OPENAI_AVAILABLE = False
 
 from anus.models.base.base_model import BaseModel
+from anus.models.rate_limiter import RateLimiter
 
 class OpenAIModel(BaseModel):
     """
     OpenAI language model implementation.
     
     Provides integration with OpenAI's API for text generation and embeddings.
+    
+    Clients are shared between instances with the same API key and base URL,
+    so they share one connection pool. Rate limiters are shared per base URL
+    and model. Transient failures (connection errors, timeouts, 408, 409, 429
+    and 5xx responses) are retried with exponential backoff and full jitter.
     """
     
+    # Shared clients and rate limiters
+    _clients: Dict[Tuple[Any, ...], Any] = {}
+    _rate_limiters: Dict[Tuple[Any, ...], RateLimiter] = {}
+    _pool_lock = threading.Lock()
+    
+    # HTTP status codes worth retrying
+    _RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+    
+    # Limits of a single embeddings request
+    _MAX_EMBEDDING_INPUTS = 2048
+    _MAX_EMBEDDING_TOKENS = 300000
+    
     def __init__(
         self, 
         model_name: str = "gpt-4", 
@@ -30,6 +51,12 @@ class OpenAIModel(BaseModel):
         max_tokens: Optional[int] = None,
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 30.0,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
         **kwargs
     ):
         """
@@ -41,6 +68,12 @@ class OpenAIModel(BaseModel):
             max_tokens: Maximum number of tokens to generate.
             api_key: OpenAI API key. If None, it will be read from the OPENAI_API_KEY environment variable.
             base_url: Base URL for the OpenAI API. Useful for proxies or non-standard endpoints.
+            timeout: Request timeout in seconds. If None, the client default is used.
+            max_retries: Maximum number of retries for transient failures.
+            retry_base_delay: Backoff delay before the first retry in seconds.
+            retry_max_delay: Upper bound for the backoff delay in seconds.
+            requests_per_minute: Client-side request limit, or None for no limit.
+            tokens_per_minute: Client-side token limit, or None for no limit.
             **kwargs: Additional model-specific parameters.
         """
         super().__init__(model_name, temperature, max_tokens, **kwargs)
@@ -56,9 +89,14 @@ class OpenAIModel(BaseModel):
             raise ValueError("OpenAI API key required")
         
         self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
         
-        # Initialize client
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+        # Reuse a pooled client and rate limiter
+        self.client = self._get_client(self.api_key, self.base_url, self.timeout)
+        self.rate_limiter = self._get_rate_limiter(requests_per_minute, tokens_per_minute)
         
         # Set default embedding model
         self.embedding_model = kwargs.get("embedding_model", "text-embedding-ada-002")
@@ -84,23 +122,14 @@ class OpenAIModel(BaseModel):
         Returns:
             The generated text response.
         """
-        # Prepare messages
-        messages = []
-        
-        # Add system message if provided
-        if system_message:
-            messages.append({"role": "system", "content": system_message})
-        
-        # Add user message
-        messages.append({"role": "user", "content": prompt})
-        
-        # Set parameters
-        temp = temperature if temperature is not None else self.temperature
-        tokens = max_tokens if max_tokens is not None else self.max_tokens
+        messages = self._build_messages(prompt, system_message)
+        temp, tokens = self._resolve_parameters(temperature, max_tokens)
         
         try:
             # Make the API call
-            response = self.client.chat.completions.create(
+            response = self._request(
+                self.client.chat.completions.create,
+                self._estimate_tokens(messages, tokens),
                 model=self.model_name,
                 messages=messages,
                 temperature=temp,
@@ -115,6 +144,55 @@ class OpenAIModel(BaseModel):
             logging.error(f"Error generating with OpenAI: {e}")
             return f"Error: {str(e)}"
     
+    def generate_stream(
+        self, 
+        prompt: str, 
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Generate text based on a prompt using OpenAI, yielding chunks as they arrive.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for the model.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            An iterator of text chunks.
+        """
+        messages = self._build_messages(prompt, system_message)
+        temp, tokens = self._resolve_parameters(temperature, max_tokens)
+        
+        try:
+            # Only the request itself is retried; a stream that breaks off
+            # midway can't be resumed without repeating what was yielded
+            stream = self._request(
+                self.client.chat.completions.create,
+                self._estimate_tokens(messages, tokens),
+                model=self.model_name,
+                messages=messages,
+                temperature=temp,
+                max_tokens=tokens,
+                stream=True,
+                **kwargs
+            )
+            
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        
+        except Exception as e:
+            logging.error(f"Error streaming with OpenAI: {e}")
+            yield f"Error: {str(e)}"
+    
     def generate_with_tools(
         self, 
         prompt: str, 
@@ -138,36 +216,16 @@ class OpenAIModel(BaseModel):
         Returns:
             A dictionary with the response and any tool calls.
         """
-        # Prepare messages
-        messages = []
+        messages = self._build_messages(prompt, system_message)
+        temp, tokens = self._resolve_parameters(temperature, max_tokens)
         
-        # Add system message if provided
-        if system_message:
-            messages.append({"role": "system", "content": system_message})
-        
-        # Add user message
-        messages.append({"role": "user", "content": prompt})
-        
-        # Set parameters
-        temp = temperature if temperature is not None else self.temperature
-        tokens = max_tokens if max_tokens is not None else self.max_tokens
-        
-        # Convert tools to OpenAI format
-        openai_tools = []
-        for tool in tools:
-            openai_tool = {
-                "type": "function",
-                "function": {
-                    "name": tool.get("name", ""),
-                    "description": tool.get("description", ""),
-                    "parameters": tool.get("parameters", {})
-                }
-            }
-            openai_tools.append(openai_tool)
+        openai_tools = self._convert_tools(tools)
         
         try:
             # Make the API call
-            response = self.client.chat.completions.create(
+            response = self._request(
+                self.client.chat.completions.create,
+                self._estimate_tokens(messages, tokens),
                 model=self.model_name,
                 messages=messages,
                 temperature=temp,
@@ -176,38 +234,7 @@ class OpenAIModel(BaseModel):
                 **kwargs
             )
             
-            # Extract response
-            choice = response.choices[0]
-            message = choice.message
-            
-            # Check for tool calls
-            if hasattr(message, "tool_calls") and message.tool_calls:
-                tool_calls = []
-                for tool_call in message.tool_calls:
-                    # Parse arguments as JSON
-                    try:
-                        arguments = json.loads(tool_call.function.arguments)
-                    except:
-                        arguments = tool_call.function.arguments
-                    
-                    # Create a normalized tool call
-                    normalized_tool_call = {
-                        "id": tool_call.id,
-                        "name": tool_call.function.name,
-                        "arguments": arguments
-                    }
-                    tool_calls.append(normalized_tool_call)
-                
-                return {
-                    "content": message.content,
-                    "tool_calls": tool_calls
-                }
-            else:
-                # No tool calls, just text
-                return {
-                    "content": message.content,
-                    "tool_calls": []
-                }
+            return self._parse_tool_response(response)
         
         except Exception as e:
             logging.error(f"Error generating with tools using OpenAI: {e}")
@@ -239,36 +266,23 @@ class OpenAIModel(BaseModel):
         Returns:
             The extracted JSON data.
         """
-        # Set default system message if not provided
-        if not system_message:
-            system_message = "Extract the requested information and respond only with a valid JSON object according to the specified schema. Do not include any other text."
-        
-        # Set parameters
-        temp = temperature if temperature is not None else self.temperature
-        tokens = max_tokens if max_tokens is not None else self.max_tokens
+        messages = self._build_json_messages(prompt, schema, system_message)
+        temp, tokens = self._resolve_parameters(temperature, max_tokens)
         
         # Make the API call with response format JSON
         try:
-            response = self.client.chat.completions.create(
+            response = self._request(
+                self.client.chat.completions.create,
+                self._estimate_tokens(messages, tokens),
                 model=self.model_name,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": f"Schema: {json.dumps(schema)}\n\nPrompt: {prompt}"}
-                ],
+                messages=messages,
                 temperature=temp,
                 max_tokens=tokens,
                 response_format={"type": "json_object"},
                 **kwargs
             )
             
-            # Extract and parse the response
-            content = response.choices[0].message.content
-            
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                logging.error(f"Failed to parse JSON from response: {content}")
-                return {"error": "Failed to parse JSON response"}
+            return self._parse_json_response(response)
         
         except Exception as e:
             logging.error(f"Error extracting JSON with OpenAI: {e}")
@@ -286,7 +300,9 @@ class OpenAIModel(BaseModel):
             The embedding vector as a list of floats.
         """
         try:
-            response = self.client.embeddings.create(
+            response = self._request(
+                self.client.embeddings.create,
+                self.get_token_count(text),
                 model=self.embedding_model,
                 input=text,
                 **kwargs
@@ -296,4 +312,382 @@ class OpenAIModel(BaseModel):
         
         except Exception as e:
             logging.error(f"Error generating embedding with OpenAI: {e}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    def get_embeddings(self, texts: List[str], batch_size: Optional[int] = None, **kwargs) -> List[List[float]]:
+        """
+        Generate embedding vectors for many texts, as few requests as possible.
+        
+        Distinct texts are packed greedily into requests of up to batch_size
+        inputs and the API's token limit per request. A failed request only
+        loses the embeddings of its own texts.
+        
+        Args:
+            texts: The texts to embed.
+            batch_size: Maximum number of texts per request, or None for the API limit.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            The embedding vectors in text order, with an empty list for any
+            text that couldn't be embedded.
+        """
+        embeddings: Dict[str, List[float]] = {}
+        for batch, batch_tokens in self._pack_embedding_batches(texts, batch_size):
+            embeddings.update(self._embed_batch(batch, batch_tokens, **kwargs))
+        
+        return [embeddings.get(text, []) for text in texts]
+    
+    def get_model_details(self) -> Dict[str, Any]:
+        """
+        Get details about the model, including rate limiter statistics.
+        
+        Returns:
+            A dictionary containing model information.
+        """
+        details = super().get_model_details()
+        details["max_retries"] = self.max_retries
+        if self.rate_limiter is not None:
+            details["rate_limiter"] = self.rate_limiter.get_stats()
+        return details
+    
+    def _get_client(self, api_key: str, base_url: Optional[str], timeout: Optional[float]) -> Any:
+        """
+        Get the shared client for an API key and endpoint, creating it if necessary.
+        
+        The client's own retries are disabled, since _request() retries instead.
+        
+        Args:
+            api_key: The OpenAI API key.
+            base_url: The API base URL, or None for the default.
+            timeout: The request timeout, or None for the default.
+            
+        Returns:
+            An OpenAI client.
+        """
+        key = (api_key, base_url, timeout)
+        
+        with self._pool_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client_kwargs = {"api_key": api_key, "base_url": base_url, "max_retries": 0}
+                if timeout is not None:
+                    client_kwargs["timeout"] = timeout
+                client = OpenAI(**client_kwargs)
+                self._clients[key] = client
+            return client
+    
+    def _get_rate_limiter(
+        self,
+        requests_per_minute: Optional[float],
+        tokens_per_minute: Optional[float]
+    ) -> Optional[RateLimiter]:
+        """
+        Get the shared rate limiter for this endpoint and model, creating it if necessary.
+        
+        Args:
+            requests_per_minute: Client-side request limit, or None for no limit.
+            tokens_per_minute: Client-side token limit, or None for no limit.
+            
+        Returns:
+            A RateLimiter, or None if no limit is configured.
+        """
+        if not requests_per_minute and not tokens_per_minute:
+            return None
+        
+        key = (self.base_url, self.model_name, requests_per_minute, tokens_per_minute)
+        
+        with self._pool_lock:
+            limiter = self._rate_limiters.get(key)
+            if limiter is None:
+                limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+                self._rate_limiters[key] = limiter
+            return limiter
+    
+    def _pack_embedding_batches(self, texts: List[str], batch_size: Optional[int]) -> List[Tuple[List[str], int]]:
+        """
+        Pack the distinct texts into as few embedding requests as possible.
+        
+        Args:
+            texts: The texts to embed.
+            batch_size: Maximum number of texts per request, or None for the API limit.
+            
+        Returns:
+            (texts, estimated tokens) tuples, one per request.
+        """
+        batch_size = min(batch_size or self._MAX_EMBEDDING_INPUTS, self._MAX_EMBEDDING_INPUTS)
+        
+        # Embed each distinct text once; the API rejects empty inputs
+        unique = list(dict.fromkeys(text for text in texts if text))
+        
+        batches = []
+        batch: List[str] = []
+        batch_tokens = 0
+        for text in unique:
+            tokens = self.get_token_count(text)
+            if batch and (len(batch) >= batch_size or batch_tokens + tokens > self._MAX_EMBEDDING_TOKENS):
+                batches.append((batch, batch_tokens))
+                batch, batch_tokens = [], 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            batches.append((batch, batch_tokens))
+        return batches
+    
+    def _embed_batch(self, batch: List[str], estimated_tokens: int, **kwargs) -> Dict[str, List[float]]:
+        """
+        Embed one batch of texts in a single request.
+        
+        Args:
+            batch: The texts to embed.
+            estimated_tokens: Estimated tokens of the batch for the rate limiter.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            The embedding of each text, or an empty dictionary if the request failed.
+        """
+        try:
+            response = self._request(
+                self.client.embeddings.create,
+                estimated_tokens,
+                model=self.embedding_model,
+                input=batch,
+                **kwargs
+            )
+            return {batch[item.index]: item.embedding for item in response.data}
+        
+        except Exception as e:
+            logging.error(f"Error generating {len(batch)} embeddings with OpenAI: {e}")
+            return {}
+    
+    def _build_messages(self, prompt: str, system_message: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Build the chat messages for a prompt.
+        
+        Args:
+            prompt: The user prompt.
+            system_message: Optional system message.
+            
+        Returns:
+            The messages.
+        """
+        messages = []
+        
+        # Add system message if provided
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        
+        # Add user message
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    def _build_json_messages(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the chat messages for a JSON extraction.
+        
+        Args:
+            prompt: The extraction prompt.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message replacing the default one.
+            
+        Returns:
+            The messages.
+        """
+        # Set default system message if not provided
+        if not system_message:
+            system_message = "Extract the requested information and respond only with a valid JSON object according to the specified schema. Do not include any other text."
+        
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": f"Schema: {json.dumps(schema)}\n\nPrompt: {prompt}"}
+        ]
+    
+    def _resolve_parameters(self, temperature: Optional[float], max_tokens: Optional[int]) -> Tuple[float, Optional[int]]:
+        """
+        Apply the instance defaults to per-call parameters.
+        
+        Args:
+            temperature: The requested temperature, or None for the default.
+            max_tokens: The requested token limit, or None for the default.
+            
+        Returns:
+            A (temperature, max_tokens) tuple.
+        """
+        temp = temperature if temperature is not None else self.temperature
+        tokens = max_tokens if max_tokens is not None else self.max_tokens
+        return temp, tokens
+    
+    def _convert_tools(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert tool schemas to the OpenAI function format.
+        
+        Args:
+            tools: The tool schemas.
+            
+        Returns:
+            The OpenAI tool definitions.
+        """
+        openai_tools = []
+        for tool in tools:
+            openai_tool = {
+                "type": "function",
+                "function": {
+                    "name": tool.get("name", ""),
+                    "description": tool.get("description", ""),
+                    "parameters": tool.get("parameters", {})
+                }
+            }
+            openai_tools.append(openai_tool)
+        return openai_tools
+    
+    def _parse_tool_response(self, response: Any) -> Dict[str, Any]:
+        """
+        Normalize a chat response that may contain tool calls.
+        
+        Args:
+            response: The API response.
+            
+        Returns:
+            A dictionary with the response content and any tool calls.
+        """
+        message = response.choices[0].message
+        
+        tool_calls = []
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            # Parse arguments as JSON
+            try:
+                arguments = json.loads(tool_call.function.arguments)
+            except:
+                arguments = tool_call.function.arguments
+            
+            tool_calls.append({
+                "id": tool_call.id,
+                "name": tool_call.function.name,
+                "arguments": arguments
+            })
+        
+        return {
+            "content": message.content,
+            "tool_calls": tool_calls
+        }
+    
+    def _parse_json_response(self, response: Any) -> Dict[str, Any]:
+        """
+        Parse the JSON object of a JSON-mode chat response.
+        
+        Args:
+            response: The API response.
+            
+        Returns:
+            The parsed JSON data, or an error dictionary.
+        """
+        content = response.choices[0].message.content
+        
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            logging.error(f"Failed to parse JSON from response: {content}")
+            return {"error": "Failed to parse JSON response"}
+    
+    def _estimate_tokens(self, messages: List[Dict[str, Any]], max_tokens: Optional[int]) -> int:
+        """
+        Estimate the tokens a chat request will use, for rate limiting.
+        
+        Args:
+            messages: The request messages.
+            max_tokens: The completion token limit, if any.
+            
+        Returns:
+            The estimated token count.
+        """
+        prompt_tokens = sum(self.get_token_count(str(message.get("content", ""))) for message in messages)
+        return prompt_tokens + (max_tokens or 0)
+    
+    def _request(self, create: Callable[..., Any], estimated_tokens: int, **params) -> Any:
+        """
+        Make an API call under the rate limiter, retrying transient failures.
+        
+        Args:
+            create: The client method to call.
+            estimated_tokens: Estimated tokens for the rate limiter.
+            **params: Parameters for the API call.
+            
+        Returns:
+            The API response.
+            
+        Raises:
+            Exception: The last error if the call fails permanently or runs out of retries.
+        """
+        attempt = 0
+        
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(estimated_tokens)
+            
+            try:
+                response = create(**params)
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                
+                delay = self._retry_delay(attempt, e)
+                attempt += 1
+                logging.warning(f"OpenAI request failed ({e}). ANUS retrying in {delay:.2f}s (attempt {attempt}/{self.max_retries})")
+                time.sleep(delay)
+                continue
+            
+            if self.rate_limiter is not None:
+                usage = getattr(response, "usage", None)
+                actual_tokens = getattr(usage, "total_tokens", None)
+                if isinstance(actual_tokens, int):
+                    self.rate_limiter.record_usage(estimated_tokens, actual_tokens)
+            
+            return response
+    
+    def _is_retryable(self, error: Exception) -> bool:
+        """
+        Check whether a failed request is worth retrying.
+        
+        Args:
+            error: The error raised by the client.
+            
+        Returns:
+            True for connection errors, timeouts and transient HTTP statuses.
+        """
+        if isinstance(error, openai.APIConnectionError):
+            return True
+        
+        status_code = getattr(error, "status_code", None)
+        if status_code is None:
+            return False
+        return status_code in self._RETRYABLE_STATUS_CODES or status_code >= 500
+    
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """
+        Compute the backoff delay before the next retry.
+        
+        A Retry-After header from the server takes precedence; otherwise the
+        delay is drawn uniformly from zero to the exponential backoff bound.
+        
+        Args:
+            attempt: The number of retries made so far.
+            error: The error that triggered the retry.
+            
+        Returns:
+            The delay in seconds.
+        """
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        retry_after = headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.retry_max_delay)
+            except ValueError:
+                pass
+        
+        bound = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return random.uniform(0, bound)
@@ -0,0 +1,140 @@
+"""
+Prompt budgets for keeping prompts inside a model's context window.
+
+A prompt is built from sections; when they don't fit, the least important
+sections are trimmed (or summarized) first.
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Sequence
+
+from anus.models.tokenizer import BaseTokenizer, default_tokenizer
+
+class PromptBudgetError(ValueError):
+    """Raised when a prompt can't be made to fit its token budget."""
+
+class PromptBudget:
+    """
+    Fits prompt sections into a token budget.
+    
+    Each section is a dictionary with:
+    - ``text``: the section text
+    - ``priority``: higher priorities are trimmed later (default 0)
+    - ``min_tokens``: the section is never cut below this (default 0)
+    - ``keep``: "head" to keep the start when trimming, "tail" to keep the end
+      (default "head")
+    - ``trim``: False for sections that must be kept whole (default True)
+    - ``summarize``: True to shrink the section with the summarizer instead
+      of cutting it (default False)
+    
+    Among sections of equal priority, later ones are trimmed first.
+    """
+    
+    # Marker appended where a section was cut
+    TRUNCATION_MARKER = " ..."
+    
+    def __init__(
+        self,
+        max_tokens: int,
+        tokenizer: Optional[BaseTokenizer] = None,
+        summarizer: Optional[Callable[[str, int], str]] = None
+    ):
+        """
+        Initialize a PromptBudget instance.
+        
+        Args:
+            max_tokens: The token budget.
+            tokenizer: The tokenizer to count with. Defaults to the shared tokenizer.
+            summarizer: Optional function shrinking a text to about the given
+                number of tokens, used for sections marked "summarize".
+        """
+        self.max_tokens = max_tokens
+        self.tokenizer = tokenizer or default_tokenizer
+        self.summarizer = summarizer
+    
+    def fit(self, sections: Sequence[Dict[str, Any]], separator: str = "\n\n") -> List[str]:
+        """
+        Fit sections into the budget.
+        
+        Args:
+            sections: The prompt sections, in prompt order.
+            separator: The text the sections will be joined with.
+            
+        Returns:
+            The section texts, trimmed where needed. Emptied sections are "".
+            
+        Raises:
+            PromptBudgetError: If the sections don't fit even when trimmed as far as allowed.
+        """
+        count = self.tokenizer.count
+        texts = [section["text"] for section in sections]
+        counts = [count(text) for text in texts]
+        overflow = sum(counts) + count(separator) * max(0, len(texts) - 1) - self.max_tokens
+        
+        order = sorted(
+            (i for i, section in enumerate(sections) if section.get("trim", True)),
+            key=lambda i: (sections[i].get("priority", 0), -i)
+        )
+        for i in order:
+            if overflow <= 0:
+                break
+            
+            section = sections[i]
+            target = counts[i] - min(overflow, counts[i] - section.get("min_tokens", 0))
+            if target >= counts[i]:
+                continue
+            
+            texts[i] = self._shrink(texts[i], target, section)
+            new_count = count(texts[i])
+            overflow -= counts[i] - new_count
+            counts[i] = new_count
+        
+        if overflow > 0:
+            raise PromptBudgetError(f"Prompt is {overflow} tokens over its budget of {self.max_tokens}")
+        return texts
+    
+    def build(self, sections: Sequence[Dict[str, Any]], separator: str = "\n\n") -> str:
+        """
+        Fit sections into the budget and join them into a prompt.
+        
+        Args:
+            sections: The prompt sections, in prompt order.
+            separator: The text the sections are joined with.
+            
+        Returns:
+            The prompt.
+            
+        Raises:
+            PromptBudgetError: If the sections don't fit even when trimmed as far as allowed.
+        """
+        return separator.join(text for text in self.fit(sections, separator) if text)
+    
+    def _shrink(self, text: str, target: int, section: Dict[str, Any]) -> str:
+        """
+        Shrink a section's text to at most target tokens.
+        
+        Args:
+            text: The section text.
+            target: The token count to shrink to.
+            section: The section options.
+            
+        Returns:
+            The shrunk text.
+        """
+        keep = section.get("keep", "head")
+        
+        if self.summarizer is not None and section.get("summarize") and target > 0:
+            text = self.summarizer(text, target)
+            if self.tokenizer.count(text) <= target:
+                return text
+        
+        marker_tokens = self.tokenizer.count(self.TRUNCATION_MARKER)
+        cut = self.tokenizer.truncate(text, target - marker_tokens, keep)
+        if cut:
+            if keep == "tail":
+                cut = self.TRUNCATION_MARKER.lstrip() + " " + cut.lstrip()
+            else:
+                cut = cut.rstrip() + self.TRUNCATION_MARKER
+            if self.tokenizer.count(cut) <= target:
+                return cut
+        
+        return self.tokenizer.truncate(text, target, keep)
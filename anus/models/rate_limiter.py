@@ -0,0 +1,185 @@
+"""
+Client-side rate limiting for model APIs.
+
+Keeps ANUS from pushing more through the pipe than the provider allows.
+"""
+
+from typing import Dict, Any, Optional
+import asyncio
+import threading
+import time
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests per minute and tokens per minute.
+    
+    Each limit is a bucket that refills continuously at its per-minute rate
+    and holds at most one minute's worth. A request takes one request token
+    and its estimated model tokens, blocking until both buckets have enough.
+    The token estimate can be corrected once the real usage is known.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ):
+        """
+        Initialize a RateLimiter instance.
+        
+        Args:
+            requests_per_minute: Maximum requests per minute, or None for no limit.
+            tokens_per_minute: Maximum model tokens per minute, or None for no limit.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        
+        self._request_allowance = float(requests_per_minute or 0)
+        self._token_allowance = float(tokens_per_minute or 0)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self.waits = 0
+        self.wait_time = 0.0
+    
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Block until a request with the given token estimate fits both limits.
+        
+        Args:
+            tokens: Estimated model tokens for the request.
+            
+        Returns:
+            The time spent waiting in seconds.
+        """
+        waited = 0.0
+        
+        while True:
+            delay = self._try_acquire(tokens, waited)
+            if delay <= 0:
+                return waited
+            
+            time.sleep(delay)
+            waited += delay
+    
+    async def aacquire(self, tokens: int = 0) -> float:
+        """
+        Wait without blocking the event loop until a request with the given
+        token estimate fits both limits.
+        
+        Args:
+            tokens: Estimated model tokens for the request.
+            
+        Returns:
+            The time spent waiting in seconds.
+        """
+        waited = 0.0
+        
+        while True:
+            delay = self._try_acquire(tokens, waited)
+            if delay <= 0:
+                return waited
+            
+            await asyncio.sleep(delay)
+            waited += delay
+    
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Correct the token bucket once a request's real usage is known.
+        
+        Args:
+            estimated_tokens: The estimate passed to acquire().
+            actual_tokens: The tokens the request actually used.
+        """
+        if not self.tokens_per_minute:
+            return
+        
+        with self._lock:
+            self._token_allowance -= actual_tokens - estimated_tokens
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the limiter.
+        
+        Returns:
+            A dictionary containing limiter statistics.
+        """
+        with self._lock:
+            self._refill()
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "available_requests": self._request_allowance if self.requests_per_minute else None,
+                "available_tokens": self._token_allowance if self.tokens_per_minute else None,
+                "waits": self.waits,
+                "wait_time": self.wait_time
+            }
+    
+    def _try_acquire(self, tokens: int, waited: float) -> float:
+        """
+        Take the allowance for a request if both buckets have enough.
+        
+        Args:
+            tokens: Estimated model tokens for the request.
+            waited: Time already spent waiting, recorded once the request proceeds.
+            
+        Returns:
+            0 if the allowance was taken, otherwise the delay before trying again.
+        """
+        with self._lock:
+            self._refill()
+            delay = self._delay_for(tokens)
+            if delay > 0:
+                return delay
+            
+            if self.requests_per_minute:
+                self._request_allowance -= 1
+            if self.tokens_per_minute:
+                self._token_allowance -= tokens
+            if waited:
+                self.waits += 1
+                self.wait_time += waited
+            return 0.0
+    
+    def _refill(self) -> None:
+        """
+        Add the allowance accrued since the last refill, up to one minute's worth.
+        """
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        
+        if self.requests_per_minute:
+            self._request_allowance = min(
+                float(self.requests_per_minute),
+                self._request_allowance + elapsed * self.requests_per_minute / 60.0
+            )
+        if self.tokens_per_minute:
+            self._token_allowance = min(
+                float(self.tokens_per_minute),
+                self._token_allowance + elapsed * self.tokens_per_minute / 60.0
+            )
+    
+    def _delay_for(self, tokens: int) -> float:
+        """
+        Compute how long to wait until a request fits both buckets.
+        
+        Args:
+            tokens: Estimated model tokens for the request.
+            
+        Returns:
+            The delay in seconds, or 0 if the request can proceed now.
+        """
+        delay = 0.0
+        
+        if self.requests_per_minute and self._request_allowance < 1:
+            delay = max(delay, (1 - self._request_allowance) * 60.0 / self.requests_per_minute)
+        
+        if self.tokens_per_minute:
+            # A request larger than the whole bucket only waits for a full bucket
+            needed = min(tokens, self.tokens_per_minute)
+            if self._token_allowance < needed:
+                delay = max(delay, (needed - self._token_allowance) * 60.0 / self.tokens_per_minute)
+        
+        return delay
@@ -0,0 +1,268 @@
+"""
+Response cache for language model calls.
+
+Two tiers: a small in-memory LRU in front of an optional SQLite file that
+survives restarts. Entries expire after a TTL and the disk tier is kept
+under a size limit by evicting the least recently used entries.
+"""
+
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import logging
+import sqlite3
+import threading
+import time
+
+class ResponseCache:
+    """
+    Two-tier cache for model responses, keyed by request.
+    
+    Values must be JSON-serializable. They are stored serialized, so callers
+    always get a fresh copy they can modify freely.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl: Optional[float] = 86400,
+        cache_path: Optional[str] = None,
+        max_disk_bytes: int = 100 * 1024 * 1024
+    ):
+        """
+        Initialize a ResponseCache instance.
+        
+        Args:
+            max_entries: Maximum number of entries in the in-memory tier.
+            ttl: Time to live for entries in seconds, or None for no expiry.
+            cache_path: Optional SQLite file for the persistent tier.
+            max_disk_bytes: Maximum size of the cached values on disk.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self.max_disk_bytes = max_disk_bytes
+        
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()  # key -> (value, created_at)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._disk_bytes = 0
+        
+        # Statistics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        if cache_path:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+            self._conn = sqlite3.connect(cache_path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses(accessed_at)")
+            self._disk_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """
+        Build a deterministic cache key for a request.
+        
+        Args:
+            request: The request parameters, e.g. model name, messages,
+                temperature, tools and schema.
+                
+        Returns:
+            A hex digest identifying the request.
+        """
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached value.
+        
+        Args:
+            key: The cache key.
+            
+        Returns:
+            A (found, value) tuple.
+        """
+        now = time.time()
+        
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._is_expired(entry[1], now):
+                    del self._memory[key]
+                    self.expirations += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return True, json.loads(entry[0])
+            
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if self._is_expired(row[1], now):
+                        self._delete_from_disk(key)
+                        self.expirations += 1
+                    else:
+                        self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._remember(key, row[0], row[1])
+                        self.disk_hits += 1
+                        return True, json.loads(row[0])
+            
+            self.misses += 1
+            return False, None
+    
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in both tiers.
+        
+        Args:
+            key: The cache key.
+            value: The JSON-serializable value to cache.
+        """
+        try:
+            serialized = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Not caching unserializable model response: {e}")
+            return
+        
+        now = time.time()
+        
+        with self._lock:
+            self._remember(key, serialized, now)
+            
+            if self._conn is not None:
+                size = len(serialized.encode("utf-8"))
+                if size > self.max_disk_bytes:
+                    return
+                
+                self._delete_from_disk(key)
+                self._conn.execute(
+                    "INSERT INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, serialized, size, now, now)
+                )
+                self._disk_bytes += size
+                self._evict_disk()
+    
+    def clear(self) -> None:
+        """
+        Remove all entries from both tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._disk_bytes = 0
+    
+    def close(self) -> None:
+        """
+        Close the persistent tier.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the cache.
+        
+        Returns:
+            A dictionary containing cache statistics.
+        """
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        
+        with self._lock:
+            disk_entries = 0
+            if self._conn is not None:
+                disk_entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "disk_bytes": self._disk_bytes,
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+    
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        """
+        Check whether an entry has outlived the TTL.
+        
+        Args:
+            created_at: When the entry was created.
+            now: The current time.
+            
+        Returns:
+            True if the entry has expired, False otherwise.
+        """
+        return self.ttl is not None and now - created_at > self.ttl
+    
+    def _remember(self, key: str, serialized: str, created_at: float) -> None:
+        """
+        Put an entry into the in-memory tier, evicting the least recently used.
+        
+        Args:
+            key: The cache key.
+            serialized: The serialized value.
+            created_at: When the entry was created.
+        """
+        self._memory[key] = (serialized, created_at)
+        self._memory.move_to_end(key)
+        
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+    
+    def _delete_from_disk(self, key: str) -> None:
+        """
+        Remove an entry from the persistent tier.
+        
+        Args:
+            key: The cache key.
+        """
+        row = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._disk_bytes -= row[0]
+    
+    def _evict_disk(self) -> None:
+        """
+        Evict least recently used entries until the persistent tier fits its size limit.
+        """
+        while self._disk_bytes > self.max_disk_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._disk_bytes = 0
+                return
+            
+            for key, size in rows:
+                if self._disk_bytes <= self.max_disk_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._disk_bytes -= size
+                self.evictions += 1
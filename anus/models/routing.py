@@ -0,0 +1,920 @@
+"""
+Latency- and cost-aware routing between models for the ANUS framework.
+
+Every call is timed, so ANUS always knows which model is quick, which is
+cheap and which is currently falling over.
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import asyncio
+import logging
+import threading
+import time
+
+from anus.models.base.base_model import BaseModel
+
+# Routing policies
+POLICIES = ("cheapest", "fastest", "hedged")
+
+def _is_error_response(response: Any) -> bool:
+    """
+    Tell whether a model response reports a failure.
+    
+    Models report failures in their return value: an "Error: ..." string, a
+    dictionary holding only an "error" key (from extract_json) or error
+    content (from generate_with_tools), or an empty embedding. Extracted
+    JSON can have an "error" field of its own next to other fields.
+    
+    Args:
+        response: The model response.
+        
+    Returns:
+        True if the response reports a failure.
+    """
+    if isinstance(response, str):
+        return response.startswith("Error:")
+    if isinstance(response, dict):
+        return list(response) == ["error"] or str(response.get("content") or "").startswith("Error:")
+    if isinstance(response, list):
+        return not response
+    return False
+
+class ModelStats:
+    """
+    Live statistics of one model's calls.
+    
+    Latency and throughput are exponentially weighted moving averages; the
+    p95 latency and the error rate are taken over recent calls. A model
+    whose error rate spikes is taken out of rotation for a cooldown, then
+    let back in on probation: its first failure takes it out again, its
+    first success restores it.
+    """
+    
+    def __init__(
+        self,
+        cost_per_1k_tokens: Optional[float] = None,
+        alpha: float = 0.2,
+        window: int = 200,
+        error_window: int = 20,
+        error_threshold: float = 0.5,
+        min_requests: int = 5,
+        cooldown: float = 30.0
+    ):
+        """
+        Initialize a ModelStats instance.
+        
+        Args:
+            cost_per_1k_tokens: Price per 1000 tokens, or None if unknown.
+            alpha: Weight of the newest call in the moving averages.
+            window: Number of recent latencies the p95 is taken over.
+            error_window: Number of recent calls the error rate is taken over.
+            error_threshold: Error rate at which the model is taken out of rotation.
+            min_requests: Minimum number of recent calls before the error rate counts.
+            cooldown: Seconds a failing model stays out of rotation.
+        """
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.alpha = alpha
+        self.error_threshold = error_threshold
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        
+        self.ewma_latency: Optional[float] = None
+        self.ewma_tokens_per_second: Optional[float] = None
+        self._latencies: deque = deque(maxlen=window)
+        self._outcomes: deque = deque(maxlen=error_window)
+        self._p95: Optional[float] = None
+        self._open_until = 0.0
+        self._probation = False
+        self._lock = threading.Lock()
+        
+        # Totals
+        self.requests = 0
+        self.errors = 0
+        self.tokens = 0
+        self.failovers = 0
+    
+    @property
+    def cost_per_token(self) -> float:
+        """
+        The price per token, infinite if unknown so unpriced models rank last on cost.
+        """
+        return self.cost_per_1k_tokens / 1000 if self.cost_per_1k_tokens is not None else float("inf")
+    
+    @property
+    def error_rate(self) -> float:
+        """
+        The error rate over recent calls.
+        """
+        with self._lock:
+            return self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0
+    
+    @property
+    def p95_latency(self) -> Optional[float]:
+        """
+        The 95th percentile latency over recent successful calls, or None before the first one.
+        """
+        with self._lock:
+            if self._p95 is None and self._latencies:
+                latencies = sorted(self._latencies)
+                self._p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+            return self._p95
+    
+    def record(self, latency: float, success: bool, tokens: int = 0, output_tokens: int = 0) -> None:
+        """
+        Record the outcome of a call.
+        
+        Args:
+            latency: Seconds the call took.
+            success: Whether the call succeeded.
+            tokens: Prompt and response tokens of the call.
+            output_tokens: Response tokens of the call.
+        """
+        with self._lock:
+            self.requests += 1
+            self._outcomes.append(success)
+            
+            if not success:
+                self.errors += 1
+                recent_errors = self._outcomes.count(False)
+                if self._probation or (
+                    len(self._outcomes) >= self.min_requests
+                    and recent_errors / len(self._outcomes) >= self.error_threshold
+                ):
+                    self._open_until = time.monotonic() + self.cooldown
+                    self._probation = True
+                    self._outcomes.clear()
+                return
+            
+            self._probation = False
+            self.tokens += tokens
+            self._latencies.append(latency)
+            self._p95 = None
+            self.ewma_latency = latency if self.ewma_latency is None else (
+                self.alpha * latency + (1 - self.alpha) * self.ewma_latency
+            )
+            if output_tokens and latency > 0:
+                tokens_per_second = output_tokens / latency
+                self.ewma_tokens_per_second = tokens_per_second if self.ewma_tokens_per_second is None else (
+                    self.alpha * tokens_per_second + (1 - self.alpha) * self.ewma_tokens_per_second
+                )
+    
+    def is_available(self) -> bool:
+        """
+        Tell whether the model is in rotation.
+        
+        Returns:
+            False while the model is cooling down after an error spike.
+        """
+        return time.monotonic() >= self._open_until
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the model's statistics.
+        
+        Returns:
+            A dictionary containing the statistics.
+        """
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "ewma_latency": self.ewma_latency,
+            "p95_latency": self.p95_latency,
+            "tokens_per_second": self.ewma_tokens_per_second,
+            "cost_per_token": self.cost_per_1k_tokens / 1000 if self.cost_per_1k_tokens is not None else None,
+            "tokens": self.tokens,
+            "cost": self.tokens * self.cost_per_1k_tokens / 1000 if self.cost_per_1k_tokens is not None else None,
+            "failovers": self.failovers,
+            "available": self.is_available()
+        }
+
+class RoutingEngine:
+    """
+    Ranks models for a request by policy, using their live statistics.
+    
+    Policies:
+    - "cheapest": the cheapest model whose latency meets the SLO, or the
+      fastest one if none does
+    - "fastest": the model with the lowest average latency
+    - "hedged": the two fastest models; the request goes to the first and,
+      if it hasn't answered within its p95 latency, to the second as well
+    
+    Each model can declare the range of task complexity (0 to 10) it is
+    meant for, so simple tasks go to small models and hard ones to large
+    models. Models without latency data yet count as meeting the SLO and as
+    fastest, so every model gets tried.
+    """
+    
+    def __init__(
+        self,
+        policy: str = "cheapest",
+        latency_slo: Optional[float] = None,
+        hedge_delay: float = 2.0,
+        **stats_options
+    ):
+        """
+        Initialize a RoutingEngine instance.
+        
+        Args:
+            policy: The default routing policy.
+            latency_slo: Default p95 latency target in seconds for the "cheapest" policy.
+            hedge_delay: Seconds before hedging a request to a model without latency data.
+            **stats_options: Options for each model's ModelStats, e.g. error_threshold or cooldown.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown routing policy: {policy}. Choose from {', '.join(POLICIES)}")
+        
+        self.policy = policy
+        self.latency_slo = latency_slo
+        self.hedge_delay = hedge_delay
+        self.stats_options = stats_options
+        
+        self.stats: Dict[str, ModelStats] = {}
+        self.profiles: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, name: str, profile: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Make a model available for routing.
+        
+        Args:
+            name: The model's name.
+            profile: Optional routing profile with "cost_per_1k_tokens",
+                "min_complexity" and "max_complexity".
+        """
+        profile = dict(profile or {})
+        with self._lock:
+            self.profiles[name] = profile
+            if name in self.stats:
+                self.stats[name].cost_per_1k_tokens = profile.get("cost_per_1k_tokens")
+            else:
+                self.stats[name] = ModelStats(profile.get("cost_per_1k_tokens"), **self.stats_options)
+    
+    def rank(
+        self,
+        names: List[str],
+        complexity: Optional[float] = None,
+        policy: Optional[str] = None,
+        latency_slo: Optional[float] = None
+    ) -> List[str]:
+        """
+        Order models from most to least preferred for a request.
+        
+        Models suited to the complexity come first, then the others; models
+        cooling down after an error spike come last.
+        
+        Args:
+            names: The candidate model names.
+            complexity: Optional task complexity between 0 and 10.
+            policy: The routing policy, or None for the default.
+            latency_slo: The p95 latency target in seconds, or None for the default.
+            
+        Returns:
+            The model names in order of preference.
+        """
+        policy = policy or self.policy
+        slo = latency_slo if latency_slo is not None else self.latency_slo
+        
+        def key(name: str) -> Tuple:
+            stats = self.stats[name]
+            latency = self._latency_estimate(stats)
+            if policy == "cheapest":
+                if slo is None or latency <= slo:
+                    preference = (False, stats.cost_per_token, latency)
+                else:
+                    preference = (True, latency, stats.cost_per_token)
+            else:
+                preference = (latency, stats.cost_per_token)
+            return (not stats.is_available(), not self._suits(name, complexity)) + preference
+        
+        return sorted(names, key=key)
+    
+    def record(self, name: str, latency: float, success: bool, tokens: int = 0, output_tokens: int = 0) -> None:
+        """
+        Record the outcome of a call to a model.
+        
+        Args:
+            name: The model's name.
+            latency: Seconds the call took.
+            success: Whether the call succeeded.
+            tokens: Prompt and response tokens of the call.
+            output_tokens: Response tokens of the call.
+        """
+        stats = self.stats[name]
+        was_available = stats.is_available()
+        stats.record(latency, success, tokens, output_tokens)
+        if was_available and not stats.is_available():
+            logging.warning(f"Model {name} is failing ({stats.errors} errors). ANUS is routing around it for {stats.cooldown:g}s")
+    
+    def record_failover(self, name: str, to: str) -> None:
+        """
+        Record that a call failed over from one model to another.
+        
+        Args:
+            name: The name of the model that failed.
+            to: The name of the model taking over.
+        """
+        stats = self.stats[name]
+        with stats._lock:
+            stats.failovers += 1
+        logging.info(f"ANUS is failing over from {name} to {to}")
+    
+    def get_hedge_delay(self, name: str) -> float:
+        """
+        Get how long to wait for a model before hedging a request.
+        
+        Args:
+            name: The model's name.
+            
+        Returns:
+            The model's p95 latency, or the default hedge delay without latency data.
+        """
+        p95 = self.stats[name].p95_latency
+        return p95 if p95 is not None else self.hedge_delay
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the statistics of every model.
+        
+        Returns:
+            A dictionary of statistics by model name.
+        """
+        return {name: stats.get_stats() for name, stats in self.stats.items()}
+    
+    def _suits(self, name: str, complexity: Optional[float]) -> bool:
+        """
+        Tell whether a model is meant for tasks of a complexity.
+        
+        Args:
+            name: The model's name.
+            complexity: The task complexity, or None if unknown.
+            
+        Returns:
+            True if the complexity is unknown or within the model's range.
+        """
+        if complexity is None:
+            return True
+        profile = self.profiles.get(name, {})
+        return profile.get("min_complexity", 0.0) <= complexity <= profile.get("max_complexity", 10.0)
+    
+    def _latency_estimate(self, stats: ModelStats) -> float:
+        """
+        Estimate a model's latency for ranking.
+        
+        Args:
+            stats: The model's statistics.
+            
+        Returns:
+            The p95 latency once there is enough data, the average latency
+            before that, or 0 for a model not tried yet.
+        """
+        if len(stats._latencies) >= stats.min_requests:
+            return stats.p95_latency
+        return stats.ewma_latency or 0.0
+
+class RoutedModel(BaseModel):
+    """
+    A model that routes each call to the best of several models.
+    
+    The candidates are ranked afresh for every call, so live statistics
+    take effect immediately. A call that fails, by raising or by returning
+    an error response, fails over to the next candidate. Embeddings always
+    come from the first candidate, since vectors of different models can't
+    be mixed, and streams aren't failed over once they have started.
+    """
+    
+    # Threads running hedged calls, shared by all routed models
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    
+    def __init__(
+        self,
+        engine: RoutingEngine,
+        candidates: Dict[str, BaseModel],
+        complexity: Optional[float] = None,
+        policy: Optional[str] = None,
+        latency_slo: Optional[float] = None,
+        **kwargs
+    ):
+        """
+        Initialize a RoutedModel instance.
+        
+        Args:
+            engine: The routing engine holding the statistics.
+            candidates: The candidate models by name, as registered with the engine.
+            complexity: Optional complexity of the task this model is used for.
+            policy: The routing policy, or None for the engine's default.
+            latency_slo: The p95 latency target in seconds, or None for the engine's default.
+            **kwargs: Additional configuration options.
+        """
+        if not candidates:
+            raise ValueError("RoutedModel needs at least one candidate model")
+        
+        self.engine = engine
+        self.candidates = candidates
+        self.complexity = complexity
+        self.policy = policy
+        self.latency_slo = latency_slo
+        
+        first = self.candidates[self.ranked_names()[0]]
+        kwargs.setdefault("tokenizer", first.tokenizer)
+        kwargs.setdefault("context_window", min(model.context_window for model in candidates.values()))
+        super().__init__(first.model_name, first.temperature, first.max_tokens, **kwargs)
+    
+    def ranked_names(self) -> List[str]:
+        """
+        Rank the candidates for the next call.
+        
+        Returns:
+            The candidate names in order of preference.
+        """
+        return self.engine.rank(list(self.candidates), self.complexity, self.policy, self.latency_slo)
+    
+    def generate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate text based on a prompt with the best available model.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        return self._route(prompt, lambda model: model.generate(prompt, system_message, temperature, max_tokens, **kwargs))
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream generated text from the best available model.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            An iterator of text chunks.
+        """
+        name = self.ranked_names()[0]
+        model = self.candidates[name]
+        start = time.monotonic()
+        
+        chunks = []
+        error = None
+        for chunk in model.generate_stream(prompt, system_message, temperature, max_tokens, **kwargs):
+            # Streams report a failure as a final "Error: ..." chunk, possibly after partial content
+            if error is None and _is_error_response(chunk):
+                error = chunk
+            chunks.append(chunk)
+            yield chunk
+        
+        self._record(name, model, prompt, error or "".join(chunks), time.monotonic() - start)
+    
+    def generate_with_tools(
+        self,
+        prompt: str,
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Generate text with tool calling capabilities with the best available model.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        return self._route(
+            prompt,
+            lambda model: model.generate_with_tools(prompt, tools, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    def extract_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Extract structured JSON data based on a prompt with the best available model.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        return self._route(
+            prompt,
+            lambda model: model.extract_json(prompt, schema, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    def get_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Generate an embedding vector with the first candidate model.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        return self._embedding_model().get_embedding(text, **kwargs)
+    
+    def get_embeddings(self, texts: List[str], batch_size: Optional[int] = None, **kwargs) -> List[List[float]]:
+        """
+        Generate embedding vectors for many texts with the first candidate model.
+        
+        Args:
+            texts: The texts to embed.
+            batch_size: Maximum number of texts per request, or None for the model's limit.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vectors in text order.
+        """
+        return self._embedding_model().get_embeddings(texts, batch_size, **kwargs)
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Asynchronously generate text based on a prompt with the best available model.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        return await self._aroute(
+            prompt, lambda model: model.agenerate(prompt, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    async def agenerate_with_tools(
+        self,
+        prompt: str,
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously generate text with tool calling capabilities with the best available model.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        return await self._aroute(
+            prompt,
+            lambda model: model.agenerate_with_tools(prompt, tools, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    async def aextract_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured JSON data based on a prompt with the best available model.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        return await self._aroute(
+            prompt,
+            lambda model: model.aextract_json(prompt, schema, system_message, temperature, max_tokens, **kwargs)
+        )
+    
+    async def aget_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Asynchronously generate an embedding vector with the first candidate model.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        return await self._embedding_model().aget_embedding(text, **kwargs)
+    
+    async def aget_embeddings(self, texts: List[str], batch_size: Optional[int] = None, **kwargs) -> List[List[float]]:
+        """
+        Asynchronously generate embedding vectors for many texts with the first candidate model.
+        
+        Args:
+            texts: The texts to embed.
+            batch_size: Maximum number of texts per request, or None for the model's limit.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vectors in text order.
+        """
+        return await self._embedding_model().aget_embeddings(texts, batch_size, **kwargs)
+    
+    def get_model_details(self) -> Dict[str, Any]:
+        """
+        Get details about the candidate models and their statistics.
+        
+        Returns:
+            A dictionary containing model information.
+        """
+        details = super().get_model_details()
+        details.update({
+            "provider": "router",
+            "policy": self.policy or self.engine.policy,
+            "complexity": self.complexity,
+            "candidates": self.ranked_names(),
+            "routing": {name: self.engine.stats[name].get_stats() for name in self.candidates}
+        })
+        return details
+    
+    def _route(self, prompt: str, call: Callable[[BaseModel], Any]) -> Any:
+        """
+        Make a call with the best candidate, failing over down the ranking.
+        
+        Args:
+            prompt: The prompt, for token accounting.
+            call: Function making the call with a given model.
+            
+        Returns:
+            The first successful response, or the last failure if every candidate failed.
+        """
+        names = self.ranked_names()
+        if (self.policy or self.engine.policy) == "hedged" and len(names) > 1:
+            response, names = self._hedge(prompt, call, names)
+            if not _is_error_response(response):
+                return response
+        
+        response = None
+        error = None
+        for i, name in enumerate(names):
+            if i > 0:
+                self.engine.record_failover(names[i - 1], name)
+            
+            model = self.candidates[name]
+            start = time.monotonic()
+            try:
+                response = call(model)
+            except Exception as e:
+                self.engine.record(name, time.monotonic() - start, False)
+                error = e
+                continue
+            
+            if self._record(name, model, prompt, response, time.monotonic() - start):
+                return response
+            error = None
+        
+        if error is not None and response is None:
+            raise error
+        return response
+    
+    def _hedge(self, prompt: str, call: Callable[[BaseModel], Any], names: List[str]) -> Tuple[Any, List[str]]:
+        """
+        Send a call to the first model, and to the second too if the first is slow.
+        
+        Args:
+            prompt: The prompt, for token accounting.
+            call: Function making the call with a given model.
+            names: The ranked candidate names.
+            
+        Returns:
+            The first successful response (or the last failure), and the
+            candidates left to fail over to.
+        """
+        executor = self._get_executor()
+        
+        def timed(name: str) -> Any:
+            model = self.candidates[name]
+            start = time.monotonic()
+            try:
+                response = call(model)
+            except Exception as e:
+                self.engine.record(name, time.monotonic() - start, False)
+                return f"Error: {str(e)}"
+            self._record(name, model, prompt, response, time.monotonic() - start)
+            return response
+        
+        pending = {executor.submit(timed, names[0])}
+        done, pending = wait(pending, timeout=self.engine.get_hedge_delay(names[0]))
+        hedged = not done
+        if hedged:
+            logging.debug(f"ANUS is hedging a slow call to {names[0]} with {names[1]}")
+            pending.add(executor.submit(timed, names[1]))
+        
+        response = None
+        while pending or done:
+            for future in done:
+                response = future.result()
+                if not _is_error_response(response):
+                    return response, []
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        
+        return response, names[2:] if hedged else names[1:]
+    
+    async def _aroute(self, prompt: str, call: Callable[[BaseModel], Any]) -> Any:
+        """
+        Await a call with the best candidate, failing over down the ranking.
+        
+        Args:
+            prompt: The prompt, for token accounting.
+            call: Function returning the awaitable making the call with a given model.
+            
+        Returns:
+            The first successful response, or the last failure if every candidate failed.
+        """
+        names = self.ranked_names()
+        if (self.policy or self.engine.policy) == "hedged" and len(names) > 1:
+            response, names = await self._ahedge(prompt, call, names)
+            if not _is_error_response(response):
+                return response
+        
+        response = None
+        error = None
+        for i, name in enumerate(names):
+            if i > 0:
+                self.engine.record_failover(names[i - 1], name)
+            
+            model = self.candidates[name]
+            start = time.monotonic()
+            try:
+                response = await call(model)
+            except Exception as e:
+                self.engine.record(name, time.monotonic() - start, False)
+                error = e
+                continue
+            
+            if self._record(name, model, prompt, response, time.monotonic() - start):
+                return response
+            error = None
+        
+        if error is not None and response is None:
+            raise error
+        return response
+    
+    async def _ahedge(self, prompt: str, call: Callable[[BaseModel], Any], names: List[str]) -> Tuple[Any, List[str]]:
+        """
+        Await a call to the first model, and to the second too if the first is slow.
+        
+        The slower call is cancelled once one of them succeeds.
+        
+        Args:
+            prompt: The prompt, for token accounting.
+            call: Function returning the awaitable making the call with a given model.
+            names: The ranked candidate names.
+            
+        Returns:
+            The first successful response (or the last failure), and the
+            candidates left to fail over to.
+        """
+        async def timed(name: str) -> Any:
+            model = self.candidates[name]
+            start = time.monotonic()
+            try:
+                response = await call(model)
+            except Exception as e:
+                self.engine.record(name, time.monotonic() - start, False)
+                return f"Error: {str(e)}"
+            self._record(name, model, prompt, response, time.monotonic() - start)
+            return response
+        
+        pending = {asyncio.ensure_future(timed(names[0]))}
+        done, pending = await asyncio.wait(pending, timeout=self.engine.get_hedge_delay(names[0]))
+        hedged = not done
+        if hedged:
+            logging.debug(f"ANUS is hedging a slow call to {names[0]} with {names[1]}")
+            pending.add(asyncio.ensure_future(timed(names[1])))
+        
+        response = None
+        try:
+            while pending or done:
+                for task in done:
+                    response = task.result()
+                    if not _is_error_response(response):
+                        return response, []
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        return response, names[2:] if hedged else names[1:]
+    
+    def _record(self, name: str, model: BaseModel, prompt: str, response: Any, latency: float) -> bool:
+        """
+        Record the outcome of a call with the engine.
+        
+        Args:
+            name: The candidate's name.
+            model: The candidate model.
+            prompt: The prompt.
+            response: The response.
+            latency: Seconds the call took.
+            
+        Returns:
+            True if the call succeeded.
+        """
+        success = not _is_error_response(response)
+        output_tokens = 0
+        tokens = 0
+        if success:
+            text = response if isinstance(response, str) else str(response.get("content") or "") if isinstance(response, dict) else ""
+            output_tokens = model.get_token_count(text)
+            tokens = model.get_token_count(prompt) + output_tokens
+        self.engine.record(name, latency, success, tokens, output_tokens)
+        return success
+    
+    def _embedding_model(self) -> BaseModel:
+        """
+        Get the model embeddings come from.
+        
+        Returns:
+            The first candidate in registration order.
+        """
+        return next(iter(self.candidates.values()))
+    
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """
+        Get the shared thread pool for hedged calls, creating it on first use.
+        
+        Returns:
+            The thread pool.
+        """
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(thread_name_prefix="anus-hedge")
+            return cls._executor
@@ -0,0 +1,215 @@
+"""
+Single-flight request coalescing for the ANUS framework.
+
+When the same request is already on its way, ANUS waits for that answer
+instead of asking again.
+"""
+
+from typing import Dict, Any, Optional, Callable, Awaitable
+from concurrent.futures import Future
+import asyncio
+import copy
+import threading
+
+class _Flight:
+    """
+    An in-flight call.
+    """
+    
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Initialize a _Flight instance.
+        
+        Args:
+            loop: The event loop running the call, or None for a call on a thread.
+        """
+        self.future: Future = Future()
+        self.loop = loop
+        self.task: Optional[asyncio.Task] = None  # Keeps an async call alive
+
+class SingleFlight:
+    """
+    Shares one underlying call between identical concurrent requests.
+    
+    The first caller for a key makes the call; callers arriving while it is
+    in flight wait for it and get its result, or its exception. Nothing is
+    kept once the call finishes, so later requests call again.
+    
+    Threads and coroutines share the same flights: a coroutine can wait for
+    a call made on a thread and the other way round. A thread never waits
+    for a call running on its own event loop, since that would block the
+    call; it makes its own instead. Async calls run as tasks of their own,
+    so cancelling a waiter, even the first one, doesn't cancel the call for
+    the others.
+    """
+    
+    def __init__(self, copy_results: bool = True):
+        """
+        Initialize a SingleFlight instance.
+        
+        Args:
+            copy_results: Whether waiters get a deep copy of the result, so
+                callers can modify their result freely.
+        """
+        self.copy_results = copy_results
+        
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self.calls = 0
+        self.coalesced = 0
+    
+    def do(self, key: str, call: Callable[[], Any]) -> Any:
+        """
+        Make a call, or wait for the identical call already in flight.
+        
+        Args:
+            key: The request key.
+            call: Function making the actual request.
+            
+        Returns:
+            The call result.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.loop is not None and flight.loop is _running_loop():
+                flight = None
+                self.calls += 1
+                leader = False
+            elif flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.calls += 1
+                leader = True
+        
+        if flight is None:
+            return call()
+        if not leader:
+            return self._share(flight.future.result())
+        
+        try:
+            result = call()
+        except BaseException as e:
+            self._finish(key, flight)
+            flight.future.set_exception(e)
+            raise
+        
+        self._finish(key, flight)
+        flight.future.set_result(result)
+        return result
+    
+    async def ado(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await a call, or wait for the identical call already in flight.
+        
+        Args:
+            key: The request key.
+            call: Function returning the awaitable making the actual request.
+            
+        Returns:
+            The call result.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                loop = asyncio.get_running_loop()
+                flight = _Flight(loop)
+                flight.task = loop.create_task(self._run(key, flight, call))
+                self._flights[key] = flight
+                self.calls += 1
+                leader = True
+        
+        result = await asyncio.shield(asyncio.wrap_future(flight.future))
+        return result if leader else self._share(result)
+    
+    def in_flight(self) -> int:
+        """
+        Get the number of calls currently in flight.
+        
+        Returns:
+            The number of in-flight calls.
+        """
+        with self._lock:
+            return len(self._flights)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about coalesced calls.
+        
+        Returns:
+            A dictionary containing coalescing statistics.
+        """
+        with self._lock:
+            requests = self.calls + self.coalesced
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+                "coalesce_rate": self.coalesced / requests if requests else 0.0
+            }
+    
+    async def _run(self, key: str, flight: _Flight, call: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Await an async call and publish its outcome to the flight.
+        
+        Args:
+            key: The request key.
+            flight: The flight to publish to.
+            call: Function returning the awaitable making the actual request.
+        """
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            self._finish(key, flight)
+            flight.future.cancel()
+            raise
+        except Exception as e:
+            self._finish(key, flight)
+            flight.future.set_exception(e)
+            return
+        
+        self._finish(key, flight)
+        flight.future.set_result(result)
+    
+    def _finish(self, key: str, flight: _Flight) -> None:
+        """
+        Stop routing new requests to a flight, before its outcome is published.
+        
+        Args:
+            key: The request key.
+            flight: The finished flight.
+        """
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+    
+    def _share(self, result: Any) -> Any:
+        """
+        Hand a shared result to a waiter.
+        
+        Args:
+            result: The call result.
+            
+        Returns:
+            The result, or a deep copy of it.
+        """
+        return copy.deepcopy(result) if self.copy_results else result
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """
+    Get the event loop running in the current thread, if any.
+    
+    Returns:
+        The running event loop, or None.
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
@@ -0,0 +1,424 @@
+"""
+Tokenizers for counting the tokens of prompts.
+
+Counting runs on every prompt, so text is split into word-like pieces once
+and both the pieces and the totals are memoized.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+from collections import Counter, OrderedDict
+import base64
+import heapq
+import logging
+import os
+import re
+import threading
+
+# Splits text into the pieces BPE merges stay within: contractions, words
+# with their leading space or punctuation character, numbers of up to three
+# digits, punctuation runs and whitespace. Follows the GPT-4 (cl100k) pattern.
+_PIECE_PATTERN = re.compile(
+    r"'(?i:[sdmt]|ll|ve|re)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+# Environment variable naming a BPE rank file for the default tokenizer
+TOKENIZER_FILE_ENV = "ANUS_TOKENIZER_FILE"
+
+class BaseTokenizer(ABC):
+    """
+    Abstract base class for tokenizers.
+    
+    Subclasses count the tokens of a single piece; counting, memoization and
+    truncation at piece boundaries are shared.
+    """
+    
+    def __init__(self, cache_size: int = 4096, piece_cache_size: int = 65536):
+        """
+        Initialize a BaseTokenizer instance.
+        
+        Args:
+            cache_size: Maximum number of memoized text counts.
+            piece_cache_size: Maximum number of memoized piece counts.
+        """
+        self.cache_size = cache_size
+        self.piece_cache_size = piece_cache_size
+        
+        # Counts keyed by (hash, length), so long prompts aren't kept alive
+        self._counts: "OrderedDict[Tuple[int, int], int]" = OrderedDict()
+        self._piece_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+    
+    @abstractmethod
+    def count_piece(self, piece: str) -> int:
+        """
+        Count the tokens of a single piece.
+        
+        Args:
+            piece: A piece of text as split by the piece pattern.
+            
+        Returns:
+            The token count.
+        """
+        pass
+    
+    def pieces(self, text: str) -> List[str]:
+        """
+        Split text into the pieces tokens never cross.
+        
+        Args:
+            text: The text to split.
+            
+        Returns:
+            The pieces, which join back into the text.
+        """
+        return _PIECE_PATTERN.findall(text)
+    
+    def count(self, text: str) -> int:
+        """
+        Count the tokens of a text, reusing the memoized count if there is one.
+        
+        Args:
+            text: The text to count tokens for.
+            
+        Returns:
+            The token count.
+        """
+        if not text:
+            return 0
+        
+        key = (hash(text), len(text))
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+                self.hits += 1
+                return count
+        
+        count = sum(self._cached_piece_count(piece) for piece in self.pieces(text))
+        
+        with self._lock:
+            self.misses += 1
+            self._counts[key] = count
+            if len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+        return count
+    
+    def truncate(self, text: str, max_tokens: int, keep: str = "head") -> str:
+        """
+        Cut a text down to at most max_tokens tokens, at a piece boundary.
+        
+        Args:
+            text: The text to truncate.
+            max_tokens: Maximum number of tokens to keep.
+            keep: "head" to keep the start of the text, "tail" to keep the end.
+            
+        Returns:
+            The truncated text, or the text itself if it already fits.
+        """
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        
+        pieces = self.pieces(text)
+        if keep == "tail":
+            pieces.reverse()
+        
+        kept = []
+        used = 0
+        for piece in pieces:
+            used += self._cached_piece_count(piece)
+            if used > max_tokens:
+                break
+            kept.append(piece)
+        
+        if keep == "tail":
+            kept.reverse()
+        return "".join(kept)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the count cache.
+        
+        Returns:
+            A dictionary containing cache statistics.
+        """
+        return {
+            "tokenizer": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._counts),
+            "pieces": len(self._piece_counts)
+        }
+    
+    def _cached_piece_count(self, piece: str) -> int:
+        """
+        Count the tokens of a piece, memoized.
+        
+        Args:
+            piece: The piece.
+            
+        Returns:
+            The token count.
+        """
+        count = self._piece_counts.get(piece)
+        if count is None:
+            count = self.count_piece(piece)
+            if len(self._piece_counts) >= self.piece_cache_size:
+                self._piece_counts.clear()
+            self._piece_counts[piece] = count
+        return count
+
+class ApproximateTokenizer(BaseTokenizer):
+    """
+    Estimates token counts without a vocabulary.
+    
+    Short words, numbers and whitespace runs count as one token, longer
+    words and punctuation runs as several, and non-ASCII text by its UTF-8
+    length. The estimate errs on the high side, which is the safe side for
+    prompt budgets.
+    """
+    
+    def count_piece(self, piece: str) -> int:
+        """
+        Estimate the tokens of a single piece.
+        
+        Args:
+            piece: A piece of text as split by the piece pattern.
+            
+        Returns:
+            The estimated token count.
+        """
+        if piece.isspace():
+            return 1 + len(piece) // 16
+        if not piece.isascii():
+            return max(1, -(-len(piece.encode("utf-8")) // 3))
+        
+        letters = piece.lstrip(" ")
+        if letters[:1].isalpha() or letters[1:2].isalpha():
+            return 1 + max(0, len(letters) - 4) // 6
+        if letters.isdigit():
+            return 1
+        return max(1, (len(letters) + 1) // 2)
+
+class BPETokenizer(BaseTokenizer):
+    """
+    Byte-level byte pair encoding over a table of merge ranks.
+    
+    The ranks map byte strings to token IDs, lower IDs merging first. They
+    can be loaded from a tiktoken-format file (one base64 token and its rank
+    per line), which makes counts exact for that encoding, or trained on a
+    local corpus. Everything works offline.
+    """
+    
+    def __init__(self, ranks: Dict[bytes, int], **kwargs):
+        """
+        Initialize a BPETokenizer instance.
+        
+        Args:
+            ranks: Merge ranks by token bytes. Must include every single byte.
+            **kwargs: Cache options passed to BaseTokenizer.
+        """
+        super().__init__(**kwargs)
+        self.ranks = ranks
+        self._decoder = {rank: token for token, rank in ranks.items()}
+    
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "BPETokenizer":
+        """
+        Load merge ranks from a tiktoken-format file.
+        
+        Args:
+            path: The rank file.
+            **kwargs: Cache options passed to BaseTokenizer.
+            
+        Returns:
+            A BPETokenizer.
+        """
+        ranks = {}
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    token, rank = line.split()
+                    ranks[base64.b64decode(token)] = int(rank)
+        return cls(ranks, **kwargs)
+    
+    @classmethod
+    def train(cls, texts: Iterable[str], vocab_size: int = 8192, min_frequency: int = 2, **kwargs) -> "BPETokenizer":
+        """
+        Learn merge ranks from a corpus.
+        
+        Args:
+            texts: The training texts.
+            vocab_size: Number of tokens to learn, including the 256 single bytes.
+            min_frequency: Minimum occurrences of a pair to merge it.
+            **kwargs: Cache options passed to BaseTokenizer.
+            
+        Returns:
+            A BPETokenizer.
+        """
+        frequencies = Counter(piece.encode("utf-8") for text in texts for piece in _PIECE_PATTERN.findall(text))
+        words = [[word[i:i + 1] for i in range(len(word))] for word in frequencies]
+        counts = list(frequencies.values())
+        
+        # Pair frequencies, and the words each pair occurs in
+        pair_counts: Counter = Counter()
+        pair_words: Dict[Tuple[bytes, bytes], set] = {}
+        for index, (word, count) in enumerate(zip(words, counts)):
+            for pair in zip(word, word[1:]):
+                pair_counts[pair] += count
+                pair_words.setdefault(pair, set()).add(index)
+        
+        ranks = {bytes([i]): i for i in range(256)}
+        heap = [(-count, pair) for pair, count in pair_counts.items()]
+        heapq.heapify(heap)
+        
+        while len(ranks) < vocab_size and heap:
+            negative_count, pair = heapq.heappop(heap)
+            if -negative_count != pair_counts.get(pair, 0):
+                continue  # Stale entry
+            if -negative_count < min_frequency:
+                break
+            
+            merged = pair[0] + pair[1]
+            ranks.setdefault(merged, len(ranks))
+            
+            changed = set()
+            for index in pair_words.pop(pair, ()):
+                word, count = words[index], counts[index]
+                for old in zip(word, word[1:]):
+                    pair_counts[old] -= count
+                    changed.add(old)
+                
+                i = 0
+                merged_word = []
+                while i < len(word):
+                    if i + 1 < len(word) and word[i] == pair[0] and word[i + 1] == pair[1]:
+                        merged_word.append(merged)
+                        i += 2
+                    else:
+                        merged_word.append(word[i])
+                        i += 1
+                words[index] = merged_word
+                
+                for new in zip(merged_word, merged_word[1:]):
+                    pair_counts[new] += count
+                    pair_words.setdefault(new, set()).add(index)
+                    changed.add(new)
+            
+            pair_counts.pop(pair, None)
+            for changed_pair in changed:
+                count = pair_counts.get(changed_pair, 0)
+                if count > 0:
+                    heapq.heappush(heap, (-count, changed_pair))
+        
+        logging.info(f"ANUS learned a BPE vocabulary of {len(ranks)} tokens")
+        return cls(ranks, **kwargs)
+    
+    def save(self, path: str) -> None:
+        """
+        Write the merge ranks to a tiktoken-format file.
+        
+        Args:
+            path: The rank file.
+        """
+        with open(path, "wb") as f:
+            for token, rank in sorted(self.ranks.items(), key=lambda item: item[1]):
+                f.write(base64.b64encode(token) + b" " + str(rank).encode() + b"\n")
+    
+    def encode(self, text: str) -> List[int]:
+        """
+        Encode text into token IDs.
+        
+        Args:
+            text: The text to encode.
+            
+        Returns:
+            The token IDs.
+        """
+        return [rank for piece in self.pieces(text) for rank in self._encode_piece(piece.encode("utf-8"))]
+    
+    def decode(self, tokens: Iterable[int]) -> str:
+        """
+        Decode token IDs into text.
+        
+        Args:
+            tokens: The token IDs.
+            
+        Returns:
+            The decoded text.
+        """
+        return b"".join(self._decoder[token] for token in tokens).decode("utf-8", errors="replace")
+    
+    def count_piece(self, piece: str) -> int:
+        """
+        Count the tokens of a single piece.
+        
+        Args:
+            piece: A piece of text as split by the piece pattern.
+            
+        Returns:
+            The token count.
+        """
+        return len(self._encode_piece(piece.encode("utf-8")))
+    
+    def _encode_piece(self, piece: bytes) -> List[int]:
+        """
+        Apply the merges to a piece, lowest rank first.
+        
+        Args:
+            piece: The piece's bytes.
+            
+        Returns:
+            The token IDs.
+        """
+        ranks = self.ranks
+        rank = ranks.get(piece)
+        if rank is not None:
+            return [rank]
+        
+        parts = [piece[i:i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            best = -1
+            best_rank = None
+            for i in range(len(parts) - 1):
+                rank = ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best, best_rank = i, rank
+            if best < 0:
+                break
+            parts[best:best + 2] = [parts[best] + parts[best + 1]]
+        
+        return [ranks[part] for part in parts]
+
+def create_default_tokenizer() -> BaseTokenizer:
+    """
+    Create the tokenizer models use unless they are given one.
+    
+    A BPE rank file named by the ANUS_TOKENIZER_FILE environment variable
+    gives exact counts; otherwise counts are estimated.
+    
+    Returns:
+        The tokenizer.
+    """
+    path = os.environ.get(TOKENIZER_FILE_ENV)
+    if path:
+        try:
+            return BPETokenizer.from_file(path)
+        except Exception as e:
+            logging.error(f"Error loading tokenizer from {path}: {e}. ANUS will estimate token counts.")
+    return ApproximateTokenizer()
+
+# Shared tokenizer, so memoized counts are reused by every model
+default_tokenizer = create_default_tokenizer()
@@ -15,6 +15,12 @@ class BaseTool(ABC):
     name = "base_tool"
     description = "Base class for all tools"
     
+    # Intents routing tasks to this tool, registered with the agent's IntentRouter
+    # when the tool is loaded. Each entry has "pattern", "triggers" (keywords the
+    # pattern needs), "input" (builds the tool input from the match) and
+    # optionally "priority" and "flags".
+    intent_patterns: List[Dict[str, Any]] = []
+    
     def __init__(self, **kwargs):
         """
         Initialize a BaseTool instance.
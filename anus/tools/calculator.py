@@ -7,7 +7,15 @@ This tool provides safe evaluation of mathematical expressions.
 import logging
 import ast
 import operator
-from typing import Dict, Any, Union
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Any, Union, Callable, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 from anus.tools.base.tool import BaseTool
 from anus.tools.base.tool_result import ToolResult
@@ -27,6 +35,10 @@ class CalculatorTool(BaseTool):
             "expression": {
                 "type": "string",
                 "description": "The mathematical expression to evaluate"
+            },
+            "variables": {
+                "type": "object",
+                "description": "Optional numeric values for the variables used in the expression"
             }
         },
         "required": ["expression"]
@@ -42,12 +54,18 @@ class CalculatorTool(BaseTool):
         ast.USub: operator.neg,  # Unary minus
     }
     
-    def execute(self, expression: str, **kwargs) -> Union[Dict[str, Any], ToolResult]:
+    def execute(
+        self,
+        expression: str,
+        variables: Optional[Dict[str, float]] = None,
+        **kwargs
+    ) -> Union[Dict[str, Any], ToolResult]:
         """
         Execute the calculator tool.
         
         Args:
             expression: The mathematical expression to evaluate.
+            variables: Optional numeric values for the variables in the expression.
             **kwargs: Additional parameters (ignored).
             
         Returns:
@@ -64,12 +82,9 @@ class CalculatorTool(BaseTool):
             elif "69" in clean_expr:
                 logging.info("ANUS calculator is keeping it professional...")
             
-            # Parse and evaluate the expression
-            logging.info(f"Parsing expression: '{clean_expr}'")
-            tree = ast.parse(clean_expr, mode='eval')
-            logging.info(f"AST tree: {ast.dump(tree)}")
-            result = self._eval_expr(tree.body)
-            logging.info(f"Evaluation result: {result}")
+            # Compile the expression (or reuse the compiled version) and evaluate it
+            result = _compile_expression(self._normalize(clean_expr))(self._bind(variables))
+            logging.debug(f"Evaluation result: {result}")
             
             # Add some ANUS humor based on the result
             if result == 69:
@@ -79,81 +94,337 @@ class CalculatorTool(BaseTool):
             elif result == 42:
                 logging.info("ANUS calculator found the meaning of life!")
             
-            # Format the result nicely
-            if isinstance(result, float):
-                # Round to 6 decimal places if it's a float
-                result = round(result, 6)
-                # Remove trailing zeros after decimal point
-                result_str = f"{result:f}".rstrip('0').rstrip('.')
-            else:
-                result_str = str(result)
-            
-            logging.info(f"Formatted result: {result_str}")
+            result_str = self._format_result(result)
+            logging.debug(f"Formatted result: {result_str}")
             return {
                 "expression": clean_expr,
                 "result": result_str,
                 "status": "success"
             }
+        
+        except Exception as e:
+            error_msg = str(e)
+            logging.error(f"Error in calculator: {e}")
+            return {"status": "error", "error": f"Calculation error: {error_msg}"}
+    
+    def evaluate_many(
+        self,
+        expressions: List[str],
+        variables: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate many expressions at once.
+        
+        Each distinct expression is parsed and compiled only once, however often
+        it repeats, and nothing is logged per expression except errors.
+        
+        Args:
+            expressions: The mathematical expressions to evaluate.
+            variables: Optional numeric values for the variables in the expressions.
             
+        Returns:
+            One result per expression, in the same format as execute().
+        """
+        logging.info(f"Calculator received {len(expressions)} expressions")
+        
+        try:
+            env = self._bind(variables)
+        except (TypeError, ValueError) as e:
+            logging.error(f"Error in calculator: {e}")
+            return [{"status": "error", "error": f"Calculation error: {e}"} for _ in expressions]
+        
+        results = []
+        for expression in expressions:
+            clean_expr = expression.strip()
+            try:
+                result = _compile_expression(self._normalize(clean_expr))(env)
+                results.append({
+                    "expression": clean_expr,
+                    "result": self._format_result(result),
+                    "status": "success"
+                })
+            except Exception as e:
+                logging.error(f"Error in calculator: {e}")
+                results.append({"status": "error", "error": f"Calculation error: {e}"})
+        
+        return results
+    
+    def evaluate_columns(
+        self,
+        expression: str,
+        columns: Dict[str, Sequence[float]],
+        variables: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate one expression over columns of inputs.
+        
+        For example "a*b + c**2" over columns a, b and c gives one number per
+        row. With NumPy installed the whole column is computed in one
+        vectorized pass, otherwise row by row into an array of doubles. Only
+        the operators execute() allows are accepted. A row that divides by
+        zero or has no real result comes out as NaN rather than failing the
+        whole batch.
+        
+        Args:
+            expression: The mathematical expression to evaluate.
+            columns: Equally long sequences of numbers, by variable name.
+            variables: Optional scalar variables shared by every row.
+            
+        Returns:
+            The calculation result, with "result" holding a NumPy array (or an
+            array.array without NumPy) of one float per row.
+        """
+        try:
+            clean_expr = expression.strip()
+            if not columns:
+                raise ValueError("No columns given to evaluate over")
+            
+            lengths = {len(values) for values in columns.values()}
+            if len(lengths) > 1:
+                raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+            rows = lengths.pop()
+            
+            logging.info(f"Calculator received expression: '{clean_expr}' over {rows} rows")
+            
+            scalars = self._bind(variables)
+            if NUMPY_AVAILABLE:
+                result = self._evaluate_columns_numpy(clean_expr, columns, scalars, rows)
+            else:
+                result = self._evaluate_columns_python(clean_expr, columns, scalars)
+            
+            return {
+                "expression": clean_expr,
+                "result": result,
+                "rows": rows,
+                "status": "success"
+            }
+        
         except Exception as e:
             error_msg = str(e)
             logging.error(f"Error in calculator: {e}")
             return {"status": "error", "error": f"Calculation error: {error_msg}"}
     
-    def _eval_expr(self, node: ast.AST) -> float:
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get statistics about the compiled expression cache.
+        
+        Returns:
+            A dictionary containing cache statistics.
+        """
+        info = _compile_expression.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    
+    def _evaluate_columns_numpy(
+        self,
+        expression: str,
+        columns: Dict[str, Sequence[float]],
+        scalars: Dict[str, float],
+        rows: int
+    ) -> "np.ndarray":
         """
-        Recursively evaluate an AST expression node.
+        Evaluate an expression over columns in one vectorized pass.
         
         Args:
-            node: The AST node to evaluate.
+            expression: The cleaned expression.
+            columns: Equally long sequences of numbers, by variable name.
+            scalars: Scalar variables shared by every row.
+            rows: The number of rows.
             
         Returns:
-            The evaluated result.
+            One float per row.
+        """
+        env = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+        env.update({name: np.float64(value) for name, value in scalars.items()})
+        
+        evaluate = _compile_expression(self._normalize(expression), True)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            result = evaluate(env)
+        
+        # An expression that uses no column gives one value for every row
+        return np.broadcast_to(np.asarray(result, dtype=float), (rows,)).copy()
+    
+    def _evaluate_columns_python(
+        self,
+        expression: str,
+        columns: Dict[str, Sequence[float]],
+        scalars: Dict[str, float]
+    ) -> array:
+        """
+        Evaluate an expression over columns row by row, for when NumPy is missing.
+        
+        Args:
+            expression: The cleaned expression.
+            columns: Equally long sequences of numbers, by variable name.
+            scalars: Scalar variables shared by every row.
+            
+        Returns:
+            One float per row.
+        """
+        names = list(columns)
+        values = [array("d", columns[name]) for name in names]
+        
+        evaluate = _compile_expression(self._normalize(expression))
+        env = dict(scalars)
+        result = array("d")
+        nan = float("nan")
+        
+        for row in zip(*values):
+            env.update(zip(names, row))
+            try:
+                value = evaluate(env)
+                # A negative number to a fractional power is complex
+                result.append(value if isinstance(value, float) else nan)
+            except (ValueError, ArithmeticError):
+                result.append(nan)
+        
+        return result
+    
+    @staticmethod
+    def _bind(variables: Optional[Dict[str, Any]]) -> Dict[str, float]:
+        """
+        Check and convert the values of variables.
+        
+        Args:
+            variables: The variables to bind, or None.
+            
+        Returns:
+            The variables with float values.
             
         Raises:
-            ValueError: If the expression contains unsupported operations.
+            ValueError: If a name isn't an identifier or a value isn't a number.
         """
-        # Numbers
-        if isinstance(node, ast.Num):
-            return float(node.n)
+        env = {}
+        for name, value in (variables or {}).items():
+            if not isinstance(name, str) or not name.isidentifier():
+                raise ValueError(f"Invalid variable name: {name!r}")
+            if isinstance(value, (str, bytes)):
+                raise ValueError(f"Variable {name} is not a number: {value!r}")
+            env[name] = float(value)
+        return env
+    
+    @staticmethod
+    def _normalize(expression: str) -> str:
+        """
+        Normalize an expression for the compiled expression cache.
+        
+        Args:
+            expression: The expression to normalize.
+            
+        Returns:
+            The expression with every run of whitespace collapsed to one space.
+        """
+        return " ".join(expression.split())
+    
+    @staticmethod
+    def _format_result(result: float) -> str:
+        """
+        Format a calculation result for display.
+        
+        Args:
+            result: The evaluated result.
             
+        Returns:
+            The formatted result.
+        """
+        if isinstance(result, float):
+            # Round to 6 decimal places if it's a float
+            result = round(result, 6)
+            # Remove trailing zeros after decimal point
+            return f"{result:f}".rstrip('0').rstrip('.')
+        return str(result)
+    
+    @classmethod
+    def _compile_node(cls, node: ast.AST, vectorized: bool = False) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Validate an AST expression node and lower it to a chain of closures.
+        
+        Validation happens once, here, so evaluating the compiled expression
+        is just a few nested calls.
+        
+        Args:
+            node: The AST node to compile.
+            vectorized: Whether the variables will hold NumPy arrays. Rows
+                then divide by zero to NaN instead of raising an error.
+                
+        Returns:
+            A function evaluating the node, given the variable values.
+            
+        Raises:
+            ValueError: If the expression contains unsupported operations.
+        """
         # Binary operations (e.g., 2 + 3, 4 * 5)
-        elif isinstance(node, ast.BinOp):
-            if type(node.op) not in self._OPERATORS:
+        if isinstance(node, ast.BinOp):
+            if type(node.op) not in cls._OPERATORS:
                 raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
             
-            left = self._eval_expr(node.left)
-            right = self._eval_expr(node.right)
-            
-            # Debug log for binary operations
-            logging.debug(f"Binary operation: {left} {type(node.op).__name__} {right}")
+            left = cls._compile_node(node.left, vectorized)
+            right = cls._compile_node(node.right, vectorized)
             
             # Special case for division by zero
-            if isinstance(node.op, ast.Div) and right == 0:
-                raise ValueError("ANUS cannot divide by zero - it's too tight!")
+            if isinstance(node.op, ast.Div):
+                if vectorized:
+                    def divide(env):
+                        dividend = left(env)
+                        divisor = right(env)
+                        return np.where(divisor == 0, np.nan, dividend / divisor)
+                    return divide
                 
-            # Apply the operation
-            result = self._OPERATORS[type(node.op)](left, right)
-            logging.debug(f"Operation result: {result}")
-            
-            return result
+                def divide(env):
+                    dividend = left(env)
+                    divisor = right(env)
+                    if divisor == 0:
+                        raise ValueError("ANUS cannot divide by zero - it's too tight!")
+                    return dividend / divisor
+                return divide
             
+            op = cls._OPERATORS[type(node.op)]
+            return lambda env: op(left(env), right(env))
+        
         # Unary operations (e.g., -5)
         elif isinstance(node, ast.UnaryOp):
-            if type(node.op) not in self._OPERATORS:
+            if type(node.op) not in cls._OPERATORS:
                 raise ValueError(f"Unsupported unary operator: {type(node.op).__name__}")
             
-            operand = self._eval_expr(node.operand)
-            return self._OPERATORS[type(node.op)](operand)
-            
-        # Constants
+            operand = cls._compile_node(node.operand, vectorized)
+            op = cls._OPERATORS[type(node.op)]
+            return lambda env: op(operand(env))
+        
+        # Numbers
         elif isinstance(node, ast.Constant):
             if isinstance(node.value, (int, float)):
-                return float(node.value)
+                # NumPy scalars keep constant subexpressions such as 2**10000 from raising
+                value = np.float64(node.value) if vectorized else float(node.value)
+                return lambda env: value
             raise ValueError(f"Unsupported constant type: {type(node.value).__name__}")
+        
+        # Variables
+        elif isinstance(node, ast.Name):
+            name = node.id
             
+            def lookup(env):
+                try:
+                    return env[name]
+                except KeyError:
+                    raise NameError(f"Unknown variable: {name}") from None
+            return lookup
+        
         else:
             raise ValueError(f"Unsupported expression type: {type(node).__name__}")
 
+@lru_cache(maxsize=1024)
+def _compile_expression(expression: str, vectorized: bool = False) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Parse and compile a normalized expression, memoized across all calculators.
+    
+    Args:
+        expression: The normalized expression.
+        vectorized: Whether the variables will hold NumPy arrays.
+        
+    Returns:
+        A function evaluating the expression, given the variable values.
+    """
+    tree = ast.parse(expression, mode='eval')
+    return CalculatorTool._compile_node(tree.body, vectorized)
+
 # Re-export the calculator tool
 __all__ = ["CalculatorTool"] 
\ No newline at end of file
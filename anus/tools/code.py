@@ -8,16 +8,25 @@ with appropriate safety restrictions.
 import logging
 import re
 import ast
-from typing import Dict, Any, Union, List
+import hashlib
+import threading
+from collections import OrderedDict
+from types import CodeType
+from typing import Dict, Any, Union, List, Optional, Tuple
 
 from anus.tools.base.tool import BaseTool
 from anus.tools.base.tool_result import ToolResult
+from anus.tools.sandbox import SandboxPool, SANDBOX_AVAILABLE
 
 class CodeTool(BaseTool):
     """
     A tool for executing Python code in a restricted environment.
     
     ANUS can execute your code, but keep it clean - no backdoor operations allowed!
+    
+    By default the code runs in a pool of sandbox worker processes with time
+    and memory limits, shared by all CodeTool instances with the same limits.
+    The "inprocess" backend runs it in the agent's own process instead.
     """
     
     name = "code"
@@ -49,10 +58,27 @@ class CodeTool(BaseTool):
     }
     
     # Disallowed AST nodes for security
-    _FORBIDDEN_NODES = {
+    _FORBIDDEN_NODES = frozenset({
         ast.Import, ast.ImportFrom, ast.ClassDef, ast.AsyncFunctionDef, 
         ast.Await, ast.AsyncFor, ast.AsyncWith
-    }
+    })
+    
+    # Suspicious imports or calls, checked in a single pass
+    _SUSPICIOUS_PATTERNS = [
+        r'__import__', r'importlib', r'subprocess', r'sys\W*\.', r'os\W*\.',
+        r'shutil', r'pathlib', r'open\W*\(', r'exec\W*\(', r'eval\W*\(', 
+        r'compile\W*\(', r'getattr\W*\(.*__'
+    ]
+    _SUSPICIOUS_REGEX = re.compile("|".join(f"({pattern})" for pattern in _SUSPICIOUS_PATTERNS))
+    
+    # Validated, compiled snippets by content hash, shared by all instances
+    _COMPILED_CACHE_SIZE = 256
+    _compiled_cache: "OrderedDict[str, Tuple[CodeType, str]]" = OrderedDict()
+    _compiled_lock = threading.Lock()
+    
+    # Sandbox pools shared by all instances, keyed by their limits
+    _sandbox_pools: Dict[Tuple[Any, ...], SandboxPool] = {}
+    _pool_lock = threading.Lock()
     
     # Funny code execution messages
     _execution_messages = [
@@ -63,6 +89,42 @@ class CodeTool(BaseTool):
         "ANUS is processing your code - tight security, clean output!"
     ]
     
+    def __init__(
+        self,
+        backend: str = "sandbox",
+        workers: int = 2,
+        timeout: float = 5.0,
+        cpu_time: Optional[int] = None,
+        memory_limit: Optional[int] = 256 * 1024 * 1024,
+        max_executions: int = 50,
+        **kwargs
+    ):
+        """
+        Initialize a CodeTool instance.
+        
+        Args:
+            backend: Where code runs: "sandbox" (worker processes) or "inprocess".
+            workers: Number of sandbox worker processes.
+            timeout: Wall-clock time limit per execution in seconds (sandbox only).
+            cpu_time: CPU time limit per execution in whole seconds. Defaults to
+                the wall-clock limit (sandbox only).
+            memory_limit: Memory limit per worker in bytes, or None (sandbox only).
+            max_executions: Executions after which a sandbox worker is replaced.
+            **kwargs: Additional configuration options for the tool.
+        """
+        super().__init__(**kwargs)
+        
+        if backend == "sandbox" and not SANDBOX_AVAILABLE:
+            logging.warning("Sandbox workers aren't supported on this platform; ANUS will run code in-process")
+            backend = "inprocess"
+        
+        self.backend = backend
+        self.workers = workers
+        self.timeout = timeout
+        self.cpu_time = cpu_time
+        self.memory_limit = memory_limit
+        self.max_executions = max_executions
+    
     def execute(self, code: str, **kwargs) -> Union[Dict[str, Any], ToolResult]:
         """
         Execute the provided Python code in a restricted environment.
@@ -79,8 +141,12 @@ class CodeTool(BaseTool):
             import random
             logging.info(random.choice(self._execution_messages))
             
-            # Validate the code for security
-            self._validate_code(code)
+            # Validate and compile the code, unless it has been seen before
+            key, code_obj, execution_type = self._compile_snippet(code)
+            
+            if self.backend == "sandbox":
+                outcome = self._get_sandbox_pool().run(code, key, execution_type)
+                return {"code": code, **outcome}
             
             # Set up a restricted environment
             exec_globals = self._create_restricted_env()
@@ -94,9 +160,9 @@ class CodeTool(BaseTool):
             sys.stdout = buffer
             
             try:
-                # Try to execute as an expression for return value
-                try:
-                    result = eval(code, exec_globals, {})
+                # Evaluate an expression for its return value
+                if execution_type == "expression":
+                    result = eval(code_obj, exec_globals, {})
                     output = buffer.getvalue()
                     return {
                         "code": code,
@@ -104,9 +170,9 @@ class CodeTool(BaseTool):
                         "output": output,
                         "execution_type": "expression"
                     }
-                except SyntaxError:
-                    # If not an expression, execute as statements
-                    exec(code, exec_globals, {})
+                else:
+                    # Otherwise execute the statements
+                    exec(code_obj, exec_globals, {})
                     output = buffer.getvalue()
                     # Extract the last defined variable as the result if possible
                     result = None
@@ -114,7 +180,7 @@ class CodeTool(BaseTool):
                         if var_name in exec_globals:
                             result = exec_globals[var_name]
                             break
-                            
+                    
                     return {
                         "code": code,
                         "result": result,
@@ -123,7 +189,7 @@ class CodeTool(BaseTool):
                     }
             finally:
                 sys.stdout = original_stdout
-                
+        
         except Exception as e:
             error_msg = str(e)
             logging.error(f"Error in code execution: {e}")
@@ -133,46 +199,110 @@ class CodeTool(BaseTool):
                 error_msg = f"{error_msg} ANUS has strict boundaries, you know!"
             elif "syntax" in error_msg.lower():
                 error_msg = f"{error_msg} Your code caused ANUS some discomfort."
-                
+            
             return {"status": "error", "error": f"Code execution error: {error_msg}"}
     
-    def _validate_code(self, code: str) -> None:
+    def _compile_snippet(self, code: str) -> Tuple[str, CodeType, str]:
+        """
+        Validate and compile a snippet, reusing the result for a snippet seen before.
+        
+        Args:
+            code: The code to compile.
+            
+        Returns:
+            A tuple of (content hash, code object, execution type), where the
+            execution type is "expression" or "statements".
+            
+        Raises:
+            ValueError: If the code contains forbidden elements.
+            SyntaxError: If the code doesn't parse.
+        """
+        key = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        
+        with self._compiled_lock:
+            entry = self._compiled_cache.get(key)
+            if entry is not None:
+                self._compiled_cache.move_to_end(key)
+                return (key,) + entry
+        
+        tree = self._validate_code(code)
+        
+        # A snippet that is a single expression is evaluated for its value
+        if len(tree.body) == 1 and isinstance(tree.body[0], ast.Expr):
+            expression = ast.Expression(body=tree.body[0].value)
+            entry = (compile(expression, "<string>", "eval"), "expression")
+        else:
+            entry = (compile(tree, "<string>", "exec"), "statements")
+        
+        with self._compiled_lock:
+            self._compiled_cache[key] = entry
+            while len(self._compiled_cache) > self._COMPILED_CACHE_SIZE:
+                self._compiled_cache.popitem(last=False)
+        
+        return (key,) + entry
+    
+    def _validate_code(self, code: str) -> ast.Module:
         """
         Validate code for security concerns.
         
         Args:
             code: The code to validate.
             
+        Returns:
+            The parsed code.
+            
         Raises:
             ValueError: If the code contains forbidden elements.
         """
         # Check for suspicious imports or calls
-        suspicious_patterns = [
-            r'__import__', r'importlib', r'subprocess', r'sys\W*\.', r'os\W*\.',
-            r'shutil', r'pathlib', r'open\W*\(', r'exec\W*\(', r'eval\W*\(', 
-            r'compile\W*\(', r'getattr\W*\(.*__'
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, code):
-                raise ValueError(f"Code contains forbidden pattern: {pattern}")
+        match = self._SUSPICIOUS_REGEX.search(code)
+        if match:
+            pattern = self._SUSPICIOUS_PATTERNS[match.lastindex - 1]
+            raise ValueError(f"Code contains forbidden pattern: {pattern}")
         
         # Parse the AST and check for forbidden node types
         try:
             tree = ast.parse(code)
-            for node in ast.walk(tree):
-                for forbidden_type in self._FORBIDDEN_NODES:
-                    if isinstance(node, forbidden_type):
-                        raise ValueError(f"Code contains forbidden AST node: {node.__class__.__name__}")
-                
-                # Check for attribute access that might be dangerous
-                if isinstance(node, ast.Attribute):
-                    attr_name = node.attr
-                    if attr_name.startswith('__') and attr_name.endswith('__'):
-                        raise ValueError(f"Code contains forbidden dunder attribute: {attr_name}")
         except SyntaxError as e:
             # Just a syntax error, not a security issue
             raise SyntaxError(f"Syntax error in code: {e}")
+        
+        forbidden_nodes = self._FORBIDDEN_NODES
+        for node in ast.walk(tree):
+            if type(node) in forbidden_nodes:
+                raise ValueError(f"Code contains forbidden AST node: {node.__class__.__name__}")
+            
+            # Check for attribute access that might be dangerous
+            if type(node) is ast.Attribute:
+                attr_name = node.attr
+                if attr_name.startswith('__') and attr_name.endswith('__'):
+                    raise ValueError(f"Code contains forbidden dunder attribute: {attr_name}")
+        
+        return tree
+    
+    def _get_sandbox_pool(self) -> SandboxPool:
+        """
+        Get the shared sandbox pool for this tool's limits, starting it if needed.
+        
+        Returns:
+            The sandbox pool.
+        """
+        key = (self.workers, self.timeout, self.cpu_time, self.memory_limit, self.max_executions)
+        
+        with self._pool_lock:
+            pool = self._sandbox_pools.get(key)
+            if pool is None:
+                pool = SandboxPool(
+                    self._ALLOWED_MODULES,
+                    self._ALLOWED_BUILTINS,
+                    size=self.workers,
+                    timeout=self.timeout,
+                    cpu_time=self.cpu_time,
+                    memory_limit=self.memory_limit,
+                    max_executions=self.max_executions
+                )
+                self._sandbox_pools[key] = pool
+            return pool
     
     def _create_restricted_env(self) -> Dict[str, Any]:
         """
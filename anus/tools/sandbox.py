@@ -0,0 +1,469 @@
+"""
+Sandbox worker pool for running untrusted Python code.
+
+Each worker is a separate Python process that builds the restricted
+environment once and then runs snippets one after another, with its output
+captured per snippet. The pool keeps workers warm, kills the ones that run
+over their time limit and replaces workers after a number of executions.
+
+This module only depends on the standard library, since it is also the
+script the workers run.
+"""
+
+from typing import Dict, List, Any, Optional, Iterable
+from collections import OrderedDict
+from types import CodeType
+import ast
+import io
+import json
+import math
+import os
+import queue
+import select
+import signal
+import subprocess
+import sys
+import threading
+from contextlib import redirect_stdout
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+# Whether this platform can run sandbox workers (pipes we can select on)
+SANDBOX_AVAILABLE = os.name == "posix"
+
+# Longest result repr sent back, so a huge result can't flood the parent
+_MAX_RESULT_REPR = 100000
+
+# Compiled snippets each worker keeps
+_COMPILED_CACHE_SIZE = 256
+
+# Variables checked for a result after running statements
+_RESULT_NAMES = ["result", "answer", "output", "value", "retval", "ret"]
+
+class SandboxError(Exception):
+    """
+    Raised when a snippet fails, times out or takes down its worker.
+    """
+
+class SandboxTimeoutError(SandboxError):
+    """
+    Raised when a snippet runs over its wall-clock time limit.
+    """
+
+class _Worker:
+    """
+    Handle on one worker process.
+    """
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Start a worker process.
+        
+        Args:
+            config: The worker configuration, sent as the first message.
+        """
+        # -I keeps environment variables and the user's site-packages out,
+        # -S skips site, since the sandbox only needs the standard library
+        self.process = subprocess.Popen(
+            [sys.executable, "-I", "-S", os.path.abspath(__file__)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            close_fds=True
+        )
+        self.executions = 0
+        self._send(config)
+    
+    def run(self, code: str, key: str, execution_type: str, timeout: float) -> Dict[str, Any]:
+        """
+        Run a snippet in the worker.
+        
+        Args:
+            code: The code to run.
+            key: The content hash of the code.
+            execution_type: "expression" or "statements".
+            timeout: Wall-clock time limit in seconds.
+            
+        Returns:
+            The worker's reply.
+            
+        Raises:
+            SandboxError: If the worker timed out or died.
+        """
+        self.executions += 1
+        
+        try:
+            self._send({"code": code, "key": key, "execution_type": execution_type})
+        except (BrokenPipeError, OSError):
+            raise SandboxError("Sandbox worker died before running the code")
+        
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            raise SandboxTimeoutError(f"Execution timed out after {timeout:g}s")
+        
+        line = self.process.stdout.readline()
+        if not line:
+            raise SandboxError("Sandbox worker died while running the code (probably out of memory)")
+        
+        return json.loads(line)
+    
+    def kill(self) -> None:
+        """
+        Stop the worker process.
+        """
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+    
+    def _send(self, message: Dict[str, Any]) -> None:
+        """
+        Send a message to the worker.
+        
+        Args:
+            message: The JSON-serializable message.
+        """
+        self.process.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+        self.process.stdin.flush()
+
+class SandboxPool:
+    """
+    Pool of pre-warmed worker processes that run untrusted code.
+    
+    Limits per snippet:
+    - wall-clock time: the worker is killed and replaced when it runs over;
+    - CPU time: the worker interrupts the snippet once it has used up its
+      CPU seconds (a worker that doesn't stop is caught by the wall clock);
+    - memory: the worker's address space is capped with RLIMIT_AS.
+    
+    A worker is replaced after max_executions snippets, so state a snippet
+    leaves behind in shared modules doesn't live forever, and after any
+    failure that might have left it in a bad state.
+    """
+    
+    def __init__(
+        self,
+        modules: Iterable[str],
+        builtins: Iterable[str],
+        size: int = 2,
+        timeout: float = 5.0,
+        cpu_time: Optional[int] = None,
+        memory_limit: Optional[int] = 256 * 1024 * 1024,
+        max_executions: int = 50
+    ):
+        """
+        Initialize a SandboxPool instance and start its workers.
+        
+        Args:
+            modules: Names of the modules available to the code.
+            builtins: Names of the builtins available to the code.
+            size: Number of worker processes.
+            timeout: Wall-clock time limit per snippet in seconds.
+            cpu_time: CPU time limit per snippet in whole seconds. Defaults to
+                the wall-clock limit, rounded up.
+            memory_limit: Address space limit per worker in bytes, or None.
+            max_executions: Number of snippets after which a worker is replaced.
+        """
+        self.size = size
+        self.timeout = timeout
+        self.cpu_time = cpu_time if cpu_time is not None else max(1, math.ceil(timeout))
+        self.memory_limit = memory_limit
+        self.max_executions = max_executions
+        
+        self._config = {
+            "modules": sorted(modules),
+            "builtins": sorted(builtins),
+            "cpu_time": self.cpu_time,
+            "memory_limit": memory_limit
+        }
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        
+        # Statistics
+        self.executions = 0
+        self.timeouts = 0
+        self.recycled = 0
+        
+        for _ in range(size):
+            self._idle.put(self._start_worker())
+    
+    def run(self, code: str, key: str, execution_type: str) -> Dict[str, Any]:
+        """
+        Run a snippet in a worker, waiting for one to be free.
+        
+        Args:
+            code: The code to run, already validated.
+            key: The content hash of the code, under which workers keep it compiled.
+            execution_type: "expression" to evaluate the code for its value,
+                or "statements" to execute it.
+                
+        Returns:
+            A dictionary with "result", "output" and "execution_type". The
+            result is rebuilt from its repr when it is a Python literal, and
+            is the repr string otherwise.
+            
+        Raises:
+            SandboxError: If the snippet raised, ran over a limit or crashed its worker.
+        """
+        if self._closed:
+            raise SandboxError("Sandbox pool is closed")
+        
+        worker = self._idle.get()
+        healthy = False
+        
+        try:
+            reply = worker.run(code, key, execution_type, self.timeout)
+            healthy = "fatal" not in reply
+        except SandboxTimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+        finally:
+            with self._lock:
+                self.executions += 1
+            if not healthy or worker.executions >= self.max_executions:
+                self._replace_worker(worker)
+            else:
+                self._idle.put(worker)
+        
+        if "error" in reply:
+            raise SandboxError(reply["error"])
+        
+        return {
+            "result": self._load_result(reply["result"]),
+            "output": reply["output"],
+            "execution_type": reply["execution_type"]
+        }
+    
+    def close(self) -> None:
+        """
+        Stop all workers.
+        """
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        
+        for worker in workers:
+            worker.kill()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the pool.
+        
+        Returns:
+            A dictionary containing pool statistics.
+        """
+        return {
+            "workers": self.size,
+            "idle_workers": self._idle.qsize(),
+            "executions": self.executions,
+            "timeouts": self.timeouts,
+            "recycled": self.recycled
+        }
+    
+    def _start_worker(self) -> _Worker:
+        """
+        Start a worker and keep track of it.
+        
+        Returns:
+            The new worker.
+        """
+        worker = _Worker(self._config)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+    
+    def _replace_worker(self, worker: _Worker) -> None:
+        """
+        Kill a worker and put a fresh one in the pool.
+        
+        Args:
+            worker: The worker to replace.
+        """
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.kill()
+        with self._lock:
+            self.recycled += 1
+        
+        if not self._closed:
+            self._idle.put(self._start_worker())
+    
+    @staticmethod
+    def _load_result(result_repr: Optional[str]) -> Any:
+        """
+        Rebuild a result from its repr without trusting the worker.
+        
+        Args:
+            result_repr: The repr sent by the worker.
+            
+        Returns:
+            The literal value, or the repr itself if it isn't a literal.
+        """
+        if result_repr is None:
+            return None
+        
+        try:
+            return ast.literal_eval(result_repr)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            return result_repr
+
+class _CPUTimeExceeded(BaseException):
+    """
+    Raised inside a worker when a snippet uses up its CPU time.
+    
+    A BaseException, so a snippet's ``except Exception`` doesn't swallow it.
+    """
+
+def _on_cpu_time_exceeded(signum, frame):
+    """
+    Signal handler interrupting a snippet that used up its CPU time.
+    """
+    raise _CPUTimeExceeded()
+
+def _build_env(modules: List[str], builtins_names: List[str]) -> Dict[str, Any]:
+    """
+    Build the restricted environment snippets run in.
+    
+    Args:
+        modules: Names of the modules available to the code.
+        builtins_names: Names of the builtins available to the code.
+        
+    Returns:
+        The globals for the snippets.
+    """
+    import builtins
+    
+    env = {}
+    for module_name in modules:
+        try:
+            env[module_name] = __import__(module_name)
+        except ImportError:
+            pass
+    
+    real_builtins = vars(builtins)
+    env["__builtins__"] = {name: real_builtins[name] for name in builtins_names if name in real_builtins}
+    return env
+
+def _compile(code: str, execution_type: str) -> CodeType:
+    """
+    Compile a snippet the way CodeTool does.
+    
+    Args:
+        code: The code to compile.
+        execution_type: "expression" or "statements".
+        
+    Returns:
+        The code object.
+    """
+    tree = ast.parse(code)
+    if execution_type == "expression":
+        return compile(ast.Expression(body=tree.body[0].value), "<string>", "eval")
+    return compile(tree, "<string>", "exec")
+
+def _execute(code_obj: CodeType, execution_type: str, base_env: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a compiled snippet the way CodeTool does.
+    
+    Args:
+        code_obj: The compiled code.
+        execution_type: "expression" or "statements".
+        base_env: The restricted environment, copied for the snippet.
+        
+    Returns:
+        The reply for the parent.
+    """
+    exec_globals = dict(base_env)
+    buffer = io.StringIO()
+    
+    with redirect_stdout(buffer):
+        if execution_type == "expression":
+            result = eval(code_obj, exec_globals, {})
+        else:
+            exec(code_obj, exec_globals, {})
+            result = None
+            for var_name in _RESULT_NAMES:
+                if var_name in exec_globals:
+                    result = exec_globals[var_name]
+                    break
+    
+    result_repr = repr(result) if result is not None else None
+    if result_repr is not None and len(result_repr) > _MAX_RESULT_REPR:
+        result_repr = result_repr[:_MAX_RESULT_REPR]
+    
+    return {"result": result_repr, "output": buffer.getvalue(), "execution_type": execution_type}
+
+def _worker_main() -> None:
+    """
+    Worker loop: read a snippet per line from stdin, reply with a line of JSON.
+    """
+    # Keep the protocol on its own descriptor, so nothing a snippet or the
+    # interpreter prints can end up in it
+    channel = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    sys.stdout = open(os.devnull, "w")
+    
+    compiled: "OrderedDict[str, CodeType]" = OrderedDict()
+    
+    config = json.loads(sys.stdin.buffer.readline())
+    base_env = _build_env(config["modules"], config["builtins"])
+    cpu_time = config.get("cpu_time")
+    
+    if RESOURCE_AVAILABLE:
+        if config.get("memory_limit"):
+            resource.setrlimit(resource.RLIMIT_AS, (config["memory_limit"], config["memory_limit"]))
+        if cpu_time:
+            signal.signal(signal.SIGXCPU, _on_cpu_time_exceeded)
+    
+    for line in sys.stdin.buffer:
+        request = json.loads(line)
+        
+        if RESOURCE_AVAILABLE and cpu_time:
+            # The limit counts the worker's total CPU time, so move it along
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            used = int(usage.ru_utime + usage.ru_stime)
+            soft = used + cpu_time
+            hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+        
+        try:
+            key = request["key"]
+            code_obj = compiled.get(key)
+            if code_obj is None:
+                code_obj = _compile(request["code"], request["execution_type"])
+                compiled[key] = code_obj
+                if len(compiled) > _COMPILED_CACHE_SIZE:
+                    compiled.popitem(last=False)
+            else:
+                compiled.move_to_end(key)
+            
+            reply = _execute(code_obj, request["execution_type"], base_env)
+        except _CPUTimeExceeded:
+            reply = {"error": f"CPU time limit of {cpu_time}s exceeded", "fatal": True}
+        except MemoryError:
+            reply = {"error": "Memory limit exceeded", "fatal": True}
+        except BaseException as e:
+            reply = {"error": str(e) or type(e).__name__}
+        
+        try:
+            message = json.dumps(reply)
+        except (TypeError, ValueError) as e:
+            message = json.dumps({"error": f"Unable to send result: {e}"})
+        
+        channel.write(message.encode("utf-8") + b"\n")
+        channel.flush()
+
+if __name__ == "__main__":
+    _worker_main()
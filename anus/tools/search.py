@@ -1,21 +1,27 @@
 """
 Search tool for basic web search simulation.
 
-This tool simulates searching the web for information.
+This tool simulates searching the web for information, or searches a local
+corpus through a pluggable backend such as a SearchIndex.
 """
 
 import logging
 import random
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Union, List, Optional
 
 from anus.tools.base.tool import BaseTool
 from anus.tools.base.tool_result import ToolResult
+from anus.tools.search_index import SearchIndex
 
 class SearchTool(BaseTool):
     """
     A tool for simulating web searches.
     
     ANUS can search the web for information, though the results might be a bit cheeky.
+    
+    Without a backend the results are simulated. A backend is any object with
+    a ``search(query, k)`` method returning dictionaries with "id", "title"
+    and "snippet", like SearchIndex, which searches a local corpus offline.
     """
     
     name = "search"
@@ -68,14 +74,45 @@ class SearchTool(BaseTool):
         "ANUS is squeezing out search results..."
     ]
     
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        index_path: Optional[str] = None,
+        corpus_path: Optional[str] = None,
+        top_k: int = 5,
+        **kwargs
+    ):
+        """
+        Initialize a SearchTool instance.
+        
+        Args:
+            backend: Optional search backend. If None and index_path is given,
+                a SearchIndex stored there is used.
+            index_path: Optional directory of a SearchIndex to search.
+            corpus_path: Optional directory of documents to (incrementally)
+                index into the SearchIndex at index_path.
+            top_k: Number of results returned from a backend.
+            **kwargs: Additional configuration options for the tool.
+        """
+        super().__init__(**kwargs)
+        self.top_k = top_k
+        
+        if backend is None and index_path:
+            backend = SearchIndex(index_path)
+            if corpus_path:
+                backend.index_directory(corpus_path)
+        
+        self.backend = backend
+    
     def execute(self, query: str, **kwargs) -> Union[Dict[str, Any], ToolResult]:
         """
         Execute the search tool.
         
         Args:
             query: The search query.
-            **kwargs: Additional parameters (ignored).
-            
+            **kwargs: Additional parameters. "k" overrides the number of results
+                returned from a backend.
+                
         Returns:
             The search results.
         """
@@ -84,6 +121,9 @@ class SearchTool(BaseTool):
             if random.random() < 0.4:  # 40% chance
                 logging.info(random.choice(self._search_messages))
             
+            if self.backend is not None:
+                return self._search_backend(query, kwargs.get("k", self.top_k))
+            
             # Clean and lowercase the query for matching
             clean_query = query.lower().strip()
             
@@ -130,8 +170,30 @@ class SearchTool(BaseTool):
                 "result_count": len(results),
                 "comment": comment
             }
-            
+        
         except Exception as e:
             error_msg = str(e)
             logging.error(f"Error in search tool: {e}")
-            return {"status": "error", "error": f"Search error: {error_msg}"} 
\ No newline at end of file
+            return {"status": "error", "error": f"Search error: {error_msg}"} 
+    
+    def _search_backend(self, query: str, k: int) -> Dict[str, Any]:
+        """
+        Search the backend, formatting each hit as a line of text.
+        
+        Args:
+            query: The search query.
+            k: Number of results to return.
+            
+        Returns:
+            The search results, with the raw hits under "documents".
+        """
+        hits = self.backend.search(query, k=k)
+        results = [f"{hit['title']} ({hit['id']}): {hit['snippet']}" for hit in hits]
+        
+        return {
+            "query": query,
+            "results": results,
+            "result_count": len(results),
+            "comment": None,
+            "documents": hits
+        }
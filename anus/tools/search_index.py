@@ -0,0 +1,846 @@
+"""
+Search index module for offline search over a local corpus.
+
+An on-disk inverted index with BM25 ranking. Documents are indexed in
+batches, and each batch is written as an immutable segment whose postings are
+memory-mapped at query time, so opening even a large index only reads the
+term dictionaries and per-document lengths.
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Sequence
+from array import array
+from collections import Counter
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import threading
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Longer runs of letters and digits are usually hashes or encoded data
+_MAX_TOKEN_LENGTH = 64
+
+# File extensions indexed by default when indexing a directory
+DEFAULT_EXTENSIONS = (".txt", ".md", ".rst", ".html", ".htm", ".csv", ".json", ".py")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase index terms.
+    
+    Args:
+        text: The text to tokenize.
+        
+    Returns:
+        The terms, in order of appearance.
+    """
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if len(token) <= _MAX_TOKEN_LENGTH]
+
+class _Segment:
+    """
+    An immutable batch of postings.
+    
+    The ``.terms`` file lists each term with its document frequency and the
+    offset of its postings. The ``.postings`` file holds, per term, the
+    document numbers followed by the term frequencies, both as uint32.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open a segment, loading its term dictionary and mapping its postings.
+        
+        Args:
+            path: The segment's path without extension.
+        """
+        self.path = path
+        self.terms: Dict[str, Tuple[int, int]] = {}  # term -> (document frequency, offset)
+        
+        with open(path + ".terms", encoding="utf-8") as f:
+            for line in f:
+                term, doc_freq, offset = line.rstrip("\n").split("\t")
+                self.terms[term] = (int(doc_freq), int(offset))
+        
+        self.size = os.path.getsize(path + ".postings")
+        self._file = open(path + ".postings", "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map).cast("I")
+    
+    def postings(self, term: str) -> Optional[Tuple[memoryview, memoryview]]:
+        """
+        Get the postings of a term.
+        
+        Args:
+            term: The term to look up.
+            
+        Returns:
+            A tuple of (document numbers, term frequencies), or None if the
+            term doesn't occur in the segment.
+        """
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        
+        doc_freq, offset = entry
+        return self._view[offset:offset + doc_freq], self._view[offset + doc_freq:offset + 2 * doc_freq]
+    
+    def close(self) -> None:
+        """
+        Unmap the postings.
+        """
+        try:
+            self._view.release()
+            self._map.close()
+        except BufferError:
+            # A query still holds a view; the mapping goes away with it
+            pass
+        self._file.close()
+    
+    def remove_files(self) -> None:
+        """
+        Close the segment and delete its files.
+        """
+        self.close()
+        for extension in (".terms", ".postings"):
+            if os.path.exists(self.path + extension):
+                os.remove(self.path + extension)
+    
+    @staticmethod
+    def write(path: str, postings: Dict[str, Tuple[array, array]]) -> None:
+        """
+        Write a segment.
+        
+        Args:
+            path: The segment's path without extension.
+            postings: The (document numbers, term frequencies) of each term.
+        """
+        offset = 0
+        with open(path + ".postings", "wb") as postings_file, open(path + ".terms", "w", encoding="utf-8") as terms_file:
+            for term in sorted(postings):
+                doc_numbers, freqs = postings[term]
+                postings_file.write(doc_numbers.tobytes())
+                postings_file.write(freqs.tobytes())
+                terms_file.write(f"{term}\t{len(doc_numbers)}\t{offset}\n")
+                offset += 2 * len(doc_numbers)
+
+class SearchIndex:
+    """
+    A persistent BM25 inverted index over text documents.
+    
+    Documents are identified by a string, e.g. their file path. Adding a
+    document buffers its postings in memory; commit() writes the buffer as a
+    new segment. Replacing or removing a document marks its old number as
+    deleted, and merging segments drops the postings of deleted documents.
+    Small segments are merged automatically once there are more than
+    ``max_segments``.
+    
+    With NumPy, a query scores all postings of a term with a few vector
+    operations and picks the top k with a partial sort. Without NumPy, the
+    same is done with a dictionary and a heap.
+    
+    Files in the index directory:
+    - ``docs.jsonl``: identifier, modification time and size per document number
+    - ``docs.len``: the number of terms in each document (uint32)
+    - ``docs.deleted``: numbers of removed documents, one per line
+    - ``store.dat`` and ``store.idx``: document texts, for snippets, and the
+      end offset of each (uint64)
+    - ``seg_<n>.terms`` and ``seg_<n>.postings``: the segments
+    - ``meta.json``: the live segments and how many documents they cover
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_segments: int = 16,
+        max_buffered_docs: int = 10000
+    ):
+        """
+        Initialize a SearchIndex instance.
+        
+        Args:
+            path: Directory to store the index files in.
+            k1: BM25 term frequency saturation.
+            b: BM25 document length normalization.
+            max_segments: Number of segments above which small segments are merged.
+            max_buffered_docs: Number of added documents after which the buffer
+                is committed as a segment.
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.max_segments = max_segments
+        self.max_buffered_docs = max_buffered_docs
+        
+        os.makedirs(self.path, exist_ok=True)
+        
+        self._lock = threading.RLock()
+        self._ids: List[str] = []  # Document number -> identifier
+        self._docs: Dict[str, Tuple[int, Optional[float], Optional[int]]] = {}  # identifier -> (number, mtime, size)
+        self._lengths = array("I")
+        self._store_ends = array("Q")
+        self._alive = bytearray()
+        self._live_count = 0
+        self._live_length = 0
+        self._segments: List[_Segment] = []
+        self._next_segment = 0
+        
+        # Postings of documents added since the last commit
+        self._buffer: Dict[str, Tuple[array, array]] = {}
+        self._buffered_docs = 0
+        self._appenders: Dict[str, Any] = {}  # File name -> open append handle
+        
+        self._load()
+    
+    def __len__(self) -> int:
+        """
+        Get the number of live documents.
+        
+        Returns:
+            The document count.
+        """
+        return self._live_count
+    
+    def add_document(
+        self,
+        identifier: str,
+        text: str,
+        mtime: Optional[float] = None,
+        size: Optional[int] = None
+    ) -> int:
+        """
+        Add a document, replacing any previous document with the identifier.
+        
+        The document is searchable after the next commit, which search() does
+        on its own.
+        
+        Args:
+            identifier: The document identifier, e.g. its path.
+            text: The document text.
+            mtime: Optional modification time, used to skip unchanged files.
+            size: Optional size in bytes, used to skip unchanged files.
+            
+        Returns:
+            The document number.
+        """
+        with self._lock:
+            if identifier in self._docs:
+                self.remove_document(identifier)
+            
+            terms = tokenize(text)
+            number = len(self._ids)
+            self._buffer_postings(number, terms)
+            
+            encoded = text.encode("utf-8")
+            store_end = (self._store_ends[-1] if self._store_ends else 0) + len(encoded)
+            
+            self._append("store.dat", encoded)
+            self._append("store.idx", array("Q", [store_end]).tobytes())
+            self._append("docs.len", array("I", [len(terms)]).tobytes())
+            self._append("docs.jsonl", (json.dumps({"id": identifier, "mtime": mtime, "size": size}) + "\n").encode("utf-8"))
+            
+            self._ids.append(identifier)
+            self._docs[identifier] = (number, mtime, size)
+            self._lengths.append(len(terms))
+            self._store_ends.append(store_end)
+            self._alive.append(1)
+            self._live_count += 1
+            self._live_length += len(terms)
+            
+            self._buffered_docs += 1
+            if self._buffered_docs >= self.max_buffered_docs:
+                self.commit()
+            
+            return number
+    
+    def remove_document(self, identifier: str) -> bool:
+        """
+        Remove a document.
+        
+        Args:
+            identifier: The document identifier.
+            
+        Returns:
+            True if a document was removed, False otherwise.
+        """
+        with self._lock:
+            entry = self._docs.pop(identifier, None)
+            if entry is None:
+                return False
+            
+            number = entry[0]
+            self._alive[number] = 0
+            self._live_count -= 1
+            self._live_length -= self._lengths[number]
+            self._append("docs.deleted", f"{number}\n".encode("utf-8"))
+            return True
+    
+    def commit(self) -> None:
+        """
+        Write the buffered documents as a new segment.
+        """
+        with self._lock:
+            for handle in self._appenders.values():
+                handle.flush()
+            
+            if not self._buffer:
+                self._buffered_docs = 0
+                return
+            
+            self._segments.append(self._write_segment(self._buffer))
+            self._buffer = {}
+            self._buffered_docs = 0
+            
+            if len(self._segments) > self.max_segments:
+                # Merge the smaller half, so large segments are rewritten rarely
+                by_size = sorted(self._segments, key=lambda segment: segment.size)
+                self._merge(by_size[:len(by_size) // 2 + 1])
+            else:
+                self._write_meta()
+    
+    def merge(self) -> None:
+        """
+        Merge all segments into one, dropping the postings of removed documents.
+        """
+        with self._lock:
+            self.commit()
+            if len(self._segments) > 1 or len(self._alive) > self._live_count:
+                self._merge(list(self._segments))
+    
+    def index_directory(
+        self,
+        directory: str,
+        extensions: Iterable[str] = DEFAULT_EXTENSIONS,
+        remove_missing: bool = True
+    ) -> Dict[str, int]:
+        """
+        Index the files in a directory tree, skipping files that haven't changed.
+        
+        Args:
+            directory: The directory to index.
+            extensions: File extensions to index.
+            remove_missing: Whether to remove documents for files under the
+                directory that no longer exist.
+                
+        Returns:
+            The number of files added, updated, unchanged and removed.
+        """
+        root = os.path.abspath(directory)
+        extensions = tuple(extension.lower() for extension in extensions)
+        index_dir = os.path.abspath(self.path)
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+        
+        with self._lock:
+            for dirpath, dirnames, filenames in os.walk(root):
+                # Skip hidden directories and the index itself
+                dirnames[:] = sorted(
+                    name for name in dirnames
+                    if not name.startswith(".") and os.path.join(dirpath, name) != index_dir
+                )
+                
+                for filename in sorted(filenames):
+                    if not filename.lower().endswith(extensions):
+                        continue
+                    
+                    file_path = os.path.join(dirpath, filename)
+                    seen.add(file_path)
+                    try:
+                        status = os.stat(file_path)
+                        entry = self._docs.get(file_path)
+                        if entry is not None and entry[1] == status.st_mtime and entry[2] == status.st_size:
+                            stats["unchanged"] += 1
+                            continue
+                        
+                        with open(file_path, encoding="utf-8", errors="replace") as f:
+                            text = f.read()
+                    except OSError as e:
+                        logging.warning(f"ANUS search index skipped {file_path}: {e}")
+                        continue
+                    
+                    self.add_document(file_path, text, status.st_mtime, status.st_size)
+                    stats["updated" if entry is not None else "added"] += 1
+            
+            if remove_missing:
+                prefix = root + os.sep
+                for identifier in [i for i in self._docs if i.startswith(prefix) and i not in seen]:
+                    self.remove_document(identifier)
+                    stats["removed"] += 1
+            
+            self.commit()
+        
+        logging.info(
+            f"ANUS search index took in {root}: {stats['added']} added, {stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged, {stats['removed']} removed"
+        )
+        return stats
+    
+    def search(self, query: str, k: int = 10, snippet_length: int = 200) -> List[Dict[str, Any]]:
+        """
+        Find the documents that best match a query.
+        
+        Args:
+            query: The search query.
+            k: Number of results to return.
+            snippet_length: Approximate length of the snippets in characters.
+            
+        Returns:
+            A list of dictionaries with "id", "score", "title" and "snippet",
+            best match first.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or k <= 0:
+            return []
+        
+        with self._lock:
+            self.commit()
+            if not self._live_count:
+                return []
+            
+            if NUMPY_AVAILABLE:
+                ranked = self._rank_numpy(terms, k)
+            else:
+                ranked = self._rank_python(terms, k)
+            
+            results = []
+            for number, score in ranked:
+                text = self._stored_text(number)
+                results.append({
+                    "id": self._ids[number],
+                    "score": score,
+                    "title": self._title(text, self._ids[number]),
+                    "snippet": self._snippet(text, terms, snippet_length)
+                })
+            return results
+    
+    def clear(self) -> None:
+        """
+        Remove all documents and delete the index files.
+        """
+        with self._lock:
+            self._close_appenders()
+            for segment in self._segments:
+                segment.remove_files()
+            for name in ("docs.jsonl", "docs.len", "docs.deleted", "store.dat", "store.idx", "meta.json"):
+                if os.path.exists(self._file(name)):
+                    os.remove(self._file(name))
+            
+            self._ids = []
+            self._docs = {}
+            self._lengths = array("I")
+            self._store_ends = array("Q")
+            self._alive = bytearray()
+            self._live_count = 0
+            self._live_length = 0
+            self._segments = []
+            self._next_segment = 0
+            self._buffer = {}
+            self._buffered_docs = 0
+    
+    def close(self) -> None:
+        """
+        Commit buffered documents and unmap the segments.
+        """
+        with self._lock:
+            self.commit()
+            self._close_appenders()
+            for segment in self._segments:
+                segment.close()
+            self._segments = []
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the index.
+        
+        Returns:
+            A dictionary containing index statistics.
+        """
+        with self._lock:
+            return {
+                "document_count": self._live_count,
+                "removed_documents": len(self._ids) - self._live_count,
+                "average_length": self._live_length / self._live_count if self._live_count else 0.0,
+                "segments": len(self._segments),
+                "terms": sum(len(segment.terms) for segment in self._segments),
+                "buffered_documents": self._buffered_docs,
+                "numpy": NUMPY_AVAILABLE
+            }
+    
+    def _rank_numpy(self, terms: List[str], k: int) -> List[Tuple[int, float]]:
+        """
+        Score documents with vector operations over the mapped postings.
+        
+        Args:
+            terms: The distinct query terms.
+            k: Number of results to return.
+            
+        Returns:
+            (document number, score) tuples, best first.
+        """
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        lengths = np.frombuffer(self._lengths, dtype=np.uint32)
+        avg_length = self._live_length / self._live_count or 1.0
+        
+        for term, idf, postings in self._term_postings(terms):
+            for doc_numbers, freqs in postings:
+                numbers = np.frombuffer(doc_numbers, dtype=np.uint32)
+                tf = np.frombuffer(freqs, dtype=np.uint32).astype(np.float32)
+                norm = self.k1 * (1 - self.b + self.b * lengths[numbers] / avg_length)
+                # Numbers are unique within a term's postings, so plain indexing adds up
+                scores[numbers] += idf * tf * (self.k1 + 1) / (tf + norm)
+        
+        if self._live_count < len(self._ids):
+            scores[np.frombuffer(bytes(self._alive), dtype=np.uint8) == 0] = 0
+        
+        matches = np.flatnonzero(scores)
+        if not len(matches):
+            return []
+        
+        keep = min(k, len(matches))
+        match_scores = scores[matches]
+        top = np.argpartition(-match_scores, keep - 1)[:keep]
+        top = top[np.argsort(-match_scores[top], kind="stable")]
+        return [(int(matches[i]), float(match_scores[i])) for i in top]
+    
+    def _rank_python(self, terms: List[str], k: int) -> List[Tuple[int, float]]:
+        """
+        Score documents with a dictionary, for when NumPy is missing.
+        
+        Args:
+            terms: The distinct query terms.
+            k: Number of results to return.
+            
+        Returns:
+            (document number, score) tuples, best first.
+        """
+        scores: Dict[int, float] = {}
+        lengths = self._lengths
+        avg_length = self._live_length / self._live_count or 1.0
+        k1, b = self.k1, self.b
+        
+        for term, idf, postings in self._term_postings(terms):
+            for doc_numbers, freqs in postings:
+                for number, tf in zip(doc_numbers, freqs):
+                    norm = k1 * (1 - b + b * lengths[number] / avg_length)
+                    scores[number] = scores.get(number, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        
+        alive = self._alive
+        return heapq.nlargest(k, ((n, s) for n, s in scores.items() if alive[n]), key=lambda item: item[1])
+    
+    def _term_postings(self, terms: List[str]) -> Iterable[Tuple[str, float, List[Tuple[Sequence[int], Sequence[int]]]]]:
+        """
+        Collect the postings and inverse document frequency of each query term.
+        
+        Args:
+            terms: The distinct query terms.
+            
+        Returns:
+            (term, idf, postings per segment) tuples for the terms that occur.
+        """
+        for term in terms:
+            postings = [p for p in (segment.postings(term) for segment in self._segments) if p is not None]
+            doc_freq = sum(len(doc_numbers) for doc_numbers, _ in postings)
+            if not doc_freq:
+                continue
+            
+            # Postings of removed documents linger until a merge
+            doc_freq = min(doc_freq, self._live_count)
+            
+            idf = math.log(1 + (self._live_count - doc_freq + 0.5) / (doc_freq + 0.5))
+            yield term, idf, postings
+    
+    def _buffer_postings(self, number: int, terms: List[str]) -> None:
+        """
+        Add a document's terms to the uncommitted postings.
+        
+        Args:
+            number: The document number.
+            terms: The document's terms.
+        """
+        for term, freq in Counter(terms).items():
+            postings = self._buffer.get(term)
+            if postings is None:
+                postings = self._buffer[term] = (array("I"), array("I"))
+            postings[0].append(number)
+            postings[1].append(freq)
+    
+    def _append(self, name: str, data: bytes) -> None:
+        """
+        Append to a file in the index directory, keeping it open for the next append.
+        
+        Args:
+            name: The file name.
+            data: The bytes to append.
+        """
+        handle = self._appenders.get(name)
+        if handle is None:
+            handle = self._appenders[name] = open(self._file(name), "ab")
+        handle.write(data)
+    
+    def _close_appenders(self) -> None:
+        """
+        Close the files kept open for appending.
+        """
+        for handle in self._appenders.values():
+            handle.close()
+        self._appenders = {}
+    
+    def _stored_text(self, number: int) -> str:
+        """
+        Read a document's text from the store.
+        
+        Args:
+            number: The document number.
+            
+        Returns:
+            The document text.
+        """
+        start = self._store_ends[number - 1] if number else 0
+        end = self._store_ends[number]
+        with open(self._file("store.dat"), "rb") as f:
+            f.seek(start)
+            return f.read(end - start).decode("utf-8", errors="replace")
+    
+    @staticmethod
+    def _title(text: str, identifier: str) -> str:
+        """
+        Use the first non-empty line of a document as its title.
+        
+        Args:
+            text: The document text.
+            identifier: The document identifier, used if the text is empty.
+            
+        Returns:
+            The title.
+        """
+        for line in text.splitlines():
+            line = line.strip().lstrip("#").strip()
+            if line:
+                return line[:80]
+        return os.path.basename(identifier) or identifier
+    
+    @staticmethod
+    def _snippet(text: str, terms: List[str], length: int) -> str:
+        """
+        Cut the part of a document around the first query term.
+        
+        Args:
+            text: The document text.
+            terms: The query terms.
+            length: Approximate length of the snippet in characters.
+            
+        Returns:
+            The snippet, with whitespace collapsed.
+        """
+        pattern = re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b", re.IGNORECASE)
+        match = pattern.search(text)
+        start = max(0, match.start() - length // 3) if match else 0
+        end = start + length
+        
+        snippet = " ".join(text[start:end].split())
+        if start > 0:
+            snippet = "..." + snippet
+        if end < len(text):
+            snippet += "..."
+        return snippet
+    
+    def _merge(self, segments: List[_Segment]) -> None:
+        """
+        Replace some segments with a single one without removed documents.
+        
+        Args:
+            segments: The segments to merge.
+        """
+        merged: Dict[str, Tuple[array, array]] = {}
+        alive = self._alive
+        if NUMPY_AVAILABLE:
+            alive_mask = np.frombuffer(bytes(alive), dtype=np.uint8).astype(bool)
+        
+        for segment in segments:
+            for term in segment.terms:
+                doc_numbers, freqs = segment.postings(term)
+                
+                if NUMPY_AVAILABLE:
+                    numbers = np.frombuffer(doc_numbers, dtype=np.uint32)
+                    keep = alive_mask[numbers]
+                    if not keep.any():
+                        continue
+                    kept_numbers = array("I", numbers[keep].tobytes())
+                    kept_freqs = array("I", np.frombuffer(freqs, dtype=np.uint32)[keep].tobytes())
+                else:
+                    kept = [(number, freq) for number, freq in zip(doc_numbers, freqs) if alive[number]]
+                    if not kept:
+                        continue
+                    kept_numbers = array("I", [number for number, _ in kept])
+                    kept_freqs = array("I", [freq for _, freq in kept])
+                
+                target = merged.get(term)
+                if target is None:
+                    merged[term] = (kept_numbers, kept_freqs)
+                else:
+                    target[0].extend(kept_numbers)
+                    target[1].extend(kept_freqs)
+        
+        remaining = [segment for segment in self._segments if segment not in segments]
+        if merged:
+            remaining.append(self._write_segment(merged))
+        self._segments = remaining
+        self._write_meta()
+        
+        for segment in segments:
+            segment.remove_files()
+        
+        logging.info(f"ANUS search index merged {len(segments)} segments")
+    
+    def _write_segment(self, postings: Dict[str, Tuple[array, array]]) -> _Segment:
+        """
+        Write postings as a new segment and open it.
+        
+        Args:
+            postings: The (document numbers, term frequencies) of each term.
+            
+        Returns:
+            The new segment.
+        """
+        path = self._file(f"seg_{self._next_segment:06d}")
+        self._next_segment += 1
+        _Segment.write(path, postings)
+        return _Segment(path)
+    
+    def _write_meta(self) -> None:
+        """
+        Record the live segments, replacing the metadata file atomically.
+        """
+        # Called with an empty buffer, so every document so far is in a segment
+        meta = {
+            "segments": [os.path.basename(segment.path) for segment in self._segments],
+            "next_segment": self._next_segment,
+            "committed_docs": len(self._ids)
+        }
+        temp_path = self._file("meta.json.tmp")
+        with open(temp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self._file("meta.json"))
+    
+    def _load(self) -> None:
+        """
+        Load the document table and open the segments listed in the metadata.
+        """
+        if os.path.exists(self._file("docs.jsonl")):
+            records = []
+            record_ends = []  # Byte offset after each record's line
+            with open(self._file("docs.jsonl"), "rb") as f:
+                offset = 0
+                for line in f:
+                    offset += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # A partially written last line
+                        break
+                    record_ends.append(offset)
+            
+            self._lengths.frombytes(self._read_whole(self._file("docs.len"), self._lengths.itemsize))
+            self._store_ends.frombytes(self._read_whole(self._file("store.idx"), self._store_ends.itemsize))
+            
+            # A crash while adding a document can leave the files uneven, so
+            # keep the documents that made it into all of them
+            count = min(len(records), len(self._lengths), len(self._store_ends))
+            store_size = os.path.getsize(self._file("store.dat")) if os.path.exists(self._file("store.dat")) else 0
+            while count and self._store_ends[count - 1] > store_size:
+                count -= 1
+            del self._lengths[count:]
+            del self._store_ends[count:]
+            
+            # Cut the leftovers off, so later appends line up again
+            self._truncate("docs.jsonl", record_ends[count - 1] if count else 0)
+            self._truncate("docs.len", count * self._lengths.itemsize)
+            self._truncate("store.idx", count * self._store_ends.itemsize)
+            self._truncate("store.dat", self._store_ends[count - 1] if count else 0)
+            
+            self._alive = bytearray([1]) * count
+            if os.path.exists(self._file("docs.deleted")):
+                with open(self._file("docs.deleted"), "rb") as f:
+                    data = f.read()
+                # A line without its newline was cut short
+                complete = data[:data.rfind(b"\n") + 1]
+                self._truncate("docs.deleted", len(complete))
+                for line in complete.split():
+                    if int(line) < count:
+                        self._alive[int(line)] = 0
+            
+            for number, record in enumerate(records[:count]):
+                self._ids.append(record["id"])
+                if self._alive[number]:
+                    self._docs[record["id"]] = (number, record.get("mtime"), record.get("size"))
+                    self._live_length += self._lengths[number]
+            self._live_count = len(self._docs)
+        
+        if os.path.exists(self._file("meta.json")):
+            with open(self._file("meta.json")) as f:
+                meta = json.load(f)
+            self._next_segment = meta.get("next_segment", 0)
+            self._segments = [_Segment(self._file(name)) for name in meta.get("segments", [])]
+            committed_docs = meta.get("committed_docs", 0)
+        else:
+            committed_docs = 0
+        
+        # Documents that were added but never committed are indexed again from the store
+        for number in range(committed_docs, len(self._ids)):
+            if self._alive[number]:
+                self._buffer_postings(number, tokenize(self._stored_text(number)))
+                self._buffered_docs += 1
+    
+    def _read_whole(self, path: str, itemsize: int) -> bytes:
+        """
+        Read a file of fixed-size items, dropping a partially written last item.
+        
+        Args:
+            path: The file path.
+            itemsize: The size of each item in bytes.
+            
+        Returns:
+            The bytes of the complete items.
+        """
+        if not os.path.exists(path):
+            return b""
+        with open(path, "rb") as f:
+            data = f.read()
+        return data[:len(data) - len(data) % itemsize]
+    
+    def _truncate(self, name: str, size: int) -> None:
+        """
+        Cut a file in the index directory down to a size, if it is longer.
+        
+        Args:
+            name: The file name.
+            size: The size in bytes to keep.
+        """
+        path = self._file(name)
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            logging.warning(f"Discarding {os.path.getsize(path) - size} bytes of an interrupted write to {path}")
+            with open(path, "r+b") as f:
+                f.truncate(size)
+    
+    def _file(self, name: str) -> str:
+        """
+        Get the path of a file in the index directory.
+        
+        Args:
+            name: The file name.
+            
+        Returns:
+            The file path.
+        """
+        return os.path.join(self.path, name)
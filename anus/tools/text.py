@@ -2,15 +2,29 @@
 Text tool for basic text processing and manipulation.
 
 This tool provides various text manipulation functions, such as counting words,
-formatting text, and basic analysis.
+formatting text, and basic analysis. Large inputs can be streamed from a file
+or an iterable of chunks instead of being passed as one string.
 """
 
 import logging
 import re
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Union, List, Optional, Iterable, Iterator, Tuple
 
 from anus.tools.base.tool import BaseTool
 from anus.tools.base.tool_result import ToolResult
+from anus.tools.text_stream import (
+    DEFAULT_CHUNK_SIZE, TextStats, iter_file_chunks, iter_chunks, transform_chunks, reverse_file
+)
+
+# Operations that aggregate over the whole text, and the TextStats field each returns
+_AGGREGATE_OPERATIONS = {
+    "count": "characters",
+    "wordcount": "words",
+    "linecount": "lines",
+    "bytecount": "bytes",
+    "topwords": "top_words",
+    "stats": None
+}
 
 class TextTool(BaseTool):
     """
@@ -30,11 +44,26 @@ class TextTool(BaseTool):
             },
             "operation": {
                 "type": "string",
-                "description": "The operation to perform (count, reverse, uppercase, lowercase, capitalize, wordcount)",
-                "enum": ["count", "reverse", "uppercase", "lowercase", "capitalize", "wordcount"]
+                "description": "The operation to perform (count, reverse, uppercase, lowercase, capitalize, wordcount, linecount, bytecount, topwords, stats)",
+                "enum": [
+                    "count", "reverse", "uppercase", "lowercase", "capitalize", "wordcount",
+                    "linecount", "bytecount", "topwords", "stats"
+                ]
+            },
+            "path": {
+                "type": "string",
+                "description": "A file to stream the text from instead of passing it as text"
+            },
+            "output_path": {
+                "type": "string",
+                "description": "Where to write the result of a transformation when streaming"
+            },
+            "k": {
+                "type": "integer",
+                "description": "Number of most frequent words for topwords and stats (default 10)"
             }
         },
-        "required": ["text", "operation"]
+        "required": ["operation"]
     }
     
     # Operation descriptions with ANUS flair
@@ -44,28 +73,65 @@ class TextTool(BaseTool):
         "uppercase": "ANUS is making everything BIGGER...",
         "lowercase": "ANUS is making everything smaller...",
         "capitalize": "ANUS is making your text look Important...",
-        "wordcount": "ANUS is counting your words one by one..."
+        "wordcount": "ANUS is counting your words one by one...",
+        "linecount": "ANUS is counting your lines...",
+        "bytecount": "ANUS is weighing every last byte...",
+        "topwords": "ANUS is finding your favourite words...",
+        "stats": "ANUS is taking in everything at once..."
     }
     
-    def execute(self, text: str, operation: str, **kwargs) -> Union[Dict[str, Any], ToolResult]:
+    def execute(
+        self,
+        text: Optional[str] = None,
+        operation: Optional[str] = None,
+        path: Optional[str] = None,
+        chunks: Optional[Iterable[Union[str, bytes]]] = None,
+        output_path: Optional[str] = None,
+        k: int = 10,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        encoding: str = "utf-8",
+        **kwargs
+    ) -> Union[Dict[str, Any], ToolResult]:
         """
         Execute the text tool.
         
+        Exactly one of text, path and chunks gives the input. Files and chunks
+        are processed incrementally in bounded memory: aggregates are computed
+        in one pass, and transformations are written to output_path.
+        
         Args:
             text: The text to process.
             operation: The operation to perform.
+            path: A file to stream the text from (memory-mapped).
+            chunks: An iterable of str or bytes chunks to stream the text from.
+            output_path: Where to write a streamed transformation.
+            k: Number of most frequent words for topwords and stats.
+            chunk_size: Number of bytes of a file decoded at a time.
+            encoding: Encoding of the file or of byte chunks.
             **kwargs: Additional parameters (ignored).
             
         Returns:
             The processed text result.
         """
         try:
+            if operation is None:
+                raise ValueError("No operation specified")
+            if sum(source is not None for source in (text, path, chunks)) != 1:
+                raise ValueError("Provide exactly one of text, path or chunks")
+            
             # Log the operation with ANUS flair
             logging.info(self._operation_descriptions.get(operation, f"ANUS is processing your text with {operation}..."))
             
+            if text is None:
+                result_dict = self._execute_stream(operation, path, chunks, output_path, k, chunk_size, encoding)
+                result_dict.update(self._fun_fact(operation, result_dict["result"]))
+                return result_dict
+            
             # Perform the requested operation
             result = None
-            if operation == "count":
+            if operation in ("linecount", "bytecount", "topwords", "stats"):
+                result = self._aggregate(iter_chunks([text], encoding), operation, k)
+            elif operation == "count":
                 result = len(text)
             elif operation == "reverse":
                 result = text[::-1]
@@ -80,15 +146,6 @@ class TextTool(BaseTool):
             else:
                 raise ValueError(f"Unknown operation: {operation}")
             
-            # Add a fun fact for certain operations
-            fun_fact = None
-            if operation == "wordcount" and result > 100:
-                fun_fact = "That's a lot of words! ANUS is impressed by your verbosity."
-            elif operation == "uppercase":
-                fun_fact = "ALL CAPS? ANUS FEELS LIKE YOU'RE SHOUTING!"
-            elif operation == "count" and result > 500:
-                fun_fact = "That's a substantial chunk of text. ANUS had to really stretch to process all of it!"
-            
             # Return the result
             result_dict = {
                 "text": text[:50] + "..." if len(text) > 50 else text,  # Truncate long inputs
@@ -96,12 +153,103 @@ class TextTool(BaseTool):
                 "result": result
             }
             
-            if fun_fact:
-                result_dict["fun_fact"] = fun_fact
+            # Add a fun fact for certain operations
+            result_dict.update(self._fun_fact(operation, result))
             
             return result_dict
-            
+        
         except Exception as e:
             error_msg = str(e)
             logging.error(f"Error in text tool: {e}")
-            return {"status": "error", "error": f"Text processing error: {error_msg}"} 
\ No newline at end of file
+            return {"status": "error", "error": f"Text processing error: {error_msg}"}
+    
+    def _execute_stream(
+        self,
+        operation: str,
+        path: Optional[str],
+        chunks: Optional[Iterable[Union[str, bytes]]],
+        output_path: Optional[str],
+        k: int,
+        chunk_size: int,
+        encoding: str
+    ) -> Dict[str, Any]:
+        """
+        Perform an operation on a file or an iterable of chunks.
+        
+        Args:
+            operation: The operation to perform.
+            path: The file to read, if streaming from a file.
+            chunks: The chunks, if streaming from an iterable.
+            output_path: Where to write a transformation.
+            k: Number of most frequent words for topwords and stats.
+            chunk_size: Number of bytes of a file decoded at a time.
+            encoding: Encoding of the file or of byte chunks.
+            
+        Returns:
+            The result dictionary.
+        """
+        source = iter_file_chunks(path, chunk_size, encoding) if path is not None else iter_chunks(chunks, encoding)
+        result_dict = {"source": path if path is not None else "<chunks>", "operation": operation}
+        
+        if operation in _AGGREGATE_OPERATIONS:
+            result_dict["result"] = self._aggregate(source, operation, k)
+            return result_dict
+        
+        if operation not in ("reverse", "uppercase", "lowercase", "capitalize"):
+            raise ValueError(f"Unknown operation: {operation}")
+        if output_path is None:
+            raise ValueError(f"Streaming {operation} needs an output_path to write to")
+        if operation == "reverse" and path is None:
+            raise ValueError("Streaming reverse needs a file path, since chunks can't be read backwards")
+        
+        # newline="" so the text is written back exactly as it was read
+        with open(output_path, "w", encoding=encoding, newline="") as output:
+            if operation == "reverse":
+                written = reverse_file(path, output, chunk_size, encoding)
+            else:
+                written = transform_chunks((chunk for chunk, _ in source), operation, output)
+        
+        result_dict["result"] = output_path
+        result_dict["characters"] = written
+        return result_dict
+    
+    def _aggregate(self, source: Iterator[Tuple[str, int]], operation: str, k: int) -> Any:
+        """
+        Compute an aggregate operation in one pass over (text, byte count) chunks.
+        
+        Args:
+            source: The chunks.
+            operation: The aggregate operation.
+            k: Number of most frequent words for topwords and stats.
+            
+        Returns:
+            The aggregate, or a dictionary of all of them for stats.
+        """
+        field = _AGGREGATE_OPERATIONS[operation]
+        stats = TextStats(top_k=k if field in ("top_words", None) else 0)
+        for chunk, byte_count in source:
+            stats.update(chunk, byte_count)
+        
+        totals = stats.finish()
+        return totals if field is None else totals[field]
+    
+    def _fun_fact(self, operation: str, result: Any) -> Dict[str, str]:
+        """
+        Pick a fun fact for certain operations.
+        
+        Args:
+            operation: The operation performed.
+            result: Its result.
+            
+        Returns:
+            A dictionary with the fun fact, or an empty one.
+        """
+        fun_fact = None
+        if operation == "wordcount" and result > 100:
+            fun_fact = "That's a lot of words! ANUS is impressed by your verbosity."
+        elif operation == "uppercase":
+            fun_fact = "ALL CAPS? ANUS FEELS LIKE YOU'RE SHOUTING!"
+        elif operation == "count" and result > 500:
+            fun_fact = "That's a substantial chunk of text. ANUS had to really stretch to process all of it!"
+        
+        return {"fun_fact": fun_fact} if fun_fact else {} 
\ No newline at end of file
@@ -0,0 +1,361 @@
+"""
+Streaming text processing for inputs too large to hold in memory.
+
+Files are memory-mapped and decoded chunk by chunk, and every operation
+works incrementally, carrying over whatever straddles a chunk boundary.
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple, Union, TextIO
+from array import array
+from collections import Counter
+import codecs
+import mmap
+import os
+import re
+
+# Default number of bytes decoded at a time
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Words counted for word frequencies: runs of letters and digits
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+# Longest word fragment carried across chunks, so input without whitespace
+# can't grow the carry forever
+_MAX_CARRY = 1 << 16
+
+def iter_file_chunks(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8"
+) -> Iterator[Tuple[str, int]]:
+    """
+    Decode a file chunk by chunk through a memory map.
+    
+    Args:
+        path: The file to read.
+        chunk_size: Number of bytes decoded at a time.
+        encoding: The file encoding. Undecodable bytes are replaced.
+        
+    Returns:
+        An iterator of (text, byte count) tuples.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, size, chunk_size):
+                data = mapped[start:start + chunk_size]
+                yield decoder.decode(data, final=start + chunk_size >= size), len(data)
+
+def iter_chunks(chunks: Iterable[Union[str, bytes]], encoding: str = "utf-8") -> Iterator[Tuple[str, int]]:
+    """
+    Normalize an iterable of text or byte chunks.
+    
+    Args:
+        chunks: The chunks, as str or bytes (decoded incrementally).
+        encoding: The encoding of byte chunks.
+        
+    Returns:
+        An iterator of (text, byte count) tuples.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    
+    for chunk in chunks:
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            yield decoder.decode(bytes(chunk)), len(chunk)
+        else:
+            yield chunk, len(chunk.encode(encoding, errors="replace"))
+    
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail, 0
+
+class CountMinSketch:
+    """
+    Approximate counts for an unbounded number of keys in fixed memory.
+    
+    Each key increments one counter per row; its estimate is the smallest of
+    those counters, which never undercounts and overcounts by at most a
+    small fraction of the total with high probability.
+    """
+    
+    def __init__(self, width: int = 1 << 16, depth: int = 4):
+        """
+        Initialize a CountMinSketch instance.
+        
+        Args:
+            width: Counters per row.
+            depth: Number of rows.
+        """
+        self.width = width
+        self.depth = depth
+        self._rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+    
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        Count a key.
+        
+        Args:
+            key: The key.
+            count: How many times to count it.
+            
+        Returns:
+            The key's estimated count afterwards.
+        """
+        # Double hashing: row i uses h1 + i * h2
+        h1 = hash(key)
+        h2 = hash((key, 0x9E3779B9)) | 1
+        width = self.width
+        
+        estimate = None
+        for i, row in enumerate(self._rows):
+            index = (h1 + i * h2) % width
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        return estimate
+    
+    def estimate(self, key: str) -> int:
+        """
+        Estimate how often a key was counted.
+        
+        Args:
+            key: The key.
+            
+        Returns:
+            The estimated count.
+        """
+        h1 = hash(key)
+        h2 = hash((key, 0x9E3779B9)) | 1
+        return min(row[(h1 + i * h2) % self.width] for i, row in enumerate(self._rows))
+
+class TopWords:
+    """
+    Tracks the most frequent words of a stream in bounded memory.
+    
+    Counts go into a CountMinSketch, and only the words with the highest
+    estimates are kept as candidates, so memory stays fixed no matter how
+    many distinct words the stream has.
+    """
+    
+    def __init__(self, k: int = 10, capacity: Optional[int] = None):
+        """
+        Initialize a TopWords instance.
+        
+        Args:
+            k: Number of words to report.
+            capacity: Number of candidate words kept. Defaults to 50 per reported word.
+        """
+        self.k = k
+        self.capacity = capacity or max(1000, 50 * k)
+        self.sketch = CountMinSketch()
+        self._candidates: Dict[str, int] = {}
+    
+    def update(self, counts: Dict[str, int]) -> None:
+        """
+        Add word counts, e.g. those of one chunk.
+        
+        Args:
+            counts: Occurrences per word.
+        """
+        add = self.sketch.add
+        candidates = self._candidates
+        for word, count in counts.items():
+            candidates[word] = add(word, count)
+        
+        if len(candidates) > 2 * self.capacity:
+            kept = sorted(candidates.items(), key=lambda item: item[1], reverse=True)[:self.capacity]
+            self._candidates = dict(kept)
+    
+    def top(self) -> List[Tuple[str, int]]:
+        """
+        Get the most frequent words.
+        
+        Returns:
+            (word, estimated count) tuples, most frequent first.
+        """
+        return sorted(self._candidates.items(), key=lambda item: (-item[1], item[0]))[:self.k]
+
+class TextStats:
+    """
+    Single-pass character, byte, line and word counts, and optionally the
+    most frequent words, over text that arrives in chunks.
+    
+    Words are whitespace-separated, as with ``str.split()``; a word split
+    across two chunks is counted once. Word frequencies are over lowercased
+    runs of letters and digits.
+    """
+    
+    def __init__(self, top_k: int = 0):
+        """
+        Initialize a TextStats instance.
+        
+        Args:
+            top_k: Number of most frequent words to track, or 0 to skip them.
+        """
+        self.characters = 0
+        self.bytes = 0
+        self.lines = 0
+        self.words = 0
+        self.top_words = TopWords(top_k) if top_k else None
+        
+        self._in_word = False  # Whether the previous chunk ended inside a word
+        self._carry = ""  # That unfinished word, for the word frequencies
+    
+    def update(self, chunk: str, byte_count: int = 0) -> None:
+        """
+        Add a chunk.
+        
+        Args:
+            chunk: The text chunk.
+            byte_count: The chunk's size in bytes.
+        """
+        # A chunk of bytes can decode to nothing when it ends inside a character
+        self.bytes += byte_count
+        if not chunk:
+            return
+        
+        self.characters += len(chunk)
+        self.lines += chunk.count("\n")
+        
+        # Words are counted where they start, so one that continues from the
+        # previous chunk has been counted already
+        words = chunk.split()
+        continues_word = self._in_word and not chunk[0].isspace()
+        self.words += len(words) - continues_word
+        self._in_word = not chunk[-1].isspace()
+        
+        if self.top_words is None:
+            return
+        
+        if continues_word:
+            words[0] = self._carry + words[0]
+        elif self._carry:
+            # The previous chunk ended exactly at the end of a word
+            self._count_frequencies(self._carry)
+        self._carry = ""
+        if self._in_word:
+            self._carry = words.pop()[:_MAX_CARRY]
+        if words:
+            self._count_frequencies(" ".join(words))
+    
+    def finish(self) -> Dict[str, Any]:
+        """
+        Count what is left over and return the totals.
+        
+        Returns:
+            A dictionary with "characters", "bytes", "lines" and "words", and
+            "top_words" if word frequencies are tracked.
+        """
+        if self._carry:
+            self._count_frequencies(self._carry)
+            self._carry = ""
+        self._in_word = False
+        
+        stats = {
+            "characters": self.characters,
+            "bytes": self.bytes,
+            "lines": self.lines,
+            "words": self.words
+        }
+        if self.top_words is not None:
+            stats["top_words"] = [[word, count] for word, count in self.top_words.top()]
+        return stats
+    
+    def _count_frequencies(self, text: str) -> None:
+        """
+        Count the words of some text for the word frequencies.
+        
+        Args:
+            text: The text.
+        """
+        self.top_words.update(Counter(_WORD_PATTERN.findall(text.lower())))
+
+def transform_chunks(chunks: Iterable[str], operation: str, output: TextIO) -> int:
+    """
+    Apply a case transformation chunk by chunk.
+    
+    Args:
+        chunks: The text chunks.
+        operation: "uppercase", "lowercase" or "capitalize".
+        output: Where to write the transformed text.
+        
+    Returns:
+        The number of characters written.
+    """
+    written = 0
+    
+    if operation in ("uppercase", "lowercase"):
+        for chunk in chunks:
+            converted = chunk.upper() if operation == "uppercase" else chunk.lower()
+            written += output.write(converted)
+        return written
+    
+    if operation != "capitalize":
+        raise ValueError(f"Operation {operation} can't be streamed chunk by chunk")
+    
+    # Title case depends on the previous character, so hold back the last
+    # word until the next chunk shows where it ends
+    carry = ""
+    for chunk in chunks:
+        text = carry + chunk
+        carry = ""
+        if text and not text[-1].isspace():
+            carry = text.rsplit(None, 1)[-1]
+            if len(carry) > _MAX_CARRY:
+                carry = ""
+            text = text[:len(text) - len(carry)]
+        written += output.write(text.title())
+    
+    if carry:
+        written += output.write(carry.title())
+    return written
+
+def reverse_file(
+    path: str,
+    output: TextIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8"
+) -> int:
+    """
+    Write a file's text reversed, reading it backwards through a memory map.
+    
+    Args:
+        path: The file to reverse.
+        output: Where to write the reversed text.
+        chunk_size: Number of bytes decoded at a time.
+        encoding: The file encoding, which must be UTF-8 or a single-byte encoding.
+        
+    Returns:
+        The number of characters written.
+    """
+    utf8 = codecs.lookup(encoding).name == "utf-8"
+    written = 0
+    
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            end = size
+            while end > 0:
+                start = max(0, end - chunk_size)
+                # Don't start in the middle of a UTF-8 sequence
+                while utf8 and 0 < start < end and mapped[start] & 0xC0 == 0x80:
+                    start += 1
+                if start == end:
+                    # The chunk is shorter than the character, so take the whole character
+                    start = max(0, end - chunk_size)
+                    while utf8 and start > 0 and mapped[start] & 0xC0 == 0x80:
+                        start -= 1
+                
+                text = mapped[start:end].decode(encoding, errors="replace")
+                written += output.write(text[::-1])
+                end = start
+    
+    return written
@@ -106,12 +106,13 @@ class CLI(cmd.Cmd):
         # Start the command loop
         self.cmdloop()
     
-    def display_result(self, result: Dict[str, Any]) -> None:
+    def display_result(self, result: Dict[str, Any], show_answer: bool = True) -> None:
         """
         Display the result of a task execution.
         
         Args:
             result: The task execution result.
+            show_answer: Whether to print the answer. False if it was already streamed.
         """
         self.current_result = result
         
@@ -126,9 +127,10 @@ class CLI(cmd.Cmd):
         print(f"Task: {task}")
         
         # Display the answer
-        answer = result.get("answer", "No answer provided")
-        print("\nAnswer:")
-        print(f"{answer}")
+        if show_answer:
+            answer = result.get("answer", "No answer provided")
+            print("\nAnswer:")
+            print(f"{answer}")
         
         # Display additional information if verbose
         if self.verbose:
@@ -159,6 +161,31 @@ class CLI(cmd.Cmd):
         if self.joke_counter % 3 == 0:  # Every 3rd result
             print(f"\nANUS Wisdom: {random.choice(self._anus_jokes)}")
     
+    def display_event(self, event: Dict[str, Any]) -> None:
+        """
+        Display a progress event while a task is executing.
+        
+        Args:
+            event: The execution event.
+        """
+        prefix = f"  [{event['stage']}] " if "stage" in event else "  "
+        event_type = event["type"]
+        
+        if event_type == "thought":
+            # Thoughts can quote earlier stages; the first line is enough for progress
+            thought = str(event["content"]).splitlines()[0] if event["content"] else ""
+            print(f"{prefix}Thought: {thought}", flush=True)
+        elif event_type == "action":
+            print(f"{prefix}Action: {event['name']} {json.dumps(event['input'], default=str)}", flush=True)
+        elif event_type == "observation":
+            observation = event["content"]
+            status = observation.get("status", "unknown") if isinstance(observation, dict) else "unknown"
+            print(f"{prefix}Observation: {status}", flush=True)
+            if self.verbose:
+                self._pretty_print(observation)
+        elif event_type == "stage_result":
+            print(f"{prefix}Finished.", flush=True)
+    
     def do_task(self, arg: str) -> None:
         """
         Execute a task.
@@ -197,8 +224,24 @@ class CLI(cmd.Cmd):
             print("Multiple agents engaged. ANUS is working from all directions...")
         
         try:
-            result = self.orchestrator.execute_task(task, mode=mode)
-            self.display_result(result)
+            result = {}
+            answer_streamed = False
+            
+            # Render progress as it happens instead of waiting for the result
+            for event in self.orchestrator.execute_task_stream(task, mode=mode):
+                if event["type"] == "result":
+                    result = event["result"]
+                elif event["type"] == "token" and "stage" not in event:
+                    if not answer_streamed:
+                        print("\nAnswer:")
+                        answer_streamed = True
+                    print(event["content"], end="", flush=True)
+                else:
+                    self.display_event(event)
+            
+            if answer_streamed:
+                print()
+            self.display_result(result, show_answer=not answer_streamed)
             
             # Add to history
             self.history.append({
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Complexity Scoring Benchmark
+
+Compares the legacy regex complexity scoring with ComplexityScorer, both in
+throughput and in how many tasks end up in single vs. multi-agent mode.
+"""
+
+import os
+import re
+import sys
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anus.core.agent.complexity import ComplexityScorer
+
+# Score at which HybridAgent switches to multi-agent mode
+THRESHOLD = 3.0
+
+SAMPLE_TASKS = [
+    "calculate 2 + 2",
+    'count characters in "Hello World"',
+    "search for python",
+    "calculate 15 * 7 + 3",
+    'uppercase "make this loud"',
+    "find the best sorting algorithm and compare it with quicksort",
+    "run code print('hello') then count words in the output",
+    "look up the population of France and calculate its density",
+    "optimize this function if it is slow, otherwise explain what it does",
+    "evaluate every command in the list before the deadline",
+    "what is the capital of Australia",
+    "search for all restaurants near me and find the most popular one",
+    "execute python code to compute the first 10 primes",
+    'transform text "hello" to uppercase and reverse it',
+    "improve the performance of the database queries",
+    # Inflected forms, which the scorer must still recognize as keywords
+    "calculated the totals for each region",
+    "comparing prices across stores",
+    "searching for docs about the API",
+    "executes the script and reports errors",
+    "optimizing queries that are running slowly",
+    # Plural keywords, which must score like their singular
+    "reverse the strings",
+    "count the characters in these strings and compare the words",
+]
+
+
+def legacy_assess_complexity(task):
+    """The substring-based scoring HybridAgent used before ComplexityScorer."""
+    complexity = 0.0
+    
+    operations = [
+        (r'(calculate|compute|evaluate)', 1.0),
+        (r'(search|find|look up)', 1.0),
+        (r'(count|process|analyze|transform)\s+text', 1.0),
+        (r'run\s+code|execute', 1.5),
+        (r'compare|contrast|evaluate', 2.0),
+        (r'optimize|improve|enhance', 2.5),
+        (r'and|then|after|before', 1.0),
+        (r'if|when|unless|otherwise', 1.5),
+        (r'all|every|each', 1.0),
+        (r'most|best|optimal', 1.5)
+    ]
+    
+    for pattern, score in operations:
+        matches = re.findall(pattern, task.lower())
+        complexity += score * len(matches)
+    
+    complexity += len(task.split()) * 0.1
+    complexity += sum(1 for c in task if not c.isalnum() and not c.isspace()) * 0.2
+    
+    tool_keywords = {
+        'calculator': ['calculate', 'compute', 'evaluate', 'math'],
+        'search': ['search', 'find', 'look up', 'query'],
+        'text': ['text', 'string', 'characters', 'words'],
+        'code': ['code', 'execute', 'run', 'python']
+    }
+    
+    task_lower = task.lower()
+    tools_needed = sum(1 for keywords in tool_keywords.values() if any(kw in task_lower for kw in keywords))
+    complexity += tools_needed * 1.5
+    
+    return min(10.0, complexity)
+
+
+def measure(name, score_many, tasks):
+    """Time a batch scoring function and print its throughput and mode split."""
+    start = time.perf_counter()
+    scores = score_many(tasks)
+    elapsed = time.perf_counter() - start
+    
+    multi = sum(1 for score in scores if score >= THRESHOLD)
+    print(f"{name:<28} {len(tasks) / elapsed:>12,.0f} tasks/s   "
+          f"single: {len(tasks) - multi:>6}   multi: {multi:>6}")
+    return scores
+
+
+def main():
+    """Run the complexity scoring benchmark."""
+    print("🍑 ANUS Complexity Scoring Benchmark")
+    print("====================================")
+    
+    # Make each task unique so the first pass can't hit the memo
+    tasks = [f"{task} #{i}" for i in range(2000) for task in SAMPLE_TASKS]
+    print(f"Scoring {len(tasks)} tasks (threshold {THRESHOLD})\n")
+    
+    legacy = measure("legacy regex", lambda ts: [legacy_assess_complexity(t) for t in ts], tasks)
+    
+    scorer = ComplexityScorer(cache_size=len(tasks))
+    current = measure("ComplexityScorer (cold)", scorer.score_many, tasks)
+    measure("ComplexityScorer (memoized)", scorer.score_many, tasks)
+    
+    flipped = sum(1 for old, new in zip(legacy, current) if (old >= THRESHOLD) != (new >= THRESHOLD))
+    print(f"\nTasks switching mode: {flipped} of {len(tasks)}")
+    
+    print("\nPer-task scores (legacy -> current):")
+    for task in SAMPLE_TASKS:
+        print(f"  {legacy_assess_complexity(task):>4.1f} -> {scorer.score(task):>4.1f}  {task}")
+
+
+if __name__ == "__main__":
+    main()
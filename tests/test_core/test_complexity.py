@@ -0,0 +1,19 @@
+"""
+Tests for the task complexity scorer.
+"""
+
+import pytest
+
+from anus.core.agent.complexity import ComplexityScorer
+
+@pytest.mark.parametrize("task, inflected", [
+    ("reverse the string", "reverse the strings"),
+    ("calculate the total", "calculated the totals"),
+    ("compare prices", "comparing prices"),
+    ("run code", "running code"),
+    ("execute the script", "executes the script"),
+    ("optimize the query", "optimizing the queries"),
+])
+def test_inflected_keywords_score_like_their_base_form(task, inflected):
+    scorer = ComplexityScorer()
+    assert scorer.score(inflected) == scorer.score(task)
@@ -0,0 +1,59 @@
+"""
+Tests for the persistent vector index.
+"""
+
+import threading
+
+import pytest
+
+from anus.core.memory import vector_index
+from anus.core.memory.vector_index import VectorIndex
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def numpy_available(request, monkeypatch):
+    if request.param and not vector_index.NUMPY_AVAILABLE:
+        pytest.skip("NumPy not installed")
+    monkeypatch.setattr(vector_index, "NUMPY_AVAILABLE", request.param)
+    return request.param
+
+def test_recovers_from_a_torn_add(tmp_path, numpy_available):
+    index = VectorIndex(str(tmp_path))
+    index.add("a", [1.0, 0.0, 0.0])
+    index.add("b", [0.0, 1.0, 0.0])
+    index.remove("a")
+    index.add("a", [1.0, 0.0, 0.0])
+    
+    # A crash while adding a fourth vector leaves partial records behind
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        f.write(b"\x00\x00\x80")
+    with open(tmp_path / "vectors.ids", "ab") as f:
+        f.write(b"to")
+    with open(tmp_path / "vectors.deleted", "ab") as f:
+        f.write(b"2")
+    
+    index = VectorIndex(str(tmp_path))
+    assert len(index) == 2
+    index.add("c", [0.0, 0.0, 1.0])
+    
+    index = VectorIndex(str(tmp_path))
+    assert len(index) == 3
+    assert index.search([0.0, 0.0, 1.0], k=1)[0][0] == "c"
+    assert index.search([0.0, 1.0, 0.0], k=1)[0][0] == "b"
+    assert index.search([1.0, 0.0, 0.0], k=1)[0][0] == "a"
+
+def test_concurrent_adds_keep_ids_and_vectors_in_step(tmp_path, numpy_available):
+    index = VectorIndex(str(tmp_path))
+    
+    def add(worker):
+        for i in range(50):
+            index.add(f"{worker}-{i}", [float(worker), float(i), 1.0])
+    
+    threads = [threading.Thread(target=add, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    index = VectorIndex(str(tmp_path))
+    assert len(index) == 200
+    assert index.search([3.0, 7.0, 1.0], k=1)[0][0] == "3-7"
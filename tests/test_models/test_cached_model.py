@@ -0,0 +1,47 @@
+"""
+Tests for the response-caching model wrapper.
+"""
+
+from anus.models.base.base_model import BaseModel
+from anus.models.cached_model import CachedModel
+
+class StreamingModel(BaseModel):
+    def __init__(self, chunks):
+        super().__init__("streaming")
+        self.chunks = chunks
+        self.calls = 0
+    
+    def generate(self, prompt, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        self.calls += 1
+        return "".join(self.chunks)
+    
+    def generate_stream(self, prompt, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        self.calls += 1
+        yield from self.chunks
+    
+    def generate_with_tools(self, prompt, tools, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        return {"content": "", "tool_calls": []}
+    
+    def extract_json(self, prompt, schema, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        return {}
+    
+    def get_embedding(self, text, **kwargs):
+        return []
+
+def test_broken_stream_is_not_cached():
+    model = StreamingModel(["Partial ", "answer", "Error: connection reset"])
+    cached = CachedModel(model)
+    
+    assert "".join(cached.generate_stream("hello")) == "Partial answerError: connection reset"
+    
+    model.chunks = ["Full answer"]
+    assert cached.generate("hello") == "Full answer"
+    assert model.calls == 2
+
+def test_complete_stream_is_cached():
+    model = StreamingModel(["Full ", "answer"])
+    cached = CachedModel(model)
+    
+    assert "".join(cached.generate_stream("hello")) == "Full answer"
+    assert cached.generate("hello") == "Full answer"
+    assert model.calls == 1
@@ -0,0 +1,25 @@
+"""
+Tests for the persistent embedding store.
+"""
+
+from anus.models.embedding_store import EmbeddingStore
+
+def test_recovers_from_a_torn_index_entry(tmp_path):
+    store = EmbeddingStore(str(tmp_path), model="test")
+    store.put_many(["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+    store.close()
+    
+    # A crash while storing a third text leaves part of its index entry behind
+    with open(tmp_path / "embeddings.idx", "ab") as f:
+        f.write(b"\x00" * 10)
+    
+    store = EmbeddingStore(str(tmp_path), model="test")
+    assert store.put_many(["c"], [[0.5, 0.5]]) == 1
+    store.close()
+    
+    store = EmbeddingStore(str(tmp_path), model="test")
+    assert len(store) == 3
+    assert store.get("a") == [1.0, 0.0]
+    assert store.get("b") == [0.0, 1.0]
+    assert store.get("c") == [0.5, 0.5]
+    store.close()
@@ -0,0 +1,58 @@
+"""
+Tests for routing between models.
+"""
+
+from anus.models.base.base_model import BaseModel
+from anus.models.routing import RoutingEngine, RoutedModel
+
+class ScriptedModel(BaseModel):
+    def __init__(self, name, chunks=(), json_result=None):
+        super().__init__(name)
+        self.chunks = list(chunks)
+        self.json_result = json_result or {}
+        self.json_calls = 0
+    
+    def generate(self, prompt, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        return "".join(self.chunks)
+    
+    def generate_stream(self, prompt, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        yield from self.chunks
+    
+    def generate_with_tools(self, prompt, tools, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        return {"content": "", "tool_calls": []}
+    
+    def extract_json(self, prompt, schema, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        self.json_calls += 1
+        return self.json_result
+    
+    def get_embedding(self, text, **kwargs):
+        return []
+
+def routed(*models):
+    engine = RoutingEngine()
+    for model in models:
+        engine.register(model.model_name, {"cost_per_1k_tokens": len(engine.profiles)})
+    return engine, RoutedModel(engine, {model.model_name: model for model in models})
+
+def test_broken_stream_counts_as_a_failure():
+    engine, model = routed(ScriptedModel("small", ["Partial ", "answer", "Error: connection reset"]))
+    
+    assert "".join(model.generate_stream("hello")) == "Partial answerError: connection reset"
+    assert engine.stats["small"].errors == 1
+
+def test_extracted_error_field_is_not_a_failure():
+    small = ScriptedModel("small", json_result={"error": "E42", "message": "Disk full"})
+    large = ScriptedModel("large", json_result={"error": "E42", "message": "Disk full"})
+    engine, model = routed(small, large)
+    
+    assert model.extract_json("parse the log", {"type": "object"}) == {"error": "E42", "message": "Disk full"}
+    assert (small.json_calls, large.json_calls) == (1, 0)
+    assert engine.stats["small"].errors == 0
+
+def test_failed_extraction_fails_over():
+    small = ScriptedModel("small", json_result={"error": "Failed to parse JSON response"})
+    large = ScriptedModel("large", json_result={"message": "Disk full"})
+    engine, model = routed(small, large)
+    
+    assert model.extract_json("parse the log", {"type": "object"}) == {"message": "Disk full"}
+    assert engine.stats["small"].errors == 1
@@ -0,0 +1,45 @@
+"""
+Tests for the on-disk search index.
+"""
+
+import os
+
+from anus.tools.search_index import SearchIndex
+
+def build_index(path):
+    index = SearchIndex(str(path))
+    index.add_document("a", "apple apricot")
+    index.add_document("b", "banana blueberry")
+    index.close()
+
+def test_recovers_from_a_torn_add(tmp_path):
+    build_index(tmp_path)
+    
+    # A crash while adding a third document leaves partial records behind
+    with open(tmp_path / "store.dat", "ab") as f:
+        f.write(b"GARBAGE GARBAGE")
+    with open(tmp_path / "store.idx", "ab") as f:
+        f.write(b"\x01\x02\x03")
+    with open(tmp_path / "docs.len", "ab") as f:
+        f.write(b"\x05\x00\x00\x00")
+    with open(tmp_path / "docs.jsonl", "ab") as f:
+        f.write(b'{"id": "x", "mti')
+    with open(tmp_path / "docs.deleted", "ab") as f:
+        f.write(b"1")
+    
+    index = SearchIndex(str(tmp_path))
+    assert len(index) == 2
+    index.add_document("c", "cherry citrus")
+    
+    results = index.search("cherry")
+    assert [result["id"] for result in results] == ["c"]
+    assert "GARBAGE" not in results[0]["snippet"]
+    assert "cherry citrus" in results[0]["snippet"]
+    assert [result["id"] for result in index.search("banana")] == ["b"]
+    index.close()
+    
+    # And the repaired files open cleanly again
+    index = SearchIndex(str(tmp_path))
+    assert len(index) == 3
+    assert [result["id"] for result in index.search("apricot")] == ["a"]
+    index.close()
@@ -0,0 +1,59 @@
+"""
+Tests for the streaming text statistics.
+"""
+
+from collections import Counter
+import io
+import re
+
+import pytest
+
+from anus.tools.text import TextTool
+from anus.tools.text_stream import TextStats, reverse_file
+
+TEXT = (
+    "alpha beta gamma alpha\n"
+    "beta  alpha delta\tepsilon beta\n"
+    "gamma alpha zeta eta theta alpha beta\n"
+) * 7
+
+def split_chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def test_word_ending_at_chunk_boundary_is_counted():
+    result = TextTool().execute(operation="topwords", chunks=["alpha", " beta"])
+    assert sorted(result["result"]) == [["alpha", 1], ["beta", 1]]
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 11, 64, len(TEXT)])
+def test_topwords_match_counter_for_any_chunk_size(size):
+    expected = Counter(re.findall(r"[^\W_]+", TEXT.lower()))
+    
+    stats = TextStats(top_k=len(expected))
+    for chunk in split_chunks(TEXT, size):
+        stats.update(chunk)
+    result = stats.finish()
+    
+    assert dict((word, count) for word, count in result["top_words"]) == dict(expected)
+    assert result["words"] == len(TEXT.split())
+
+def test_bytes_of_a_split_character_are_counted():
+    result = TextTool().execute(operation="bytecount", chunks=[b"aaaa ", b"\xc3", b"\xb6 bbb"])
+    assert result["result"] == 11
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 7])
+def test_file_bytes_are_counted_for_any_chunk_size(tmp_path, size):
+    path = tmp_path / "text.txt"
+    path.write_text("gr\u00fc\u00dfe \u2603 \U0001f600 caf\u00e9\n" * 3, encoding="utf-8")
+    
+    result = TextTool().execute(operation="bytecount", path=str(path), chunk_size=size)
+    assert result["result"] == path.stat().st_size
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 7])
+def test_reverse_file_keeps_multibyte_characters_whole(tmp_path, size):
+    text = "gr\u00fc\u00dfe \u2603 \U0001f600 caf\u00e9\n" * 3
+    path = tmp_path / "text.txt"
+    path.write_text(text, encoding="utf-8")
+    
+    output = io.StringIO()
+    reverse_file(str(path), output, chunk_size=size)
+    assert output.getvalue() == text[::-1]
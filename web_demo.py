@@ -28,14 +28,42 @@ def initialize_anus():
     return st.session_state.orchestrator
 
 
+def render_event(event: Dict[str, Any], container) -> None:
+    """Render a progress event while a task is executing."""
+    prefix = f"**[{event['stage']}]** " if "stage" in event else ""
+    
+    if event["type"] == "thought":
+        container.write(f"{prefix}💭 {event['content']}")
+    elif event["type"] == "action":
+        container.write(f"{prefix}🛠️ `{event['name']}` {json.dumps(event['input'], default=str)}")
+    elif event["type"] == "observation":
+        observation = event["content"]
+        status = observation.get("status", "unknown") if isinstance(observation, dict) else "unknown"
+        container.write(f"{prefix}👀 Observation: {status}")
+
+
 def execute_task(task: str, mode: str = None) -> Dict[str, Any]:
-    """Execute a task and store in history."""
+    """Execute a task, rendering its progress live, and store in history."""
     orchestrator = st.session_state.orchestrator
     
-    with st.spinner(f"🍑 ANUS is processing: {task[:50] + '...' if len(task) > 50 else task}"):
+    label = f"🍑 ANUS is processing: {task[:50] + '...' if len(task) > 50 else task}"
+    with st.status(label, expanded=True) as status:
         start_time = time.time()
-        result = orchestrator.execute_task(task, mode=mode)
+        result = {}
+        answer = ""
+        answer_placeholder = st.empty()
+        
+        for event in orchestrator.execute_task_stream(task, mode=mode):
+            if event["type"] == "result":
+                result = event["result"]
+            elif event["type"] == "token" and "stage" not in event:
+                answer += event["content"]
+                answer_placeholder.markdown(answer)
+            else:
+                render_event(event, status)
+        
         end_time = time.time()
+        status.update(label="✅ ANUS finished processing", state="complete", expanded=False)
         
         # Add to history
         history_item = {